@@ -1,30 +1,76 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
-import json
-import threading
+import logging
+import os
+
+import QuizMetrics
+
+from QuizGrader import compile_answer_key
+from QuizListView import VirtualQuizList
+from QuizModel import QuestionBank
+from QuizShuffle import QuestionPool, new_seed
+from QuizTimer import QuizTimer
+from QuizWorker import StallProbe, StoreWorker
+
+logger = logging.getLogger(__name__)
 
 class QuizifyApp:
-    def __init__(self, root):
+    SEARCH_DELAY_MS = 250  # Pause in typing before the quiz search runs
+    SHUTDOWN_TIMEOUT = 5.0  # Longest wait on close for queued saves to finish, in seconds
+
+    def __init__(self, root, storage_backend=None, storage_path=None):
         self.root = root
         self.root.title("Quizify - Create and Take Quizzes")
         self.root.geometry("800x600")
         self.root.config(bg="#F4F4F4")
 
-        self.quizzes = {}
-        self.current_quiz = None
+        self.quizzes = {}  # QuestionBank of each quiz created or opened this session, by title
+        self.store = None  # Quiz storage, opened by load_data
+        self.data_loaded = False  # Whether load_data has run; it runs once the first screen is drawn, or on first use
+        self.worker = None  # StoreWorker running saves and loads off the Tk thread
+        self.loading_quiz = None  # Title of a quiz being loaded to start, so repeat clicks are ignored
+        # Set QUIZIFY_STALL_PROBE=1 to measure how long the window froze; a summary is logged on close,
+        # and with QUIZIFY_METRICS* set each stall is also exported as quizify_mainloop_lateness_seconds
+        self.stall_probe = StallProbe(self.root) if os.environ.get("QUIZIFY_STALL_PROBE") else None
+        # Storage backend ("json" or "sqlite"), overridable with QUIZIFY_STORAGE / QUIZIFY_STORAGE_PATH
+        self.storage_backend = storage_backend or os.environ.get("QUIZIFY_STORAGE", "json")
+        self.storage_path = storage_path or os.environ.get("QUIZIFY_STORAGE_PATH")
+        self.current_quiz = None  # Questions of the quiz in progress, in the order they are delivered
+        self.current_quiz_title = None
+        self.delivery = None  # QuizShuffle.Delivery mapping delivered questions back to the stored quiz
+        self.shuffle_questions = True  # Deliver questions in a per-attempt random order
+        self.shuffle_options = True  # Shuffle multiple-choice options per attempt
+        self.questions_per_attempt = None  # Draw this many questions (stratified by type); None for all
         self.time_limit = 300  # Default time limit (5 minutes)
         self.user_type = None  # Track whether the user is a "Student" or "Teacher"
         self.question_data = []  # Stores questions for the current quiz
-        self.timer_thread = None  # Thread for the timer
+        self.question_time_limit = None  # Optional per-question time limit in seconds
+        self.timer = None  # QuizTimer for the quiz in progress
+        self.question_view = None  # Question screen, built once per quiz and reused
+        self.option_buttons = []  # Pool of radio buttons in the question screen
         self.current_question_index = 0  # Track the current question index
         self.score = 0  # Track the score
+        self.answer_key = None  # Compiled AnswerKey for the quiz in progress
+        self.attempt = None  # QuizStorage.Attempt buffering the answers of the quiz in progress
+        self.user_details = {}  # Name and section from the user form
+
+        # Instrumentation is opt-in through QUIZIFY_METRICS* (see QuizMetrics); set up before the store opens
+        QuizMetrics.configure_from_env()
 
+        # Draw the first screen before touching the disk; the store opens once it is on screen
         self.create_initial_screen()
-        self.load_data()
+        self.root.bind("<Expose>", self.on_first_expose)
+        if self.stall_probe is not None:
+            self.stall_probe.start()
 
         # Handle app closing
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
+    def on_first_expose(self, event):
+        """Open the store after the idle callbacks that draw the first screen have run."""
+        self.root.unbind("<Expose>")
+        self.root.after_idle(self.load_data)
+
     def create_initial_screen(self):
         """Create the initial screen to select user type."""
         self.clear_frame()
@@ -90,9 +136,18 @@ class QuizifyApp:
         self.time_limit_entry = ttk.Entry(self.main_frame, textvariable=self.time_limit_var, width=10)
         self.time_limit_entry.pack(pady=5)
 
-        ttk.Button(self.main_frame, text="Proceed", command=self.create_homepage).pack(pady=10)
+        ttk.Button(self.main_frame, text="Proceed", command=self.submit_user_details).pack(pady=10)
         ttk.Button(self.main_frame, text="Back", command=self.create_initial_screen).pack(pady=10)
 
+    def submit_user_details(self):
+        """Remember the name and section entered on the user form, then go to the homepage."""
+        if self.user_type == "Student":
+            name = f"{self.first_name_entry.get().strip()} {self.last_name_entry.get().strip()}".strip()
+        else:
+            name = self.teacher_name_entry.get().strip()
+        self.user_details = {"name": name, "section": self.section_entry.get().strip()}
+        self.create_homepage()
+
     def create_homepage(self):
         """Create the homepage layout."""
         self.clear_frame()
@@ -249,14 +304,23 @@ class QuizifyApp:
             messagebox.showerror("Error", "Please provide a title and add at least one question.")
             return
 
-        self.quizzes[quiz_title] = self.question_data
+        self.quizzes[quiz_title] = QuestionBank.from_dicts(self.question_data)
         self.question_data = []  # Clear questions for the next quiz
-        self.save_data()
-        messagebox.showinfo("Success", f"Quiz '{quiz_title}' saved successfully!")
+        saved = self.save_data(
+            quiz_title,
+            on_done=lambda result: messagebox.showinfo("Success", f"Quiz '{quiz_title}' saved successfully!"),
+        )
+        if not saved:
+            messagebox.showerror(
+                "Error",
+                f"Quiz '{quiz_title}' could not be saved because the quiz storage could not be opened. "
+                "It is kept for this session; use Save & Exit to try again.",
+            )
         self.create_homepage()
 
     def select_quiz(self):
         """Select a quiz to take."""
+        self.load_data()
         self.clear_frame()
         self.main_frame = tk.Frame(self.root, bg="#F4F4F4")
         self.main_frame.pack(fill="both", expand=True, padx=20, pady=20)
@@ -268,7 +332,10 @@ class QuizifyApp:
             bg="#F4F4F4",
         ).pack(pady=20)
 
-        if not self.quizzes:
+        # Only the rows on screen get widgets; pages of the catalog are fetched as the list scrolls
+        self.quiz_list = VirtualQuizList(self.main_frame, self.get_catalog_page, self.start_quiz)
+        if not self.quiz_list.load():
+            self.quiz_list.destroy()
             tk.Label(
                 self.main_frame,
                 text="No quizzes available. Create a quiz first!",
@@ -278,111 +345,235 @@ class QuizifyApp:
             ttk.Button(self.main_frame, text="Back", command=self.create_homepage).pack(pady=10)
             return
 
-        for quiz_title in self.quizzes.keys():
-            ttk.Button(
-                self.main_frame,
-                text=quiz_title,
-                command=lambda title=quiz_title: self.start_quiz(title),
-            ).pack(pady=10)
+        tk.Label(self.main_frame, text="Search:", font=("Helvetica", 12), bg="#F4F4F4").pack()
+        self.search_var = tk.StringVar()
+        self.search_after_id = None
+        self.search_var.trace_add("write", self.schedule_search)
+        ttk.Entry(self.main_frame, textvariable=self.search_var, width=40).pack(pady=5)
+
+        self.quiz_list.pack(fill="both", expand=True)
+        ttk.Button(self.main_frame, text="Back", command=self.create_homepage).pack(pady=10)
+
+    def schedule_search(self, *args):
+        """Run the search once typing pauses, instead of on every keystroke."""
+        if self.search_after_id is not None:
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(self.SEARCH_DELAY_MS, self.run_search)
+
+    def run_search(self):
+        """Show the quizzes matching the search box."""
+        self.search_after_id = None
+        if not self.quiz_list.winfo_exists():
+            return
+        text = self.search_var.get().strip()
+        if not text:
+            self.quiz_list.set_source(self.get_catalog_page)
+            return
+        try:
+            if self.store is not None:
+                titles = self.store.search(text)
+            else:
+                titles = [title for title in self.quizzes if text.casefold() in title.casefold()]
+        except Exception as e:
+            messagebox.showerror("Error", f"An error occurred while searching: {e}")
+            return
+        self.quiz_list.set_source(lambda cursor, limit: ([{"title": title} for title in titles], None))
 
     def start_quiz(self, quiz_title):
-        """Start a quiz."""
-        self.current_quiz = self.quizzes[quiz_title]
+        """Start a quiz, loading its questions in the background if they are not in memory yet."""
+        self.load_data()
+        if quiz_title in self.quizzes or self.worker is None:
+            try:
+                questions = self.get_quiz(quiz_title)
+            except Exception as e:
+                messagebox.showerror("Error", f"An error occurred while loading the quiz: {e}")
+                return
+            self.begin_quiz(quiz_title, questions)
+            return
+
+        if self.loading_quiz is not None:
+            return
+        self.loading_quiz = quiz_title
+
+        def loaded(questions):
+            self.loading_quiz = None
+            self.quizzes[quiz_title] = questions
+            self.begin_quiz(quiz_title, questions)
+
+        def failed(e):
+            self.loading_quiz = None
+            messagebox.showerror("Error", f"An error occurred while loading the quiz: {e}")
+
+        self.worker.submit(self.load_quiz, quiz_title, on_done=loaded, on_error=failed)
+
+    def begin_quiz(self, quiz_title, questions):
+        """Show the first question of a loaded quiz and start the timer."""
+        self.current_quiz_title = quiz_title
+        # Grading and recording use stored question indices; the delivery maps positions back to them
+        self.answer_key = compile_answer_key(questions)
+        self.delivery = QuestionPool(questions).deliver(
+            new_seed(),
+            self.questions_per_attempt,
+            shuffle_questions=self.shuffle_questions,
+            shuffle_options=self.shuffle_options,
+        )
+        self.current_quiz = self.delivery.questions
+        self.attempt = None
+        if self.store is not None:
+            self.attempt = self.store.start_attempt(
+                quiz_title,
+                len(questions),
+                student_name=self.user_details.get("name"),
+                section=self.user_details.get("section"),
+            )
+            self.attempt.record_delivery(self.delivery)
         self.current_question_index = 0
         self.score = 0
         self.remaining_time = self.time_limit  # Set timer based on the time limit
+        self.build_question_view(self.max_option_count(self.current_quiz))
         self.start_timer()
         self.show_question()
 
     def start_timer(self):
         """Start the quiz timer."""
-        if self.timer_thread:
-            self.timer_thread.join()
-
-        def timer():
-            while self.remaining_time > 0:
-                self.remaining_time -= 1
-                self.update_timer_display()
-                self.root.update()
-                threading.Event().wait(1)
-            else:
-                self.end_quiz()
+        if self.timer:
+            self.timer.cancel()
 
-        self.timer_thread = threading.Thread(target=timer, daemon=True)
-        self.timer_thread.start()
+        self.timer = QuizTimer(
+            self.root,
+            self.time_limit,
+            self.question_time_limit,
+            on_tick=self.update_timer_display,
+            on_quiz_expired=self.end_quiz,
+            on_question_expired=self.submit_answer,
+        )
+        self.timer.start()
 
-    def update_timer_display(self):
+    def update_timer_display(self, quiz_remaining=None, question_remaining=None):
         """Update the timer display."""
+        if quiz_remaining is not None:
+            self.remaining_time = quiz_remaining
         minutes, seconds = divmod(self.remaining_time, 60)
         timer_text = f"Time Remaining: {minutes:02}:{seconds:02}"
+        if question_remaining is not None:
+            timer_text += f"  (this question: {question_remaining}s)"
         if hasattr(self, 'timer_label'):
             self.timer_label.config(text=timer_text)
 
     def show_question(self):
-        """Display the current question."""
+        """Display the current question, reusing the question view's widgets."""
         if self.current_question_index >= len(self.current_quiz):
             self.end_quiz()
             return
+        with QuizMetrics.timed("quizify_show_question_seconds"):
+            self.render_question()
+            if QuizMetrics.enabled:
+                # Draw now rather than when idle, so the time includes rendering
+                self.root.update_idletasks()
+
+    def render_question(self):
+        """Lay out the current question in the question view."""
+        question = self.current_quiz[self.current_question_index]
+        if question["type"] == "Multiple Choice":
+            options = question["options"]
+        elif question["type"] == "True/False":
+            options = ["True", "False"]
+        else:
+            options = None
+
+        needed = len(options) if options else 0
+        if (self.question_view is None or not self.question_view.winfo_exists()
+                or needed > len(self.option_buttons)):
+            self.build_question_view(max(needed, self.max_option_count(self.current_quiz)))
 
+        self.update_timer_display()
+        if self.timer:
+            self.timer.start_question()
+
+        self.question_label.config(
+            text=f"Question {self.current_question_index + 1}: {question['question']}"
+        )
+        self.answer_var.set("")
+
+        # Show question based on type
+        if options is not None:
+            self.answer_entry.pack_forget()
+            self.options_frame.pack(fill="x", padx=40)
+            # Only a suffix of the pool is ever hidden, so re-packing keeps the buttons in order
+            for button, option in zip(self.option_buttons, options):
+                button.config(text=option, value=option)
+                if not button.winfo_manager():
+                    button.pack(anchor="w")
+            for button in self.option_buttons[len(options):]:
+                button.pack_forget()
+        else:
+            self.options_frame.pack_forget()
+            self.answer_entry.pack(pady=10)
+
+    def build_question_view(self, option_count):
+        """Build the question screen once, with a pool of option_count radio buttons."""
         self.clear_frame()
-        question = self.current_quiz[self.current_question_index]
+        self.question_view = tk.Frame(self.root, bg="#F4F4F4")
+        self.question_view.pack(fill="both", expand=True)
 
         self.timer_label = tk.Label(
-            self.root,
+            self.question_view,
             text="",
             font=("Helvetica", 12),
             bg="#F4F4F4",
         )
         self.timer_label.pack(pady=10)
 
-        tk.Label(
-            self.root,
-            text=f"Question {self.current_question_index + 1}: {question['question']}",
+        self.question_label = tk.Label(
+            self.question_view,
+            text="",
             font=("Helvetica", 14),
             bg="#F4F4F4",
-        ).pack(pady=20)
+        )
+        self.question_label.pack(pady=20)
 
         self.answer_var = tk.StringVar()
 
-        # Show question based on type
-        if question["type"] == "Multiple Choice":
-            for option in question["options"]:
-                tk.Radiobutton(
-                    self.root,
-                    text=option,
-                    variable=self.answer_var,
-                    value=option,
-                    font=("Helvetica", 12),
-                    bg="#F4F4F4",
-                ).pack(anchor="w")
-        elif question["type"] == "True/False":
-            for option in ["True", "False"]:
-                tk.Radiobutton(
-                    self.root,
-                    text=option,
-                    variable=self.answer_var,
-                    value=option,
-                    font=("Helvetica", 12),
-                    bg="#F4F4F4",
-                ).pack(anchor="w")
-        else:
-            ttk.Entry(self.root, textvariable=self.answer_var, width=40).pack(pady=10)
+        # Holds either the radio buttons or the text entry, above the submit button
+        answer_frame = tk.Frame(self.question_view, bg="#F4F4F4")
+        answer_frame.pack(fill="x")
 
-        ttk.Button(self.root, text="Submit Answer", command=self.submit_answer).pack(pady=20)
+        self.options_frame = tk.Frame(answer_frame, bg="#F4F4F4")
+        self.option_buttons = [
+            tk.Radiobutton(
+                self.options_frame,
+                variable=self.answer_var,
+                font=("Helvetica", 12),
+                bg="#F4F4F4",
+            )
+            for _ in range(option_count)
+        ]
+        self.answer_entry = ttk.Entry(answer_frame, textvariable=self.answer_var, width=40)
+
+        ttk.Button(self.question_view, text="Submit Answer", command=self.submit_answer).pack(pady=20)
+
+    @staticmethod
+    def max_option_count(questions):
+        """Largest number of radio buttons any question in the quiz needs."""
+        counts = [
+            len(question["options"]) if question["type"] == "Multiple Choice" else 2
+            for question in questions
+            if question["type"] in ("Multiple Choice", "True/False")
+        ]
+        return max(counts, default=0)
 
     def submit_answer(self):
         """Submit the user's answer and proceed to the next question."""
         if self.current_question_index < len(self.current_quiz):
-            question = self.current_quiz[self.current_question_index]
             user_answer = self.answer_var.get().strip()
 
             # Validate answer
-            if question["type"] in ["Short Answer", "Fill-in-the-Blank", "True/False"]:
-                if user_answer.lower() == question["correct_answer"].lower():
-                    self.score += 1
-            elif question["type"] == "Multiple Choice":
-                if user_answer == question["correct_answer"]:
-                    self.score += 1
+            question_index = self.delivery.canonical_index(self.current_question_index)
+            correct = self.answer_key.is_correct(question_index, user_answer)
+            if self.attempt is not None:
+                self.attempt.add_response(question_index, user_answer, correct)
+            if correct:
+                self.score += 1
 
             self.current_question_index += 1
             if self.current_question_index < len(self.current_quiz):
@@ -394,8 +585,10 @@ class QuizifyApp:
 
     def end_quiz(self):
         """Display the final score and reset."""
-        if self.timer_thread:
-            self.timer_thread.join()
+        if self.timer:
+            self.timer.cancel()
+            self.timer = None
+        self.record_attempt()
 
         messagebox.showinfo(
             "Quiz Completed",
@@ -403,23 +596,78 @@ class QuizifyApp:
         )
         self.create_homepage()
 
-    def save_data(self):
-        """Save quizzes to a file."""
-        try:
-            with open("quizzes.json", "w") as file:
-                json.dump(self.quizzes, file)
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred while saving data: {e}")
+    def record_attempt(self):
+        """Store the finished attempt and its answers; unanswered questions count as wrong."""
+        if self.attempt is None:
+            return
+        attempt, self.attempt = self.attempt, None
+        self.worker.finish_attempt(
+            attempt,
+            on_error=lambda e: messagebox.showerror("Error", f"An error occurred while saving your results: {e}"),
+        )
+
+    def save_data(self, quiz_title=None, on_done=None):
+        """Save quizzes to disk; returns False if the store could not be opened to write them.
+
+        Only the given quiz is written; with no title, only quizzes that are
+        not stored yet are written. Writes happen on the background worker;
+        ``on_done`` runs once the given quiz has been written, and failures
+        are reported by the worker.
+        """
+        if quiz_title is None and not self.quizzes:
+            return True
+        if self.data_loaded and self.worker is None:
+            # Opening the store failed earlier; try again rather than dropping the quizzes
+            self.data_loaded = False
+        self.load_data()
+        if self.worker is None:
+            return False
+        if quiz_title is not None:
+            self.worker.save(quiz_title, self.quizzes[quiz_title].to_dicts(), on_done=on_done)
+        else:
+            for title, questions in self.quizzes.items():
+                if title not in self.store:
+                    self.worker.save(title, questions.to_dicts())
+        return True
 
     def load_data(self):
-        """Load quizzes from a file."""
+        """Open the quiz store unless that has been tried already; questions are loaded later, one quiz at a time."""
+        if self.data_loaded:
+            return
+        self.data_loaded = True
+        # Imported here so the database modules are not loaded until the first screen is up
+        from QuizStorage import open_store
+
         try:
-            with open("quizzes.json", "r") as file:
-                self.quizzes = json.load(file)
-        except FileNotFoundError:
-            self.quizzes = {}
+            self.store = open_store(self.storage_backend, self.storage_path, threaded=True)
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred while loading data: {e}")
+            return
+        self.worker = StoreWorker(
+            self.root,
+            self.store,
+            on_error=lambda e: messagebox.showerror("Error", f"An error occurred while saving data: {e}"),
+        )
+
+    def get_catalog_page(self, cursor, limit):
+        """Fetch one page of (title, question count) entries without loading any questions."""
+        if self.store is None:
+            entries = [
+                {"title": title, "question_count": len(questions)}
+                for title, questions in self.quizzes.items()
+            ]
+            return entries, None
+        return self.store.catalog_page(cursor, limit)
+
+    def get_quiz(self, quiz_title):
+        """Return a quiz's questions, loading them from disk on first use."""
+        if quiz_title not in self.quizzes:
+            self.quizzes[quiz_title] = self.load_quiz(quiz_title)
+        return self.quizzes[quiz_title]
+
+    def load_quiz(self, quiz_title):
+        """Read a quiz from the store as a QuestionBank; safe to call from the worker thread."""
+        return QuestionBank.from_dicts(self.store.load(quiz_title))
 
     def clear_frame(self):
         """Clear all widgets from the current frame."""
@@ -428,10 +676,23 @@ class QuizifyApp:
 
     def on_closing(self):
         """Handle the app closing event."""
-        self.save_data()
+        if not self.save_data() and not messagebox.askyesno(
+            "Quit", "Your new quizzes could not be saved and will be lost. Quit anyway?"
+        ):
+            return
+        if self.timer:
+            self.timer.cancel()
+        if self.worker is not None:
+            # Queued saves get a bounded wait; writes are atomic, so one cut short leaves the old file
+            if self.worker.close(self.SHUTDOWN_TIMEOUT):
+                self.store.close()
+        if self.stall_probe is not None:
+            self.stall_probe.stop()
+            logger.info("Main loop stalls: %s", self.stall_probe.stats())
         self.root.destroy()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
     root = tk.Tk()
     app = QuizifyApp(root)
     root.mainloop()
\ No newline at end of file
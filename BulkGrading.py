@@ -0,0 +1,232 @@
+"""Grade a directory of submitted answer files against one quiz, across processes.
+
+Each answer file holds one student's submission: either a JSON list of
+answers, a JSON object ``{"answers": [...], "student_name": ..., "section":
+...}``, or a text file with one answer per line (a blank line is
+unanswered). Answers are aligned with the quiz's questions, as the Tk app
+stores them. The student's name defaults to the file name.
+
+Files are split into chunks and graded in a ProcessPoolExecutor. Each worker
+compiles the answer key once, then reads, parses and grades whole chunks,
+sending back only scores, so the parent does little more than write rows.
+Results stream out as CSV as each chunk finishes. A summary goes to stderr,
+and optionally to a JSON file.
+
+    python BulkGrading.py --backend sqlite --path quizify.db --quiz "Science Quiz" submissions/ > results.csv
+    python BulkGrading.py --path quizzes.json --quiz "Science Quiz" submissions/ --summary summary.json
+"""
+import argparse
+import concurrent.futures
+import csv
+import json
+import os
+import statistics
+import sys
+
+from QuizGrader import compile_answer_key
+
+RESULT_FIELDS = ["file", "student_name", "section", "score", "question_count", "percent", "correct", "error"]
+SUBMISSION_SUFFIXES = (".json", ".txt")
+
+_answer_key = None  # Set in each worker process by _init_worker
+
+
+def load_quiz(backend, path, title):
+    """Return the questions of one quiz from a quiz store, or from a whole-bank ``quizzes.json`` file."""
+    if backend == "json" and path and os.path.isfile(path):
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)[title]
+    from QuizStorage import open_store
+
+    store = open_store(backend, path)
+    try:
+        return store.load(title)
+    finally:
+        store.close()
+
+
+def list_submissions(directory):
+    """Return the paths of the answer files in ``directory``, sorted by name."""
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.endswith(SUBMISSION_SUFFIXES) and not name.startswith(".")
+    )
+
+
+def read_submission(path):
+    """Return ``(answers, student_name, section)`` from one answer file."""
+    with open(path, "r", encoding="utf-8") as file:
+        if not path.endswith(".json"):
+            return [line.strip() or None for line in file.read().splitlines()], None, None
+        data = json.load(file)
+    if isinstance(data, list):
+        return data, None, None
+    if not isinstance(data, dict) or not isinstance(data.get("answers"), list):
+        raise ValueError("expected a list of answers or an object with an \"answers\" list")
+    return data["answers"], data.get("student_name") or data.get("name"), data.get("section")
+
+
+def grade_file(answer_key, path):
+    """Grade one answer file; returns a result row, with ``error`` set if the file could not be graded."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    row = {"file": path, "student_name": name, "section": None, "score": None,
+           "question_count": len(answer_key), "percent": None, "correct": None, "error": None}
+    try:
+        answers, student_name, section = read_submission(path)
+        answers = [None if answer is None else str(answer) for answer in answers]
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        row["error"] = str(e)
+        return row
+    results = answer_key.grade(answers)
+    score = sum(results)
+    row.update(
+        student_name=student_name or name,
+        section=section,
+        score=score,
+        percent=round(100 * score / len(answer_key), 1) if len(answer_key) else None,
+        correct="".join("1" if correct else "0" for correct in results),
+    )
+    return row
+
+
+def _init_worker(answer_key):
+    global _answer_key
+    _answer_key = answer_key
+
+
+def _grade_chunk(paths):
+    return [grade_file(_answer_key, path) for path in paths]
+
+
+def chunked(items, size):
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def grade_directory(questions, directory, workers=None, chunk_size=None):
+    """Grade every answer file in ``directory``, yielding result rows as each chunk finishes.
+
+    Rows arrive in completion order, not file order. With ``workers=1`` the
+    files are graded in this process.
+    """
+    answer_key = compile_answer_key(questions)
+    paths = list_submissions(directory)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(paths) <= 1:
+        for path in paths:
+            yield grade_file(answer_key, path)
+        return
+
+    # Several chunks per worker keeps every core busy when some chunks run slower
+    chunk_size = chunk_size or max(1, min(500, len(paths) // (workers * 4)))
+    chunks = iter(chunked(paths, chunk_size))
+    with concurrent.futures.ProcessPoolExecutor(workers, initializer=_init_worker,
+                                                initargs=(answer_key,)) as executor:
+        # Only a couple of chunks per worker are in flight, so memory stays flat however many files there are
+        running = set()
+        for chunk in chunks:
+            running.add(executor.submit(_grade_chunk, chunk))
+            if len(running) >= workers * 2:
+                break
+        while running:
+            done, running = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    running.add(executor.submit(_grade_chunk, chunk))
+
+
+class Summary:
+    """Running totals over graded rows: score statistics and how often each question was answered correctly."""
+
+    def __init__(self, question_count):
+        self.question_count = question_count
+        self.scores = []
+        self.errors = []  # (file, message) for files that could not be graded
+        self.correct_counts = [0] * question_count
+
+    def add(self, row):
+        if row["error"] is not None:
+            self.errors.append((row["file"], row["error"]))
+            return
+        self.scores.append(row["score"])
+        for index, flag in enumerate(row["correct"]):
+            if flag == "1":
+                self.correct_counts[index] += 1
+
+    def report(self):
+        graded = len(self.scores)
+        report = {
+            "question_count": self.question_count,
+            "graded": graded,
+            "failed": len(self.errors),
+            "errors": [{"file": path, "error": message} for path, message in self.errors],
+        }
+        if graded:
+            report.update(
+                mean=statistics.fmean(self.scores),
+                median=statistics.median(self.scores),
+                stdev=statistics.pstdev(self.scores),
+                min=min(self.scores),
+                max=max(self.scores),
+                score_counts={score: self.scores.count(score) for score in range(self.question_count + 1)},
+                question_percent_correct=[round(100 * count / graded, 1) for count in self.correct_counts],
+            )
+        return report
+
+
+def format_report(report):
+    """Render a summary report as plain text."""
+    lines = [f"Graded {report['graded']} submissions ({report['failed']} failed), "
+             f"{report['question_count']} questions"]
+    if report["graded"]:
+        lines.append(f"Score: mean {report['mean']:.2f}  median {report['median']}  stdev {report['stdev']:.2f}  "
+                     f"min {report['min']}  max {report['max']}")
+        hardest = sorted(enumerate(report["question_percent_correct"], 1), key=lambda item: item[1])[:5]
+        lines.append("Hardest questions: " + ", ".join(f"Q{number} {percent}%" for number, percent in hardest))
+    for error in report["errors"]:
+        lines.append(f"Failed: {error['file']}: {error['error']}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grade a directory of answer files against a quiz.")
+    parser.add_argument("submissions", help="directory of answer files (.json or .txt, one per student)")
+    parser.add_argument("--backend", default="json", choices=["json", "sqlite"])
+    parser.add_argument("--path", help="quiz store directory, database file or quizzes.json")
+    parser.add_argument("--quiz", required=True, help="title of the quiz to grade against")
+    parser.add_argument("--workers", type=int, help="grading processes (default: one per core)")
+    parser.add_argument("--chunk-size", type=int, help="answer files per task sent to a worker")
+    parser.add_argument("--output", help="write result rows as CSV here instead of stdout")
+    parser.add_argument("--summary", help="also write the summary report as JSON here")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.submissions):
+        sys.exit(f"No submissions directory {args.submissions!r}")
+    try:
+        questions = load_quiz(args.backend, args.path, args.quiz)
+    except KeyError:
+        sys.exit(f"No quiz titled {args.quiz!r}")
+
+    summary = Summary(len(questions))
+    output = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        writer = csv.DictWriter(output, RESULT_FIELDS)
+        writer.writeheader()
+        for row in grade_directory(questions, args.submissions, args.workers, args.chunk_size):
+            writer.writerow(row)
+            summary.add(row)
+    finally:
+        if args.output:
+            output.close()
+
+    report = summary.report()
+    print(format_report(report), file=sys.stderr)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,346 @@
+import functools
+import json
 import sqlite3
+import threading
+import time
+
+import QuizMetrics
+from QuizCache import LRUCache
+from QuizDedup import FIELD_SEPARATOR, content_hash, exact_hash
+from QuizModel import QuestionBank
+
+# Oldest SQLite the migrations run on: they number rows with window functions
+MIN_SQLITE_VERSION = (3, 25, 0)
+
+# Migration 2 numbers option positions in one window-function pass. UPDATE ... FROM needs
+# SQLite 3.33+; older versions join the numbers back through a temporary table keyed by option id.
+_NUMBER_OPTIONS_UPDATE_FROM = [
+    '''UPDATE options SET position = ranked.position
+    FROM (
+        SELECT id, ROW_NUMBER() OVER (PARTITION BY question_id ORDER BY id) - 1 AS position
+        FROM options
+    ) AS ranked
+    WHERE options.id = ranked.id''',
+]
+_NUMBER_OPTIONS_TEMP_TABLE = [
+    'CREATE TEMP TABLE option_positions (id INTEGER PRIMARY KEY, position INTEGER NOT NULL)',
+    '''INSERT INTO temp.option_positions (id, position)
+    SELECT id, ROW_NUMBER() OVER (PARTITION BY question_id ORDER BY id) - 1 FROM options''',
+    '''UPDATE options
+    SET position = (SELECT position FROM temp.option_positions WHERE option_positions.id = options.id)''',
+    'DROP TABLE temp.option_positions',
+]
+NUMBER_OPTION_POSITIONS = (
+    _NUMBER_OPTIONS_UPDATE_FROM if sqlite3.sqlite_version_info >= (3, 33, 0) else _NUMBER_OPTIONS_TEMP_TABLE
+)
+
+
+def stored_question_hash(question_type, question, options, correct_option, correct_answer, accepted_answers):
+    """Digest of a question's stored columns and options, as kept in questions.body_hash."""
+    return exact_hash([question_type, question, list(options), correct_option, correct_answer, accepted_answers])
+
+
+def retry_on_busy(method):
+    """Retry a write method with backoff while another connection holds the write lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        delay = 0.01
+        for attempt in range(self.BUSY_RETRIES + 1):
+            try:
+                return method(self, *args, **kwargs)
+            except sqlite3.OperationalError as e:
+                message = str(e)
+                if attempt == self.BUSY_RETRIES or ('locked' not in message and 'busy' not in message):
+                    raise
+                self.conn.rollback()
+                time.sleep(delay)
+                delay = min(delay * 2, 1.0)
+    return wrapper
+
 
 class QuizifyDatabase:
-    def __init__(self, db_name='quizify.db'):
+    # Maximum number of quiz IDs bound into a single IN (...) query
+    MAX_BATCH_IDS = 500
+
+    # Schema migrations, applied in order and tracked with PRAGMA user_version.
+    # Migration N (1-based) upgrades a database from version N-1 to version N.
+    # Never edit a released migration; append a new one instead.
+    MIGRATIONS = [
+        # 1: index the foreign keys used by quiz lookups and deletes
+        [
+            'CREATE INDEX IF NOT EXISTS idx_questions_quiz_id ON questions (quiz_id, id)',
+            'CREATE INDEX IF NOT EXISTS idx_options_question_id ON options (question_id)',
+        ],
+        # 2: store option order explicitly and index options by (question, position)
+        [
+            'ALTER TABLE options ADD COLUMN position INTEGER NOT NULL DEFAULT 0',
+            *NUMBER_OPTION_POSITIONS,
+            'DROP INDEX IF EXISTS idx_options_question_id',
+            'CREATE INDEX IF NOT EXISTS idx_options_question_position ON options (question_id, position)',
+        ],
+        # 3: keep the Tk app's question type and answer text, and look quizzes up by title
+        [
+            'ALTER TABLE questions ADD COLUMN type TEXT',
+            'ALTER TABLE questions ADD COLUMN correct_answer TEXT',
+            'CREATE INDEX IF NOT EXISTS idx_quizzes_title ON quizzes (title)',
+        ],
+        # 4: record quiz attempts; correctness holds one byte per question (1 correct, 0 wrong).
+        # The quiz title is copied so results stay readable after the quiz is replaced or deleted.
+        [
+            '''CREATE TABLE IF NOT EXISTS attempts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                quiz_id INTEGER,
+                quiz_title TEXT NOT NULL,
+                student_name TEXT,
+                section TEXT,
+                finished_at REAL,
+                score INTEGER NOT NULL,
+                correctness BLOB NOT NULL,
+                FOREIGN KEY (quiz_id) REFERENCES quizzes(id)
+            )''',
+            'CREATE INDEX IF NOT EXISTS idx_attempts_quiz_title ON attempts (quiz_title)',
+        ],
+        # 5: per-answer responses with timestamps, and when each attempt started
+        [
+            'ALTER TABLE attempts ADD COLUMN started_at REAL',
+            '''CREATE TABLE IF NOT EXISTS responses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                attempt_id INTEGER NOT NULL,
+                question_index INTEGER NOT NULL,
+                answer TEXT,
+                correct INTEGER NOT NULL,
+                answered_at REAL,
+                FOREIGN KEY (attempt_id) REFERENCES attempts(id)
+            )''',
+            'CREATE INDEX IF NOT EXISTS idx_responses_attempt ON responses (attempt_id, question_index)',
+        ],
+        # 6: full-text search over titles, questions and options. Each FTS5 table indexes
+        # its base table as external content and is kept in sync by triggers. Insert
+        # triggers are skipped while fts_paused has a row, so bulk imports can index
+        # each batch in one INSERT ... SELECT instead of row by row.
+        [
+            'CREATE TABLE IF NOT EXISTS fts_paused (paused INTEGER)',
+            "CREATE VIRTUAL TABLE IF NOT EXISTS quizzes_fts USING fts5(title, content='quizzes', content_rowid='id')",
+            "CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(question, content='questions', content_rowid='id')",
+            "CREATE VIRTUAL TABLE IF NOT EXISTS options_fts USING fts5(option_text, content='options', content_rowid='id')",
+            '''CREATE TRIGGER IF NOT EXISTS quizzes_fts_insert AFTER INSERT ON quizzes
+            WHEN NOT EXISTS (SELECT 1 FROM fts_paused) BEGIN
+                INSERT INTO quizzes_fts (rowid, title) VALUES (new.id, new.title);
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS quizzes_fts_delete AFTER DELETE ON quizzes BEGIN
+                INSERT INTO quizzes_fts (quizzes_fts, rowid, title) VALUES ('delete', old.id, old.title);
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS quizzes_fts_update AFTER UPDATE OF title ON quizzes BEGIN
+                INSERT INTO quizzes_fts (quizzes_fts, rowid, title) VALUES ('delete', old.id, old.title);
+                INSERT INTO quizzes_fts (rowid, title) VALUES (new.id, new.title);
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS questions_fts_insert AFTER INSERT ON questions
+            WHEN NOT EXISTS (SELECT 1 FROM fts_paused) BEGIN
+                INSERT INTO questions_fts (rowid, question) VALUES (new.id, new.question);
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS questions_fts_delete AFTER DELETE ON questions BEGIN
+                INSERT INTO questions_fts (questions_fts, rowid, question) VALUES ('delete', old.id, old.question);
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS questions_fts_update AFTER UPDATE OF question ON questions BEGIN
+                INSERT INTO questions_fts (questions_fts, rowid, question) VALUES ('delete', old.id, old.question);
+                INSERT INTO questions_fts (rowid, question) VALUES (new.id, new.question);
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS options_fts_insert AFTER INSERT ON options
+            WHEN NOT EXISTS (SELECT 1 FROM fts_paused) BEGIN
+                INSERT INTO options_fts (rowid, option_text) VALUES (new.id, new.option_text);
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS options_fts_delete AFTER DELETE ON options BEGIN
+                INSERT INTO options_fts (options_fts, rowid, option_text) VALUES ('delete', old.id, old.option_text);
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS options_fts_update AFTER UPDATE OF option_text ON options BEGIN
+                INSERT INTO options_fts (options_fts, rowid, option_text) VALUES ('delete', old.id, old.option_text);
+                INSERT INTO options_fts (rowid, option_text) VALUES (new.id, new.option_text);
+            END''',
+            # Index everything that existed before this migration
+            "INSERT INTO quizzes_fts (quizzes_fts) VALUES ('rebuild')",
+            "INSERT INTO questions_fts (questions_fts) VALUES ('rebuild')",
+            "INSERT INTO options_fts (options_fts) VALUES ('rebuild')",
+        ],
+        # 7: the shuffle seed and number of questions delivered, so an attempt can be rebuilt
+        [
+            'ALTER TABLE attempts ADD COLUMN seed INTEGER',
+            'ALTER TABLE attempts ADD COLUMN delivered_count INTEGER',
+        ],
+        # 8: a hash of each question's content (see QuizDedup.content_hash), so repeated
+        # questions can be found with an index lookup. content_hash() is registered on every connection.
+        [
+            'ALTER TABLE questions ADD COLUMN content_hash TEXT',
+            f'''UPDATE questions SET content_hash = content_hash(
+                type, question,
+                (SELECT group_concat(option_text, char({ord(FIELD_SEPARATOR)})) FROM (
+                    SELECT option_text FROM options WHERE question_id = questions.id ORDER BY position, id
+                )),
+                COALESCE(correct_answer, correct_option)
+            )''',
+            'CREATE INDEX IF NOT EXISTS idx_questions_content_hash ON questions (content_hash)',
+        ],
+        # 9: extra answers QuizGrader accepts for a question, as a JSON list (NULL when there are none)
+        [
+            'ALTER TABLE questions ADD COLUMN accepted_answers TEXT',
+        ],
+        # 10: which questions an attempt was shown (a JSON list of canonical indices, NULL when all were),
+        # the quiz length, and the QuizShuffle settings, so partial attempts are scored and rebuilt faithfully
+        [
+            'ALTER TABLE attempts ADD COLUMN question_indices TEXT',
+            'ALTER TABLE attempts ADD COLUMN question_count INTEGER',
+            'ALTER TABLE attempts ADD COLUMN shuffle_questions INTEGER',
+            'ALTER TABLE attempts ADD COLUMN shuffle_options INTEGER',
+        ],
+        # 11: store each distinct question once and share it between quizzes. quiz_questions lists each
+        # quiz's questions in order; questions holds one row per body_hash, a digest of the exact stored
+        # content (see stored_question_hash), and questions.quiz_id is no longer used.
+        [
+            'ALTER TABLE questions ADD COLUMN body_hash TEXT',
+            f'''UPDATE questions SET body_hash = stored_question_hash(
+                type, question,
+                (SELECT group_concat(option_text, char({ord(FIELD_SEPARATOR)})) FROM (
+                    SELECT option_text FROM options WHERE question_id = questions.id ORDER BY position, id
+                )),
+                correct_option, correct_answer, accepted_answers
+            )''',
+            '''CREATE TABLE quiz_questions (
+                quiz_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                question_id INTEGER NOT NULL,
+                PRIMARY KEY (quiz_id, position),
+                FOREIGN KEY (quiz_id) REFERENCES quizzes(id),
+                FOREIGN KEY (question_id) REFERENCES questions(id)
+            ) WITHOUT ROWID''',
+            # Every copy of a question points at the oldest one
+            '''INSERT INTO quiz_questions (quiz_id, position, question_id)
+            SELECT quiz_id, ROW_NUMBER() OVER (PARTITION BY quiz_id ORDER BY id) - 1,
+                   MIN(id) OVER (PARTITION BY body_hash)
+            FROM questions
+            WHERE quiz_id IN (SELECT id FROM quizzes)''',
+            'CREATE INDEX idx_quiz_questions_question ON quiz_questions (question_id, quiz_id)',
+            '''DELETE FROM options
+            WHERE question_id IS NULL OR question_id NOT IN (SELECT question_id FROM quiz_questions)''',
+            'DELETE FROM questions WHERE id NOT IN (SELECT question_id FROM quiz_questions)',
+            'UPDATE questions SET quiz_id = NULL',
+            'DROP INDEX IF EXISTS idx_questions_quiz_id',
+            'CREATE UNIQUE INDEX idx_questions_body_hash ON questions (body_hash)',
+        ],
+    ]
+
+    # Columns yielded by iter_results, in order
+    RESULT_COLUMNS = (
+        'attempt_id', 'quiz_title', 'student_name', 'section', 'started_at', 'finished_at',
+        'score', 'question_count', 'question_index', 'answer', 'correct', 'answered_at',
+    )
+
+    # Pragmas applied to every pooled connection
+    POOL_PRAGMAS = [
+        'PRAGMA journal_mode = WAL',
+        'PRAGMA synchronous = NORMAL',
+        'PRAGMA cache_size = -16000',  # 16 MiB page cache per connection
+        'PRAGMA mmap_size = 268435456',  # 256 MiB memory-mapped reads
+        'PRAGMA temp_store = MEMORY',
+    ]
+
+    # How many times a write is retried after SQLITE_BUSY outlasts the busy timeout
+    BUSY_RETRIES = 5
+
+    def __init__(self, db_name='quizify.db', pooled=False, busy_timeout=5.0, cache_entries=128, cache_bytes=None):
+        """Open the database.
+
+        With ``pooled=True`` each thread gets its own WAL-mode connection, so
+        readers on any thread can run while another thread is writing.
+
+        Hydrated quizzes are kept in an LRU cache bounded by ``cache_entries``
+        and/or ``cache_bytes``; pass ``cache_entries=0`` to disable it.
+        """
+        if pooled and db_name == ':memory:':
+            raise ValueError("Pooled mode needs a database file; ':memory:' is private to one connection")
+
+        self.db_name = db_name
+        self.pooled = pooled
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self.cache = None
+        if cache_entries != 0:
+            self.cache = LRUCache(max_entries=cache_entries, max_bytes=cache_bytes)
+
         # Connect to the SQLite database (or create it if it doesn't exist)
-        self.conn = sqlite3.connect(db_name)
-        self.cursor = self.conn.cursor()
+        if not pooled:
+            self._conn = sqlite3.connect(db_name, timeout=busy_timeout)
+            self._register_functions(self._conn)
+            self._cursor = self._conn.cursor(QuizMetrics.cursor_factory())
         self.init_db()
 
+    @property
+    def conn(self):
+        """The connection for the calling thread."""
+        if not self.pooled:
+            return self._conn
+        return self._thread_connection()[0]
+
+    @property
+    def cursor(self):
+        """The cursor for the calling thread."""
+        if not self.pooled:
+            return self._cursor
+        return self._thread_connection()[1]
+
+    def _thread_connection(self):
+        """Return the calling thread's (connection, cursor), opening them on first use."""
+        local = self._local
+        if getattr(local, 'conn', None) is None:
+            local.conn = self._connect()
+            local.cursor = local.conn.cursor(QuizMetrics.cursor_factory())
+        return local.conn, local.cursor
+
+    def _connect(self):
+        """Open and tune a new pooled connection."""
+        conn = sqlite3.connect(self.db_name, timeout=self.busy_timeout, check_same_thread=False)
+        self._register_functions(conn)
+        for pragma in self.POOL_PRAGMAS:
+            conn.execute(pragma)
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+
+    @staticmethod
+    def _register_functions(conn):
+        """Make the Python helpers used by migrations callable from SQL."""
+        conn.create_function('content_hash', 4, lambda question_type, question, options, answer: content_hash(
+            question_type, question, options.split(FIELD_SEPARATOR) if options is not None else (), answer
+        ), deterministic=True)
+        conn.create_function('stored_question_hash', 6, lambda question_type, question, options, correct_option,
+                             correct_answer, accepted_answers: stored_question_hash(
+            question_type, question, options.split(FIELD_SEPARATOR) if options is not None else (),
+            correct_option, correct_answer, accepted_answers,
+        ), deterministic=True)
+
+    @staticmethod
+    def question_hash(question_data):
+        """Content hash of a question in this module's format, matching the stored content_hash column."""
+        answer = question_data.get('correct_answer')
+        if answer is None:
+            answer = question_data.get('correct_option')
+        return content_hash(question_data.get('type'), question_data['question'], question_data['options'], answer)
+
+    @staticmethod
+    def encode_accepted_answers(question_data):
+        """The accepted_answers column value for a question: a JSON list, or None."""
+        accepted = question_data.get('accepted_answers')
+        return json.dumps(list(accepted)) if accepted else None
+
+    @classmethod
+    def body_hash(cls, question_data):
+        """The body_hash column value for a question; questions with equal values share one stored row."""
+        return stored_question_hash(
+            question_data.get('type'), question_data['question'], question_data['options'],
+            question_data.get('correct_option'), question_data.get('correct_answer'),
+            cls.encode_accepted_answers(question_data),
+        )
+
     def init_db(self):
         """Create tables for quizzes, questions, and options if they don't exist."""
         # Create quizzes table
@@ -36,32 +370,239 @@ class QuizifyDatabase:
         )''')
 
         self.conn.commit()
+        self.migrate()
+
+    def get_schema_version(self):
+        """Return the schema version stored in the database file."""
+        self.cursor.execute('PRAGMA user_version')
+        return self.cursor.fetchone()[0]
 
+    def migrate(self):
+        """Upgrade the database schema in place to the latest version."""
+        version = self.get_schema_version()
+        if version > len(self.MIGRATIONS):
+            raise RuntimeError(
+                f"Database schema version {version} is newer than this app supports ({len(self.MIGRATIONS)})"
+            )
+        if version < len(self.MIGRATIONS) and sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+            raise RuntimeError(
+                f"Upgrading the database needs SQLite {'.'.join(map(str, MIN_SQLITE_VERSION))} or later; "
+                f"this Python uses SQLite {sqlite3.sqlite_version}"
+            )
+
+        for version, statements in enumerate(self.MIGRATIONS[version:], start=version + 1):
+            # Run each migration in its own transaction so a failure leaves the previous version intact
+            self.cursor.execute('BEGIN')
+            try:
+                for statement in statements:
+                    self.cursor.execute(statement)
+                self.cursor.execute(f'PRAGMA user_version = {version}')
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+
+    @retry_on_busy
     def save_quiz(self, title, questions):
-        """Save a new quiz to the database."""
-        # Insert the quiz title
-        self.cursor.execute('INSERT INTO quizzes (title) VALUES (?)', (title,))
-        quiz_id = self.cursor.lastrowid
+        """Save a new quiz to the database.
 
-        for question_data in questions:
-            question_text = question_data['question']
-            correct_option = question_data['correct_option']
+        A question already stored, for this quiz or any other, is shared
+        rather than written again.
+        """
+        try:
+            # Index the quiz for search in one pass at the end rather than row by row
+            self.cursor.execute('INSERT INTO fts_paused (paused) VALUES (1)')
+            last_option_id = self._max_id('options')
 
-            # Insert the question
-            self.cursor.execute('''
-            INSERT INTO questions (quiz_id, question, correct_option)
+            # Insert the quiz title
+            self.cursor.execute('INSERT INTO quizzes (title) VALUES (?)', (title,))
+            quiz_id = self.cursor.lastrowid
+            first_question_id = last_question_id = None
+
+            for position, question_data in enumerate(questions):
+                body_hash = self.body_hash(question_data)
+                self.cursor.execute('SELECT id FROM questions WHERE body_hash = ?', (body_hash,))
+                row = self.cursor.fetchone()
+                if row is not None:
+                    question_id = row[0]
+                else:
+                    # Insert the question
+                    self.cursor.execute('''
+                    INSERT INTO questions (question, correct_option, type, correct_answer, content_hash,
+                                           accepted_answers, body_hash)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ''', (question_data['question'], question_data.get('correct_option'),
+                          question_data.get('type'), question_data.get('correct_answer'),
+                          self.question_hash(question_data), self.encode_accepted_answers(question_data), body_hash))
+                    question_id = last_question_id = self.cursor.lastrowid
+                    if first_question_id is None:
+                        first_question_id = question_id
+
+                    # Insert the options for this question
+                    for option_position, option in enumerate(question_data['options']):
+                        self.cursor.execute('''
+                        INSERT INTO options (question_id, option_text, position)
+                        VALUES (?, ?, ?)
+                        ''', (question_id, option, option_position))
+
+                self.cursor.execute('INSERT INTO quiz_questions (quiz_id, position, question_id) VALUES (?, ?, ?)',
+                                    (quiz_id, position, question_id))
+
+            self._index_new_rows((quiz_id, quiz_id), (first_question_id, last_question_id), last_option_id)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        if self.cache is not None:
+            self.cache.invalidate(quiz_id)
+        return quiz_id
+
+    def import_quizzes(self, quizzes, batch_size=1000):
+        """Bulk-import many quizzes and return row counts and throughput.
+
+        ``quizzes`` may be any iterable (including a generator) of
+        ``{'title', 'questions'}`` dicts or ``(title, questions)`` pairs.
+        Each batch of ``batch_size`` quizzes is read from ``quizzes`` first
+        and then written with ``executemany`` in its own transaction, so the
+        write lock is never held while the caller's iterable is consumed.
+        ``questions`` and ``options`` count the rows written; ``shared``
+        counts questions that reused an already stored copy.
+        """
+        stats = {'quizzes': 0, 'questions': 0, 'options': 0, 'shared': 0}
+        started = time.perf_counter()
+
+        # IDs are assigned when the batch is written; links refer to quizzes by offset within the batch
+        titles, bodies, links = [], {}, []
+        for quiz in quizzes:
+            if isinstance(quiz, dict):
+                title, questions = quiz['title'], quiz['questions']
+            else:
+                title, questions = quiz
+
+            quiz_offset = len(titles)
+            titles.append(title)
+            for position, question_data in enumerate(questions):
+                body_hash = self.body_hash(question_data)
+                if body_hash not in bodies:
+                    bodies[body_hash] = ((
+                        question_data['question'], question_data.get('correct_option'),
+                        question_data.get('type'), question_data.get('correct_answer'),
+                        self.question_hash(question_data), self.encode_accepted_answers(question_data), body_hash,
+                    ), list(question_data['options']))
+                links.append((quiz_offset, position, body_hash))
+
+            if len(titles) >= batch_size:
+                self._import_batch(titles, bodies, links, stats)
+                titles, bodies, links = [], {}, []
+
+        if titles:
+            self._import_batch(titles, bodies, links, stats)
+
+        elapsed = time.perf_counter() - started
+        rows = stats['quizzes'] + stats['questions'] + stats['options']
+        stats['seconds'] = elapsed
+        stats['rows_per_sec'] = rows / elapsed if elapsed > 0 else float('inf')
+        return stats
+
+    @retry_on_busy
+    def _import_batch(self, titles, bodies, links, stats):
+        """Write one buffered batch of import_quizzes in a single transaction.
+
+        ``bodies`` maps each distinct body_hash in the batch to its question
+        row and options; only those not already stored are written.
+        """
+        # Take the write lock before reading the ID counters, so no other connection can use these IDs
+        self.cursor.execute('BEGIN IMMEDIATE')
+        try:
+            first_quiz_id = self._next_id('quizzes')
+            first_question_id = self._next_id('questions')
+            last_option_id = self._max_id('options')
+            question_ids = self._question_ids_by_body_hash(list(bodies))
+            new_bodies = [body_hash for body_hash in bodies if body_hash not in question_ids]
+            for offset, body_hash in enumerate(new_bodies):
+                question_ids[body_hash] = first_question_id + offset
+            option_rows = [
+                (question_ids[body_hash], option, position)
+                for body_hash in new_bodies
+                for position, option in enumerate(bodies[body_hash][1])
+            ]
+
+            # Index the whole batch for search afterwards rather than once per row
+            self.cursor.execute('INSERT INTO fts_paused (paused) VALUES (1)')
+            self.cursor.executemany(
+                'INSERT INTO quizzes (id, title) VALUES (?, ?)',
+                ((first_quiz_id + offset, title) for offset, title in enumerate(titles)),
+            )
+            self.cursor.executemany('''
+            INSERT INTO questions (id, question, correct_option, type, correct_answer, content_hash,
+                                   accepted_answers, body_hash)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', ((question_ids[body_hash], *bodies[body_hash][0]) for body_hash in new_bodies))
+            self.cursor.executemany('''
+            INSERT INTO options (question_id, option_text, position)
+            VALUES (?, ?, ?)
+            ''', option_rows)
+            self.cursor.executemany('''
+            INSERT INTO quiz_questions (quiz_id, position, question_id)
             VALUES (?, ?, ?)
-            ''', (quiz_id, question_text, correct_option))
-            question_id = self.cursor.lastrowid
+            ''', ((first_quiz_id + quiz_offset, position, question_ids[body_hash])
+                  for quiz_offset, position, body_hash in links))
+            self._index_new_rows(
+                (first_quiz_id, first_quiz_id + len(titles) - 1),
+                (first_question_id, first_question_id + len(new_bodies) - 1) if new_bodies else None,
+                last_option_id,
+            )
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        stats['quizzes'] += len(titles)
+        stats['questions'] += len(new_bodies)
+        stats['options'] += len(option_rows)
+        stats['shared'] += len(links) - len(new_bodies)
 
-            # Insert the options for this question
-            for option in question_data['options']:
-                self.cursor.execute('''
-                INSERT INTO options (question_id, option_text)
-                VALUES (?, ?)
-                ''', (question_id, option))
+    def _question_ids_by_body_hash(self, body_hashes):
+        """Map each of ``body_hashes`` that is already stored to its question ID."""
+        question_ids = {}
+        for start in range(0, len(body_hashes), self.MAX_BATCH_IDS):
+            batch = body_hashes[start:start + self.MAX_BATCH_IDS]
+            placeholders = ', '.join('?' * len(batch))
+            self.cursor.execute(f'SELECT body_hash, id FROM questions WHERE body_hash IN ({placeholders})', batch)
+            question_ids.update(self.cursor.fetchall())
+        return question_ids
 
-        self.conn.commit()
+    def _index_new_rows(self, quiz_ids, question_ids, last_option_id):
+        """Add rows written while fts_paused was set to the search index, then resume the triggers.
+
+        ``quiz_ids`` and ``question_ids`` are inclusive (first, last) ranges or
+        None; every option with an id above ``last_option_id`` is new.
+        """
+        if quiz_ids:
+            self.cursor.execute('''
+            INSERT INTO quizzes_fts (rowid, title)
+            SELECT id, title FROM quizzes WHERE id BETWEEN ? AND ?
+            ''', quiz_ids)
+        if question_ids and question_ids[0] is not None:
+            self.cursor.execute('''
+            INSERT INTO questions_fts (rowid, question)
+            SELECT id, question FROM questions WHERE id BETWEEN ? AND ?
+            ''', question_ids)
+        self.cursor.execute('''
+        INSERT INTO options_fts (rowid, option_text)
+        SELECT id, option_text FROM options WHERE id > ?
+        ''', (last_option_id,))
+        self.cursor.execute('DELETE FROM fts_paused')
+
+    def _max_id(self, table):
+        self.cursor.execute(f'SELECT COALESCE(MAX(id), 0) FROM {table}')
+        return self.cursor.fetchone()[0]
+
+    def _next_id(self, table):
+        """Return the next AUTOINCREMENT id for a table without reusing deleted ids."""
+        self.cursor.execute('SELECT seq FROM sqlite_sequence WHERE name = ?', (table,))
+        row = self.cursor.fetchone()
+        sequence = row[0] if row else 0
+        return max(sequence, self._max_id(table)) + 1
 
     def get_all_quizzes(self):
         """Get a list of all quizzes."""
@@ -69,43 +610,315 @@ class QuizifyDatabase:
         quizzes = self.cursor.fetchall()
         return quizzes
 
+    def get_quiz_page(self, after_id=0, limit=50, latest_only=False):
+        """Get the next ``limit`` (id, title, question count) rows with id greater than ``after_id``.
+
+        Keyset pagination: each page is an index range scan however deep into
+        the list it is, unlike OFFSET which re-reads every earlier row. With
+        ``latest_only`` a title stored more than once appears once, as its
+        newest copy.
+        """
+        # A row is superseded by any newer row with the same title
+        latest = 'AND NOT EXISTS (SELECT 1 FROM quizzes nq WHERE nq.title = qz.title AND nq.id > qz.id)'
+        self.cursor.execute(f'''
+        SELECT qz.id, qz.title, (SELECT COUNT(*) FROM quiz_questions qq WHERE qq.quiz_id = qz.id)
+        FROM quizzes qz
+        WHERE qz.id > ? {latest if latest_only else ''}
+        ORDER BY qz.id
+        LIMIT ?
+        ''', (after_id, limit))
+        return self.cursor.fetchall()
+
+    @staticmethod
+    def _fts_query(text):
+        """Turn free text into an FTS5 query matching every word as a prefix."""
+        words = text.split()
+        return ' '.join('"' + word.replace('"', '""') + '"*' for word in words)
+
+    def search_quizzes(self, text, limit=50):
+        """Full-text search titles, questions and options; returns (id, title) pairs, best match first."""
+        query = self._fts_query(text)
+        if not query:
+            return []
+        self.cursor.execute('''
+        SELECT qz.id, qz.title
+        FROM (
+            SELECT rowid AS quiz_id, bm25(quizzes_fts) AS rank
+            FROM quizzes_fts WHERE quizzes_fts MATCH :query
+            UNION ALL
+            SELECT qq.quiz_id, bm25(questions_fts)
+            FROM questions_fts JOIN quiz_questions qq ON qq.question_id = questions_fts.rowid
+            WHERE questions_fts MATCH :query
+            UNION ALL
+            SELECT qq.quiz_id, bm25(options_fts)
+            FROM options_fts
+            JOIN options op ON op.id = options_fts.rowid
+            JOIN quiz_questions qq ON qq.question_id = op.question_id
+            WHERE options_fts MATCH :query
+        ) hits
+        JOIN quizzes qz ON qz.id = hits.quiz_id
+        GROUP BY qz.id
+        ORDER BY MIN(hits.rank)
+        LIMIT :limit
+        ''', {'query': query, 'limit': limit})
+        return self.cursor.fetchall()
+
+    def get_quiz_ids_by_title(self, title):
+        """Get the IDs of every quiz with the given title, oldest first."""
+        self.cursor.execute('SELECT id FROM quizzes WHERE title = ? ORDER BY id', (title,))
+        return [row[0] for row in self.cursor.fetchall()]
+
+    def get_quiz_summaries(self):
+        """Get (id, title, question count) for every quiz without loading questions."""
+        self.cursor.execute('''
+        SELECT qz.id, qz.title, COUNT(qq.question_id)
+        FROM quizzes qz
+        LEFT JOIN quiz_questions qq ON qq.quiz_id = qz.id
+        GROUP BY qz.id
+        ORDER BY qz.id
+        ''')
+        return self.cursor.fetchall()
+
+    def get_duplicate_questions(self):
+        """Get every question used more than once, as lists of (quiz_id, question_id), one per content hash.
+
+        Exact copies share a question_id; copies differing only in case or
+        whitespace are separate rows with the same content hash.
+        """
+        self.cursor.execute('''
+        SELECT qs.content_hash, qq.quiz_id, qq.question_id
+        FROM quiz_questions qq
+        JOIN questions qs ON qs.id = qq.question_id
+        WHERE qs.content_hash IN (
+            SELECT qs.content_hash
+            FROM quiz_questions qq
+            JOIN questions qs ON qs.id = qq.question_id
+            WHERE qs.content_hash IS NOT NULL
+            GROUP BY qs.content_hash HAVING COUNT(*) > 1
+        )
+        ORDER BY qs.content_hash, qq.quiz_id, qq.position
+        ''')
+        groups = {}
+        for hash_value, quiz_id, question_id in self.cursor.fetchall():
+            groups.setdefault(hash_value, []).append((quiz_id, question_id))
+        return list(groups.values())
+
     def get_quiz_by_id(self, quiz_id):
         """Get a quiz and its questions by quiz ID."""
-        # Get quiz title
-        self.cursor.execute('SELECT title FROM quizzes WHERE id = ?', (quiz_id,))
-        quiz = self.cursor.fetchone()
-        if not quiz:
-            return None
+        return self.get_quizzes_by_ids([quiz_id]).get(quiz_id)
 
-        quiz_title = quiz[0]
+    def get_quizzes_by_ids(self, quiz_ids):
+        """Get several quizzes at once as a dict mapping quiz ID to quiz data.
 
-        # Get questions for this quiz
-        self.cursor.execute('SELECT id, question, correct_option FROM questions WHERE quiz_id = ?', (quiz_id,))
-        questions = self.cursor.fetchall()
+        Each quiz's questions are a list of dicts, fresh for every call. The
+        dicts are cached with the quiz, so a cached quiz costs only a copy.
+        """
+        if self.cache is None:
+            return {
+                quiz_id: {'title': quiz_data['title'], 'questions': quiz_data['questions'].to_dicts()}
+                for quiz_id, quiz_data in self._load_quizzes(list(dict.fromkeys(quiz_ids))).items()
+            }
+
+        generation = self.cache.generation
+        quizzes = {}
+        for quiz_id, quiz_data in self.get_quiz_banks_by_ids(quiz_ids).items():
+            questions = quiz_data.get('question_dicts')
+            if questions is None:
+                questions = quiz_data['questions'].to_dicts()
+                self.cache.put(quiz_id, dict(quiz_data, question_dicts=questions), generation)
+            quizzes[quiz_id] = {'title': quiz_data['title'], 'questions': self._copy_questions(questions)}
+        return quizzes
 
-        quiz_data = {'title': quiz_title, 'questions': []}
+    @staticmethod
+    def _copy_questions(questions):
+        """Copy question dicts down to their lists, so callers never share them with the cache."""
+        copies = []
         for question in questions:
-            question_id, question_text, correct_option = question
-            self.cursor.execute('SELECT option_text FROM options WHERE question_id = ?', (question_id,))
-            options = [row[0] for row in self.cursor.fetchall()]
-            quiz_data['questions'].append({
-                'question': question_text,
-                'options': options,
-                'correct_option': correct_option
-            })
+            question = question.copy()
+            for key in ('options', 'accepted_answers'):
+                if key in question:
+                    question[key] = list(question[key])
+            copies.append(question)
+        return copies
 
-        return quiz_data
+    def get_quiz_bank(self, quiz_id):
+        """Like get_quiz_by_id, with the questions as a QuizModel.QuestionBank."""
+        return self.get_quiz_banks_by_ids([quiz_id]).get(quiz_id)
 
+    def get_quiz_banks_by_ids(self, quiz_ids):
+        """Like get_quizzes_by_ids, with each quiz's questions as a QuizModel.QuestionBank.
+
+        Results may come from the quiz cache and are shared, so treat them as read-only.
+        """
+        quiz_ids = list(dict.fromkeys(quiz_ids))
+        if self.cache is None:
+            return self._load_quizzes(quiz_ids)
+
+        quizzes = {}
+        missing = []
+        for quiz_id in quiz_ids:
+            quiz_data = self.cache.get(quiz_id)
+            if quiz_data is None:
+                missing.append(quiz_id)
+            else:
+                quizzes[quiz_id] = quiz_data
+
+        if missing:
+            # Anything invalidated while we read is stale, so the cache drops it
+            generation = self.cache.generation
+            loaded = self._load_quizzes(missing)
+            for quiz_id, quiz_data in loaded.items():
+                self.cache.put(quiz_id, quiz_data, generation)
+            quizzes.update(loaded)
+        return quizzes
+
+    def _load_quizzes(self, quiz_ids):
+        """Read quizzes from the database, bypassing the cache.
+
+        Each quiz's questions come back as a QuizModel.QuestionBank.
+        """
+        quizzes = {}
+
+        # Keep each IN (...) list well under SQLite's bound-parameter limit
+        for start in range(0, len(quiz_ids), self.MAX_BATCH_IDS):
+            batch = quiz_ids[start:start + self.MAX_BATCH_IDS]
+            placeholders = ', '.join('?' * len(batch))
+
+            # One joined query returns every question and option for the batch
+            self.cursor.execute(f'''
+            SELECT qz.id, qz.title, qq.position, qs.question, qs.correct_option, qs.type, qs.correct_answer,
+                   qs.accepted_answers, op.option_text
+            FROM quizzes qz
+            LEFT JOIN quiz_questions qq ON qq.quiz_id = qz.id
+            LEFT JOIN questions qs ON qs.id = qq.question_id
+            LEFT JOIN options op ON op.question_id = qs.id
+            WHERE qz.id IN ({placeholders})
+            ORDER BY qz.id, qq.position, op.position, op.id
+            ''', batch)
+
+            # A shared question can appear twice in a row, so questions are told apart by position
+            current_position = None
+            for (quiz_id, title, position, question_text, correct_option,
+                 question_type, correct_answer, accepted_answers, option_text) in self.cursor:
+                quiz_data = quizzes.get(quiz_id)
+                if quiz_data is None:
+                    quiz_data = quizzes[quiz_id] = {'title': title, 'questions': QuestionBank()}
+                    current_position = None
+                if position is None:
+                    continue
+                if position != current_position:
+                    current_position = position
+                    quiz_data['questions'].add(
+                        question_type, question_text, (), correct_answer, correct_option,
+                        json.loads(accepted_answers) if accepted_answers else None,
+                    )
+                if option_text is not None:
+                    quiz_data['questions'].add_option(option_text)
+
+        return quizzes
+
+    @retry_on_busy
+    def save_attempt(self, quiz_id, quiz_title, correctness, student_name=None, section=None, finished_at=None,
+                     started_at=None, responses=(), seed=None, delivered_count=None, question_indices=None,
+                     question_count=None, shuffle_questions=None, shuffle_options=None):
+        """Record one finished attempt; ``correctness`` is a per-question sequence of booleans.
+
+        ``responses`` holds ``(question_index, answer, correct, answered_at)``
+        tuples; they are inserted with the attempt in a single transaction.
+        When only some questions were delivered, ``question_indices`` lists
+        their canonical indices and ``correctness`` covers just those.
+        ``seed``, ``delivered_count`` and the shuffle flags record how the
+        questions were shuffled.
+        """
+        correctness = bytes(bytearray(1 if correct else 0 for correct in correctness))
+        if question_indices is not None:
+            question_indices = json.dumps(list(question_indices))
+        self.cursor.execute('''
+        INSERT INTO attempts (quiz_id, quiz_title, student_name, section, started_at, finished_at, score, correctness,
+                              seed, delivered_count, question_indices, question_count, shuffle_questions,
+                              shuffle_options)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (quiz_id, quiz_title, student_name, section, started_at,
+              time.time() if finished_at is None else finished_at, sum(correctness), correctness,
+              seed, delivered_count, question_indices, question_count,
+              None if shuffle_questions is None else int(shuffle_questions),
+              None if shuffle_options is None else int(shuffle_options)))
+        attempt_id = self.cursor.lastrowid
+        self.cursor.executemany('''
+        INSERT INTO responses (attempt_id, question_index, answer, correct, answered_at)
+        VALUES (?, ?, ?, ?, ?)
+        ''', ((attempt_id, index, answer, 1 if correct else 0, answered_at)
+              for index, answer, correct, answered_at in responses))
+        self.conn.commit()
+        return attempt_id
+
+    def iter_results(self, quiz_title=None, batch_size=1000):
+        """Yield one tuple per recorded response (see RESULT_COLUMNS), streaming in constant memory.
+
+        Attempts recorded without responses yield a single row whose response
+        fields are None.
+        """
+        # A private cursor so other queries on this connection don't disturb the stream
+        cursor = self.conn.cursor(QuizMetrics.cursor_factory())
+        where = 'WHERE a.quiz_title = ?' if quiz_title is not None else ''
+        cursor.execute(f'''
+        SELECT a.id, a.quiz_title, a.student_name, a.section, a.started_at, a.finished_at,
+               a.score, length(a.correctness), r.question_index, r.answer, r.correct, r.answered_at
+        FROM attempts a
+        LEFT JOIN responses r ON r.attempt_id = a.id
+        {where}
+        ORDER BY a.id, r.question_index
+        ''', () if quiz_title is None else (quiz_title,))
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
+    def get_attempts(self, quiz_title):
+        """Get (student_name, section, finished_at, correctness bytes, question_indices JSON, question_count,
+        seed, delivered_count, shuffle_questions, shuffle_options) for every attempt at a quiz title."""
+        self.cursor.execute('''
+        SELECT student_name, section, finished_at, correctness, question_indices, question_count,
+               seed, delivered_count, shuffle_questions, shuffle_options
+        FROM attempts WHERE quiz_title = ? ORDER BY id
+        ''', (quiz_title,))
+        return self.cursor.fetchall()
+
+    @retry_on_busy
     def delete_quiz(self, quiz_id):
-        """Delete a quiz and its associated data."""
-        self.cursor.execute('DELETE FROM options WHERE question_id IN (SELECT id FROM questions WHERE quiz_id = ?)', (quiz_id,))
-        self.cursor.execute('DELETE FROM questions WHERE quiz_id = ?', (quiz_id,))
+        """Delete a quiz and its associated data (recorded attempts are kept).
+
+        Questions the quiz shares with other quizzes are kept for them.
+        """
+        unshared = '''
+        IN (SELECT question_id FROM quiz_questions WHERE quiz_id = :quiz_id)
+        AND NOT EXISTS (SELECT 1 FROM quiz_questions other WHERE other.question_id = {column}
+                        AND other.quiz_id != :quiz_id)
+        '''
+        self.cursor.execute(f'DELETE FROM options WHERE question_id {unshared.format(column="options.question_id")}',
+                            {'quiz_id': quiz_id})
+        self.cursor.execute(f'DELETE FROM questions WHERE id {unshared.format(column="questions.id")}',
+                            {'quiz_id': quiz_id})
+        self.cursor.execute('DELETE FROM quiz_questions WHERE quiz_id = ?', (quiz_id,))
         self.cursor.execute('DELETE FROM quizzes WHERE id = ?', (quiz_id,))
         self.conn.commit()
+        if self.cache is not None:
+            self.cache.invalidate(quiz_id)
 
     def close(self):
-        """Close the database connection."""
-        self.conn.close()
+        """Close the database connection (every pooled connection in pooled mode)."""
+        if not self.pooled:
+            self._conn.close()
+            return
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
 
 
 # Example usage:
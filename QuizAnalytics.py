@@ -0,0 +1,142 @@
+"""Item analysis over recorded quiz attempts, vectorized with NumPy.
+
+Attempts are rows of a students x questions matrix of 0/1 correctness, as
+returned by ``QuizStore.load_attempts``. Attempts that were shown only some
+of the questions leave the others missing (NaN) rather than wrong. Every
+statistic is computed with whole-matrix NumPy operations, so a term's worth
+of attempts is analysed without a Python loop per response.
+"""
+import numpy as np
+
+# Share of students in each of the upper and lower groups for the discrimination index
+DISCRIMINATION_GROUP = 0.27
+
+
+def correctness_matrix(attempts, question_count=None):
+    """Stack attempts into a (students, questions) matrix.
+
+    ``attempts`` may be dicts from ``load_attempts`` or bare correctness
+    sequences. Attempts at a quiz whose length differs from ``question_count``
+    (default: the most recent attempt's) were taken against another version
+    of the quiz and are skipped. The matrix is uint8 when every kept attempt
+    saw every question, and float64 with NaN for questions never shown
+    otherwise.
+    """
+    rows = [attempt["correctness"] if isinstance(attempt, dict) else attempt for attempt in attempts]
+    indices = [attempt.get("question_indices") if isinstance(attempt, dict) else None for attempt in attempts]
+    lengths = [
+        attempt.get("question_count") or len(row) if isinstance(attempt, dict) else len(row)
+        for attempt, row in zip(attempts, rows)
+    ]
+    if question_count is None:
+        question_count = lengths[-1] if lengths else 0
+    keep = [index for index, length in enumerate(lengths) if length == question_count]
+    if not keep:
+        return np.zeros((0, question_count), dtype=np.uint8), keep
+
+    if any(indices[index] is not None for index in keep):
+        matrix = np.full((len(keep), question_count), np.nan)
+        for row, index in enumerate(keep):
+            columns = indices[index] if indices[index] is not None else slice(None)
+            matrix[row, columns] = np.frombuffer(bytes(bytearray(rows[index])), dtype=np.uint8)
+        return matrix, keep
+    if all(isinstance(rows[index], (bytes, bytearray)) for index in keep):
+        buffer = b"".join(rows[index] for index in keep)
+        matrix = np.frombuffer(buffer, dtype=np.uint8).reshape(len(keep), question_count)
+    else:
+        matrix = np.asarray([rows[index] for index in keep], dtype=np.uint8)
+    return matrix, keep
+
+
+def _rate(correct, asked):
+    """Share correct per item; NaN where no one was asked."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return correct / asked
+
+
+def analyze(matrix, sections=None):
+    """Compute item and test statistics for a 0/1 correctness matrix.
+
+    Returns a dict with per-item ``difficulty`` (share correct) and
+    ``discrimination`` (upper minus lower group difficulty), ``cronbach_alpha``,
+    the ``score_distribution`` (count of students per total score),
+    ``mean_score``/``std_score``, and, when ``sections`` gives one label per
+    row, per-section ``count``, ``mean_score`` and item ``difficulty``.
+
+    NaN entries are questions a student was never shown: item statistics
+    count only the students who were asked, students are ranked by their
+    share correct, and ``cronbach_alpha`` uses the students who saw every
+    question.
+    """
+    matrix = np.asarray(matrix)
+    if matrix.dtype.kind == "f":
+        asked = ~np.isnan(matrix)
+        matrix = np.where(asked, matrix, 0).astype(np.uint8)
+    else:
+        matrix = matrix.astype(np.uint8, copy=False)
+        asked = np.ones(matrix.shape, dtype=bool)
+    students, items = matrix.shape
+    totals = matrix.sum(axis=1, dtype=np.int64)
+    report = {
+        "students": students,
+        "questions": items,
+        "score_distribution": np.bincount(totals, minlength=items + 1),
+    }
+    if students == 0:
+        report.update(
+            difficulty=np.full(items, np.nan),
+            discrimination=np.full(items, np.nan),
+            cronbach_alpha=float("nan"),
+            mean_score=float("nan"),
+            std_score=float("nan"),
+        )
+        return report
+
+    report["difficulty"] = _rate(matrix.sum(axis=0), asked.sum(axis=0))
+    report["mean_score"] = float(totals.mean())
+    report["std_score"] = float(totals.std())
+
+    # Discrimination: compare the top and bottom 27% of students ranked by share correct
+    group = max(1, int(round(students * DISCRIMINATION_GROUP)))
+    order = np.argsort(_rate(totals, asked.sum(axis=1)), kind="stable")
+    lower, upper = order[:group], order[-group:]
+    report["discrimination"] = (_rate(matrix[upper].sum(axis=0), asked[upper].sum(axis=0))
+                                - _rate(matrix[lower].sum(axis=0), asked[lower].sum(axis=0)))
+
+    # Cronbach's alpha: internal consistency from item and total-score variances, over complete rows
+    complete = matrix[asked.all(axis=1)]
+    complete_totals = complete.sum(axis=1, dtype=np.int64)
+    total_variance = complete_totals.var(ddof=1) if len(complete) > 1 else 0.0
+    if items > 1 and total_variance > 0:
+        item_variance = complete.var(axis=0, ddof=1).sum()
+        report["cronbach_alpha"] = float(items / (items - 1) * (1 - item_variance / total_variance))
+    else:
+        report["cronbach_alpha"] = float("nan")
+
+    if sections is not None:
+        labels, inverse = np.unique(np.asarray(sections, dtype=object).astype(str), return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(labels))
+        score_sums = np.bincount(inverse, weights=totals, minlength=len(labels))
+        # Group rows by section, then sum each contiguous block for per-section correct counts per item
+        order = np.argsort(inverse, kind="stable")
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        item_correct = np.add.reduceat(matrix[order].astype(np.int64), starts, axis=0)
+        item_asked = np.add.reduceat(asked[order].astype(np.int64), starts, axis=0)
+        report["sections"] = {
+            str(label): {
+                "count": int(counts[index]),
+                "mean_score": float(score_sums[index] / counts[index]),
+                "difficulty": _rate(item_correct[index], item_asked[index]),
+            }
+            for index, label in enumerate(labels)
+        }
+    return report
+
+
+def analyze_attempts(attempts, question_count=None):
+    """Build the correctness matrix for recorded attempts and analyse it by section."""
+    matrix, kept = correctness_matrix(attempts, question_count)
+    sections = None
+    if attempts and isinstance(attempts[0], dict):
+        sections = [attempts[index].get("section") or "" for index in kept]
+    return analyze(matrix, sections)
@@ -0,0 +1,111 @@
+import sys
+import threading
+from collections import OrderedDict
+
+
+def estimate_quiz_size(quiz_data):
+    """Roughly estimate the memory held by a hydrated quiz, in bytes."""
+    size = sys.getsizeof(quiz_data)
+    for key, value in quiz_data.items():
+        size += sys.getsizeof(key)
+        if isinstance(value, (list, tuple)):
+            size += sys.getsizeof(value)
+            for item in value:
+                size += estimate_quiz_size(item) if isinstance(item, dict) else sys.getsizeof(item)
+        elif isinstance(value, dict):
+            size += estimate_quiz_size(value)
+        else:
+            size += sys.getsizeof(value)
+    return size
+
+
+class LRUCache:
+    """A thread-safe least-recently-used cache bounded by entry count and/or bytes.
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries=128, max_bytes=None, size_of=estimate_quiz_size):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.current_bytes = 0
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def generation(self):
+        """A counter bumped by every invalidation, used to drop stale puts."""
+        return self._generation
+
+    def get(self, key, default=None):
+        """Return a cached value and mark it most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, generation=None):
+        """Cache a value, evicting least recently used entries to stay in bounds.
+
+        If ``generation`` is given and the cache has been invalidated since it
+        was read, the value may be stale and is not stored.
+        """
+        size = self.size_of(value) if self.max_bytes is not None else 0
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self._entries and (
+                (self.max_entries is not None and len(self._entries) > self.max_entries)
+                or (self.max_bytes is not None and self.current_bytes > self.max_bytes)
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self, key):
+        """Drop a single key."""
+        with self._lock:
+            self._generation += 1
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.current_bytes -= entry[1]
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """Return hit/miss/eviction counters and current occupancy."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+            }
@@ -0,0 +1,236 @@
+"""Find duplicate and near-duplicate questions across a question bank.
+
+Exact duplicates share a content hash: a digest of the question type, text,
+options and answer with case and whitespace normalized. ``exact_hash``
+digests the unnormalized content instead; both quiz stores key their shared
+question storage on it, and QuestionInterner uses the same exact content to
+share one question dict between every quiz that contains it.
+
+Near duplicates are found with MinHash and locality-sensitive hashing. Each
+question is reduced to a set of word shingles, every set to a short MinHash
+signature, and only questions whose signatures collide in at least one LSH
+band are compared. The work grows with the size of the bank, not its
+square, so a bank of 100k questions takes seconds. Signatures need NumPy.
+
+    python QuizDedup.py --backend sqlite --path quizify.db --threshold 0.8
+"""
+import hashlib
+import json
+import zlib
+
+# Separates fields inside hashed content; it cannot appear in normalized text
+FIELD_SEPARATOR = "\x1f"
+
+# MinHash permutations work modulo this Mersenne prime, so every product fits in 64 bits
+MERSENNE_PRIME = (1 << 31) - 1
+
+
+def normalize_text(text):
+    """Case-fold text and collapse runs of whitespace."""
+    return " ".join(str(text).split()).casefold()
+
+
+def content_hash(question_type, text, options, answer):
+    """Hex digest identifying a question's content, ignoring case and whitespace."""
+    fields = [normalize_text(question_type or ""), normalize_text(text)]
+    fields.extend(normalize_text(option) for option in options or ())
+    fields.append("" if answer is None else normalize_text(answer))
+    return hashlib.sha1(FIELD_SEPARATOR.join(fields).encode("utf-8")).hexdigest()
+
+
+def exact_hash(question):
+    """Hex digest of a question's exact content, given as JSON-serializable data.
+
+    Nothing is normalized, so questions with equal digests are
+    interchangeable and can share one stored copy.
+    """
+    payload = json.dumps(question, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def question_hash(question):
+    """Content hash of a question in the Tk app format."""
+    return content_hash(question.get("type"), question["question"], question.get("options"),
+                        question.get("correct_answer"))
+
+
+class QuestionInterner:
+    """Share one dict between every quiz that contains an identical question.
+
+    Interned questions are shared, so treat them as read-only.
+    """
+
+    def __init__(self):
+        self.questions = {}
+        self.hits = 0
+
+    def __len__(self):
+        return len(self.questions)
+
+    def intern(self, question):
+        key = tuple(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in sorted(question.items())
+        )
+        shared = self.questions.get(key)
+        if shared is None:
+            self.questions[key] = question
+            return question
+        self.hits += 1
+        return shared
+
+    def intern_quiz(self, questions):
+        return [self.intern(question) for question in questions]
+
+
+def shingles(text, size=3):
+    """Return the set of CRC32 hashes of the ``size``-word shingles of ``text``.
+
+    Text shorter than ``size`` words yields a single shingle of all of it.
+    """
+    words = str(text).casefold().encode("utf-8").split()
+    if len(words) <= size:
+        return {zlib.crc32(b" ".join(words))}
+    crc32 = zlib.crc32
+    join = b" ".join
+    return {crc32(join(shingle)) for shingle in zip(*(words[offset:] for offset in range(size)))}
+
+
+def question_text(question):
+    """The text a question is compared on: its wording followed by its options."""
+    return " ".join([question["question"], *(question.get("options") or ())])
+
+
+def minhash_signatures(shingle_sets, permutations=64, seed=1):
+    """Return a (len(shingle_sets), permutations) uint64 array of MinHash signatures.
+
+    Permutations are ``(a * x + b) mod p`` hashes. Every shingle of every set
+    is hashed at once per permutation, and the minimum for each set is taken
+    with one ``reduceat``.
+    """
+    import numpy as np
+
+    lengths = np.fromiter((len(shingle_set) for shingle_set in shingle_sets), dtype=np.int64,
+                          count=len(shingle_sets))
+    if not len(lengths):
+        return np.zeros((0, permutations), dtype=np.uint64)
+    if lengths.min() == 0:
+        raise ValueError("every shingle set needs at least one shingle")
+    prime = np.uint64(MERSENNE_PRIME)
+    values = np.fromiter(
+        (value for shingle_set in shingle_sets for value in shingle_set),
+        dtype=np.uint64, count=int(lengths.sum()),
+    ) % prime
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+    rng = np.random.default_rng(seed)
+    multipliers = rng.integers(1, MERSENNE_PRIME, size=permutations, dtype=np.uint64)
+    offsets = rng.integers(0, MERSENNE_PRIME, size=permutations, dtype=np.uint64)
+    signatures = np.empty((len(lengths), permutations), dtype=np.uint64)
+    for column in range(permutations):
+        hashed = (values * multipliers[column] + offsets[column]) % prime
+        signatures[:, column] = np.minimum.reduceat(hashed, starts)
+    return signatures
+
+
+def find_near_duplicates(texts, threshold=0.8, permutations=64, bands=16, max_bucket=1000):
+    """Return ``(i, j, similarity)`` for pairs of texts whose estimated Jaccard
+    similarity of shingles is at least ``threshold``, most similar first.
+
+    Signatures are split into ``bands``; two texts become candidates when
+    every row of some band matches, and only candidates are compared.
+    Buckets larger than ``max_bucket`` (boilerplate shared by many questions)
+    are skipped.
+    """
+    import numpy as np
+
+    if permutations % bands:
+        raise ValueError("permutations must be a multiple of bands")
+    signatures = minhash_signatures([shingles(text) for text in texts], permutations)
+    rows = permutations // bands
+
+    candidates = set()
+    for band in range(bands):
+        block = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        keys = block.view(np.dtype((np.void, block.dtype.itemsize * rows))).ravel()
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        # Runs of equal keys are buckets; only runs longer than one hold candidates
+        same = sorted_keys[1:] == sorted_keys[:-1]
+        if not same.any():
+            continue
+        starts = np.flatnonzero(same & ~np.concatenate(([False], same[:-1])))
+        ends = np.flatnonzero(same & ~np.concatenate((same[1:], [False]))) + 2
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            if end - start <= max_bucket:
+                members = sorted(order[start:end].tolist())
+                for a in range(len(members)):
+                    for b in range(a + 1, len(members)):
+                        candidates.add((members[a], members[b]))
+
+    if not candidates:
+        return []
+    pairs = np.array(sorted(candidates), dtype=np.int64)
+    similarity = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1)
+    keep = similarity >= threshold
+    found = [(int(i), int(j), float(score)) for (i, j), score in zip(pairs[keep], similarity[keep])]
+    found.sort(key=lambda pair: -pair[2])
+    return found
+
+
+def find_exact_duplicates(questions):
+    """Group equal questions by content hash; returns lists of indices, one per repeated question."""
+    groups = {}
+    for index, question in enumerate(questions):
+        groups.setdefault(question_hash(question), []).append(index)
+    return [indices for indices in groups.values() if len(indices) > 1]
+
+
+def bank_questions(store):
+    """Return ``(title, question index, question)`` for every question in a store."""
+    return [
+        (title, index, question)
+        for title, questions in store.load_all().items()
+        for index, question in enumerate(questions)
+    ]
+
+
+def main():
+    import argparse
+
+    from QuizStorage import open_store
+
+    parser = argparse.ArgumentParser(description="Report duplicate and near-duplicate questions.")
+    parser.add_argument("--backend", default="json", choices=["json", "sqlite"])
+    parser.add_argument("--path", help="quiz store directory or database file")
+    parser.add_argument("--threshold", type=float, default=0.8, help="minimum estimated similarity")
+    args = parser.parse_args()
+
+    store = open_store(args.backend, args.path)
+    try:
+        entries = bank_questions(store)
+    finally:
+        store.close()
+    questions = [question for _, _, question in entries]
+
+    def describe(index):
+        title, position, question = entries[index]
+        return f"{title!r} Q{position + 1}: {question['question']}"
+
+    exact = find_exact_duplicates(questions)
+    print(f"{len(exact)} questions stored more than once")
+    for indices in exact:
+        print("  " + "\n    = ".join(describe(index) for index in indices))
+
+    near = [
+        (i, j, similarity)
+        for i, j, similarity in find_near_duplicates([question_text(q) for q in questions], args.threshold)
+        if question_hash(questions[i]) != question_hash(questions[j])
+    ]
+    print(f"{len(near)} near-duplicate pairs")
+    for i, j, similarity in near:
+        print(f"  {similarity:.2f}  {describe(i)}\n        {describe(j)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Grading for quizzes in the Tk app format, with no dependency on Tk.
+
+A quiz is compiled once into an AnswerKey; grading a submission is then a
+set lookup per question. Multiple choice answers must match an option
+exactly (after trimming surrounding whitespace); other question types are
+compared case-insensitively with runs of whitespace collapsed. A question
+may list extra accepted answers under ``"accepted_answers"``.
+"""
+import time
+
+import QuizMetrics
+
+EXACT_TYPES = frozenset(["Multiple Choice"])
+
+
+def normalize_answer(answer):
+    """Case-fold an answer and collapse runs of whitespace."""
+    return " ".join(answer.split()).casefold()
+
+
+class AnswerKey:
+    """A precompiled answer key for one quiz."""
+
+    __slots__ = ("exact", "accepted")
+
+    def __init__(self, exact, accepted):
+        self.exact = exact  # Per question: True when answers are compared exactly
+        self.accepted = accepted  # Per question: frozenset of accepted (normalized) answers
+
+    def __len__(self):
+        return len(self.accepted)
+
+    def is_correct(self, index, answer):
+        """Return whether ``answer`` is correct for question ``index``."""
+        if answer is None:
+            return False
+        answer = answer.strip() if self.exact[index] else normalize_answer(answer)
+        return answer in self.accepted[index]
+
+    def grade(self, answers):
+        """Return a list of per-question correctness flags for one submission.
+
+        ``answers`` is a sequence aligned with the questions; missing trailing
+        answers and None count as wrong.
+        """
+        results = [False] * len(self.accepted)
+        for index, (answer, exact, accepted) in enumerate(zip(answers, self.exact, self.accepted)):
+            if answer is not None:
+                results[index] = (answer.strip() if exact else normalize_answer(answer)) in accepted
+        return results
+
+    def score(self, answers):
+        """Return the number of correct answers in one submission."""
+        return sum(self.grade(answers))
+
+
+def compile_answer_key(questions):
+    """Compile a quiz's questions into an AnswerKey."""
+    exact = []
+    accepted = []
+    for question in questions:
+        is_exact = question.get("type") in EXACT_TYPES
+        answers = [question.get("correct_answer")] + list(question.get("accepted_answers", ()))
+        answers = [answer for answer in answers if answer is not None]
+        exact.append(is_exact)
+        accepted.append(frozenset(
+            answer.strip() if is_exact else normalize_answer(answer) for answer in answers
+        ))
+    return AnswerKey(tuple(exact), tuple(accepted))
+
+
+def grade_batch(answer_key, submissions):
+    """Grade many submissions against one AnswerKey.
+
+    Yields ``(score, per-question correctness)`` for each submission, in order.
+    """
+    grade = answer_key.grade
+    for answers in submissions:
+        if QuizMetrics.enabled:
+            started = time.perf_counter()
+            results = grade(answers)
+            QuizMetrics.observe("quizify_grade_seconds", time.perf_counter() - started)
+        else:
+            results = grade(answers)
+        yield sum(results), results
@@ -0,0 +1,108 @@
+import math
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualQuizList(tk.Frame):
+    """A scrollable list of quizzes that only creates widgets for the rows on screen.
+
+    Rows come from ``fetch_page(cursor, limit)``, which returns
+    ``(entries, next_cursor)``; ``next_cursor`` is None once everything has been
+    fetched. Pages are requested only as the user scrolls near the end of what
+    has been loaded, and a fixed pool of buttons is repositioned and relabelled
+    as the view moves, so the widget count stays the same however long the
+    list is.
+    """
+
+    def __init__(self, master, fetch_page, on_select, row_height=44, page_size=50, **kwargs):
+        kwargs.setdefault("bg", "#F4F4F4")
+        super().__init__(master, **kwargs)
+        self.fetch_page = fetch_page
+        self.on_select = on_select
+        self.row_height = row_height
+        self.page_size = page_size
+
+        self.canvas = tk.Canvas(self, bg=self["bg"], highlightthickness=0, yscrollincrement=row_height)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.rows = []  # Pool of (canvas window id, button)
+        self.entries = []
+        self.next_cursor = None
+        self.exhausted = True
+
+        self.canvas.bind("<Configure>", self._on_configure)
+        self._bind_wheel(self.canvas)
+
+    def set_source(self, fetch_page):
+        """Replace the data source (e.g. with search results) and scroll back to the top."""
+        self.fetch_page = fetch_page
+        self.entries = []
+        self.next_cursor = None
+        self.exhausted = False
+        self._load_more()
+        self.canvas.yview_moveto(0)
+        self._refresh()
+
+    def load(self):
+        """Fetch the first page; returns False if the source is empty."""
+        self.set_source(self.fetch_page)
+        return bool(self.entries)
+
+    def yview(self, *args):
+        self.canvas.yview(*args)
+        self._refresh()
+
+    def _bind_wheel(self, widget):
+        # Mouse wheel: Windows/macOS send <MouseWheel>, X11 sends buttons 4 and 5
+        widget.bind("<MouseWheel>", lambda event: self.yview("scroll", -1 if event.delta > 0 else 1, "units"))
+        widget.bind("<Button-4>", lambda event: self.yview("scroll", -1, "units"))
+        widget.bind("<Button-5>", lambda event: self.yview("scroll", 1, "units"))
+
+    def _on_configure(self, event):
+        # Grow the pool to cover the visible height, plus one row that is partly scrolled in
+        needed = math.ceil(event.height / self.row_height) + 1
+        while len(self.rows) < needed:
+            button = ttk.Button(self.canvas)
+            self._bind_wheel(button)
+            window = self.canvas.create_window(0, 0, anchor="nw", window=button, state="hidden")
+            self.rows.append((window, button))
+        for window, _ in self.rows:
+            self.canvas.itemconfigure(window, width=max(event.width - 20, 50))
+        self._refresh()
+
+    def _load_more(self):
+        if self.exhausted:
+            return
+        entries, self.next_cursor = self.fetch_page(self.next_cursor, self.page_size)
+        self.entries.extend(entries)
+        self.exhausted = self.next_cursor is None
+        self._update_scrollregion()
+
+    def _update_scrollregion(self):
+        # One spare row while more pages remain, so scrolling to the bottom asks for them
+        count = len(self.entries) + (0 if self.exhausted else 1)
+        self.canvas.configure(scrollregion=(0, 0, 1, count * self.row_height))
+
+    def _refresh(self):
+        """Position and label the pooled buttons for the rows currently in view."""
+        if not self.rows:
+            return
+        first = max(0, int(self.canvas.canvasy(0) // self.row_height))
+        if first + len(self.rows) >= len(self.entries) and not self.exhausted:
+            self._load_more()
+
+        for offset, (window, button) in enumerate(self.rows):
+            index = first + offset
+            if index >= len(self.entries):
+                self.canvas.itemconfigure(window, state="hidden")
+                continue
+            entry = self.entries[index]
+            text = entry["title"]
+            if entry.get("question_count") is not None:
+                text += f" ({entry['question_count']} questions)"
+            button.configure(text=text, command=lambda title=entry["title"]: self.on_select(title))
+            self.canvas.coords(window, 10, index * self.row_height + 4)
+            self.canvas.itemconfigure(window, state="normal")
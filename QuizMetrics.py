@@ -0,0 +1,318 @@
+"""Opt-in timing histograms for the app's hot paths.
+
+Instrumentation is off unless ``enable()`` is called, or the app is started
+with one of these environment variables set:
+
+    QUIZIFY_METRICS=1              record in memory only
+    QUIZIFY_METRICS_FILE=path      also write a JSON snapshot every QUIZIFY_METRICS_INTERVAL seconds (10)
+    QUIZIFY_METRICS_PORT=9464      also serve Prometheus text on http://127.0.0.1:<port>/metrics
+
+Instrumented code checks ``QuizMetrics.enabled`` (the module attribute, not a
+copy of it) before taking any timestamps, so disabled instrumentation costs
+one attribute lookup. SQL timings use a cursor class chosen when a
+connection is opened, so they cost nothing at all when disabled. Modules
+only the exporters and SQL timing need are imported on first use, so
+importing this module adds nothing to the app's startup.
+"""
+import bisect
+import json
+import os
+import re
+import threading
+import time
+
+enabled = False
+
+# Upper bounds of histogram buckets; each metric uses one scale
+SECONDS_BUCKETS = tuple(0.00005 * 2 ** i for i in range(18))  # 50 us .. ~6.5 s
+BYTES_BUCKETS = tuple(256 * 4 ** i for i in range(10))  # 256 B .. 64 MiB
+
+DESCRIPTIONS = {
+    "quizify_sql_seconds": "Time to execute one SQL statement, up to its first row",
+    "quizify_json_load_seconds": "Time to read and parse one JSON file",
+    "quizify_json_load_bytes": "Size of JSON files read",
+    "quizify_json_save_seconds": "Time to encode and atomically write one JSON file",
+    "quizify_json_save_bytes": "Size of JSON files written",
+    "quizify_show_question_seconds": "Time to lay out and draw one question",
+    "quizify_timer_jitter_seconds": "How late quiz timer ticks fire",
+    "quizify_mainloop_lateness_seconds": "How late main-loop callbacks run, i.e. how long the window froze",
+    "quizify_grade_seconds": "Time to grade one submission",
+}
+
+_histograms = {}  # (name, labels) -> Histogram
+_lock = threading.Lock()
+
+
+class Histogram:
+    """Bucketed counts of observed values, with their sum and maximum."""
+
+    __slots__ = ("bounds", "counts", "count", "sum", "max", "lock")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # The last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.bounds, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def quantile(self, q):
+        """Estimate a quantile as the upper bound of the bucket it falls in."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def reset():
+    """Forget everything recorded so far."""
+    with _lock:
+        _histograms.clear()
+
+
+def histogram(name, labels=()):
+    """Return the histogram for a metric name and ``((label, value), ...)`` labels, creating it on first use."""
+    key = (name, labels)
+    found = _histograms.get(key)
+    if found is None:
+        with _lock:
+            found = _histograms.get(key)
+            if found is None:
+                found = _histograms[key] = Histogram(BYTES_BUCKETS if name.endswith("_bytes") else SECONDS_BUCKETS)
+    return found
+
+
+def observe(name, value, labels=()):
+    histogram(name, labels).observe(value)
+
+
+class _Timed:
+    __slots__ = ("name", "labels", "started")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        observe(self.name, time.perf_counter() - self.started, self.labels)
+
+
+class _NotTimed:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NOT_TIMED = _NotTimed()
+
+
+def timed(name, labels=()):
+    """Context manager that records its duration in ``name``; a shared no-op while disabled."""
+    if not enabled:
+        return _NOT_TIMED
+    return _Timed(name, labels)
+
+
+# -- SQL -----------------------------------------------------------------------
+
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+
+
+def statement_label(sql):
+    """Collapse whitespace and IN (?, ?, ...) lists so each statement in the code gets one label."""
+    return _PLACEHOLDER_LIST.sub("?, ...", " ".join(sql.split()))
+
+
+_timed_cursor = None
+
+
+def _timed_cursor_class():
+    """Build TimedCursor on first use, so sqlite3 is not imported until a database is opened."""
+    global _timed_cursor
+    if _timed_cursor is None:
+        import sqlite3
+
+        class TimedCursor(sqlite3.Cursor):
+            """A cursor that records each execute in quizify_sql_seconds, labelled by statement."""
+
+            def execute(self, sql, parameters=()):
+                started = time.perf_counter()
+                try:
+                    return super().execute(sql, parameters)
+                finally:
+                    observe("quizify_sql_seconds", time.perf_counter() - started, (("statement", statement_label(sql)),))
+
+            def executemany(self, sql, seq_of_parameters):
+                started = time.perf_counter()
+                try:
+                    return super().executemany(sql, seq_of_parameters)
+                finally:
+                    observe("quizify_sql_seconds", time.perf_counter() - started, (("statement", statement_label(sql)),))
+
+        _timed_cursor = TimedCursor
+    return _timed_cursor
+
+
+def cursor_factory():
+    """The cursor class new connections should use: TimedCursor while enabled."""
+    if enabled:
+        return _timed_cursor_class()
+    import sqlite3
+    return sqlite3.Cursor
+
+
+# -- Export --------------------------------------------------------------------
+
+def snapshot():
+    """Return every histogram as plain data, grouped by metric name."""
+    with _lock:
+        items = sorted(_histograms.items())
+    metrics = {}
+    for (name, labels), found in items:
+        with found.lock:
+            metrics.setdefault(name, []).append({
+                "labels": dict(labels),
+                "count": found.count,
+                "sum": found.sum,
+                "max": found.max,
+                "p50": found.quantile(0.5),
+                "p90": found.quantile(0.9),
+                "p99": found.quantile(0.99),
+                "buckets": dict(zip([*map(str, found.bounds), "+Inf"], found.counts)),
+            })
+    return {"timestamp": time.time(), "metrics": metrics}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(labels, extra=()):
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def render_prometheus():
+    """Return every histogram in the Prometheus text exposition format."""
+    with _lock:
+        items = sorted(_histograms.items())
+    lines = []
+    current = None
+    for (name, labels), found in items:
+        if name != current:
+            current = name
+            lines.append(f"# HELP {name} {DESCRIPTIONS.get(name, name)}")
+            lines.append(f"# TYPE {name} histogram")
+        with found.lock:
+            cumulative = 0
+            for bound, count in zip([*found.bounds, "+Inf"], found.counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{_label_text(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{name}_sum{_label_text(labels)} {found.sum}")
+            lines.append(f"{name}_count{_label_text(labels)} {found.count}")
+    return "\n".join(lines) + "\n"
+
+
+def write_snapshot(path):
+    """Write a JSON snapshot to ``path`` atomically."""
+    import tempfile
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(snapshot(), file, indent=1)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def start_snapshots(path, interval=10.0):
+    """Write a snapshot to ``path`` every ``interval`` seconds from a daemon thread."""
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                write_snapshot(path)
+            except OSError:
+                pass
+
+    thread = threading.Thread(target=run, name="quiz-metrics-snapshot", daemon=True)
+    thread.start()
+    return thread
+
+
+def serve_prometheus(port=9464, host="127.0.0.1"):
+    """Serve /metrics from a daemon thread; returns the server (call shutdown() to stop)."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="quiz-metrics-http", daemon=True).start()
+    return server
+
+
+def configure_from_env(environ=os.environ):
+    """Enable instrumentation and exporters as requested by QUIZIFY_METRICS* variables."""
+    path = environ.get("QUIZIFY_METRICS_FILE")
+    port = environ.get("QUIZIFY_METRICS_PORT")
+    if not (environ.get("QUIZIFY_METRICS") or path or port):
+        return
+    enable()
+    if path:
+        start_snapshots(path, float(environ.get("QUIZIFY_METRICS_INTERVAL", 10)))
+    if port:
+        serve_prometheus(int(port))
@@ -0,0 +1,203 @@
+"""Compact in-memory representation of quiz questions.
+
+A question in the Tk app format is a dict with ``type``, ``question``,
+optional ``options`` and ``correct_answer``. One dict per question costs a
+hash table each, plus another copy of the type name for every question read
+back from JSON. QuestionBank instead keeps a quiz's questions as parallel
+columns: types as one-byte codes into a shared table of type names, option
+lists flattened into one list with an array of offsets, and the remaining
+fields in plain lists.
+
+Indexing a bank returns a Question, a ``__slots__`` object that also answers
+the dict lookups used throughout the app (``question["type"]``,
+``question.get("options")``), so code written against dicts keeps working.
+``to_dicts`` and ``from_dicts`` convert to and from the JSON shape.
+"""
+import sys
+import threading
+from array import array
+
+# Known question type names, including every type the Tk app offers; codes index this list.
+# Unknown names are appended when first seen.
+TYPE_NAMES = [None, "Multiple Choice", "True/False", "Short Answer", "Fill-in-the-Blank"]
+_TYPE_CODES = {name: code for code, name in enumerate(TYPE_NAMES)}
+_register_lock = threading.Lock()  # Banks are built on the Tk thread and on the store worker
+
+
+def type_code(name):
+    """Return the one-byte code for a question type name, registering new names."""
+    code = _TYPE_CODES.get(name)
+    if code is None:
+        with _register_lock:
+            code = _TYPE_CODES.get(name)
+            if code is None:
+                if len(TYPE_NAMES) > 255:
+                    raise ValueError("too many distinct question types")
+                # Appended before the code is published, so a code never points past the end of TYPE_NAMES
+                TYPE_NAMES.append(sys.intern(name))
+                code = _TYPE_CODES[name] = len(TYPE_NAMES) - 1
+    return code
+
+
+class Question:
+    """One question; read-only, with attribute access and dict-style lookups."""
+
+    __slots__ = ("type", "question", "options", "correct_answer", "correct_option", "accepted_answers")
+
+    # Fields that appear as keys only when set
+    OPTIONAL_KEYS = ("options", "correct_option", "accepted_answers")
+
+    def __init__(self, question_type, text, options=None, correct_answer=None, correct_option=None,
+                 accepted_answers=None):
+        self.type = question_type
+        self.question = text
+        self.options = options  # Tuple of option texts, or None when the question has none
+        self.correct_answer = correct_answer
+        self.correct_option = correct_option  # 1-based, QuizifyDatabase format only
+        self.accepted_answers = accepted_answers
+
+    @classmethod
+    def from_dict(cls, question):
+        options = question.get("options")
+        accepted = question.get("accepted_answers")
+        return cls(
+            TYPE_NAMES[type_code(question.get("type"))],
+            question["question"],
+            tuple(options) if options is not None else None,
+            question.get("correct_answer"),
+            question.get("correct_option"),
+            tuple(accepted) if accepted else None,
+        )
+
+    def keys(self):
+        keys = ["type", "question"]
+        if self.options is not None:
+            keys.append("options")
+        keys.append("correct_answer")
+        if self.correct_option is not None:
+            keys.append("correct_option")
+        if self.accepted_answers is not None:
+            keys.append("accepted_answers")
+        return keys
+
+    def __getitem__(self, key):
+        if key not in self.__slots__ or (key in self.OPTIONAL_KEYS and getattr(self, key) is None):
+            raise KeyError(key)
+        value = getattr(self, key)
+        return list(value) if isinstance(value, tuple) else value
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, (Question, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Question({self.to_dict()!r})"
+
+
+class QuestionBank:
+    """A quiz's questions stored column by column; indexing returns Question objects."""
+
+    def __init__(self):
+        self.types = array("B")
+        self.texts = []
+        self.answers = []
+        self.option_texts = []  # Options of every question, concatenated
+        self.option_offsets = array("I", [0])  # Question i's options are option_texts[offsets[i]:offsets[i + 1]]
+        self.has_options = bytearray()  # 0 where the question has no options list at all
+        self.correct_options = {}  # index -> 1-based correct option, when set
+        self.accepted_answers = {}  # index -> tuple of extra accepted answers, when set
+
+    @classmethod
+    def from_dicts(cls, questions):
+        bank = cls()
+        for question in questions:
+            bank.append(question)
+        return bank
+
+    def to_dicts(self):
+        return [question.to_dict() for question in self]
+
+    def add(self, question_type, text, options=None, correct_answer=None, correct_option=None,
+            accepted_answers=None):
+        """Append a question from its fields; returns its index."""
+        index = len(self.texts)
+        self.types.append(type_code(question_type))
+        self.texts.append(text)
+        self.answers.append(correct_answer)
+        self.has_options.append(options is not None)
+        if options:
+            self.option_texts.extend(options)
+        self.option_offsets.append(len(self.option_texts))
+        if correct_option is not None:
+            self.correct_options[index] = correct_option
+        if accepted_answers:
+            self.accepted_answers[index] = tuple(accepted_answers)
+        return index
+
+    def add_option(self, option_text):
+        """Append an option to the last question added."""
+        self.option_texts.append(option_text)
+        self.option_offsets[-1] += 1
+        self.has_options[-1] = 1
+
+    def append(self, question):
+        """Append a question given as a dict or Question."""
+        self.add(
+            question.get("type"), question["question"], question.get("options"),
+            question.get("correct_answer"), question.get("correct_option"), question.get("accepted_answers"),
+        )
+
+    def __len__(self):
+        return len(self.texts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self.texts):
+            raise IndexError("question index out of range")
+        options = None
+        if self.has_options[index]:
+            options = tuple(self.option_texts[self.option_offsets[index]:self.option_offsets[index + 1]])
+        return Question(
+            TYPE_NAMES[self.types[index]], self.texts[index], options, self.answers[index],
+            self.correct_options.get(index), self.accepted_answers.get(index),
+        )
+
+    def __iter__(self):
+        for index in range(len(self.texts)):
+            yield self[index]
+
+    def __eq__(self, other):
+        if isinstance(other, (QuestionBank, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __sizeof__(self):
+        size = object.__sizeof__(self)
+        for column in (self.types, self.texts, self.answers, self.option_texts, self.option_offsets,
+                       self.has_options, self.correct_options, self.accepted_answers):
+            size += sys.getsizeof(column)
+        for value in (*self.texts, *self.answers, *self.option_texts):
+            size += sys.getsizeof(value)
+        return size
+
+    def __repr__(self):
+        return f"QuestionBank({len(self)} questions)"
@@ -0,0 +1,226 @@
+"""Binary quiz packs: a whole question bank in one file, readable without parsing it all.
+
+Layout (little-endian):
+
+    header        magic "QZPK", version u16, flags u16, quiz count u32,
+                  question count u32, CRC32 of everything after the header u32
+    quiz table    per quiz: title record offset u64, first question u32, question count u32
+    offset table  per question: record offset u64
+    records       u32 byte length followed by UTF-8 (a title, or one question as JSON)
+
+A pack is opened with ``mmap``: opening reads only the header, and question
+*i* of a quiz is found through the offset table and decoded on its own, so
+the cost of reaching any question does not depend on the size of the bank.
+
+    python QuizPack.py export --backend json --path quizzes bank.qpk
+    python QuizPack.py import bank.qpk --backend sqlite --path quizify.db
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import zlib
+from collections.abc import Sequence
+
+MAGIC = b"QZPK"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIII")
+QUIZ_ENTRY = struct.Struct("<QII")
+OFFSET = struct.Struct("<Q")
+LENGTH = struct.Struct("<I")
+
+
+class PackError(Exception):
+    """Raised for a file that is not a valid quiz pack."""
+
+
+def _record(data):
+    return LENGTH.pack(len(data)) + data
+
+
+def write_pack(path, quizzes):
+    """Write ``{title: questions}`` to a pack at ``path``, atomically; returns the bytes written."""
+    quizzes = list(quizzes.items())
+    question_count = sum(len(questions) for _, questions in quizzes)
+    records_start = HEADER.size + QUIZ_ENTRY.size * len(quizzes) + OFFSET.size * question_count
+
+    quiz_table = bytearray()
+    offset_table = bytearray()
+    records = []
+    position = records_start
+    first_question = 0
+    for title, questions in quizzes:
+        record = _record(title.encode("utf-8"))
+        quiz_table += QUIZ_ENTRY.pack(position, first_question, len(questions))
+        records.append(record)
+        position += len(record)
+        for question in questions:
+            record = _record(json.dumps(dict(question), separators=(",", ":")).encode("utf-8"))
+            offset_table += OFFSET.pack(position)
+            records.append(record)
+            position += len(record)
+        first_question += len(questions)
+
+    checksum = zlib.crc32(quiz_table)
+    checksum = zlib.crc32(offset_table, checksum)
+    for record in records:
+        checksum = zlib.crc32(record, checksum)
+
+    from QuizStorage import atomic_write_bytes
+
+    header = HEADER.pack(MAGIC, VERSION, 0, len(quizzes), question_count, checksum)
+    atomic_write_bytes(path, [header, quiz_table, offset_table, *records])
+    return position
+
+
+class PackQuiz(Sequence):
+    """The questions of one quiz in a pack; each is decoded only when indexed."""
+
+    def __init__(self, pack, title, first_question, question_count):
+        self.pack = pack
+        self.title = title
+        self.first_question = first_question
+        self.question_count = question_count
+
+    def __len__(self):
+        return self.question_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.question_count))]
+        if index < 0:
+            index += self.question_count
+        if not 0 <= index < self.question_count:
+            raise IndexError("question index out of range")
+        return json.loads(self.pack.read_question(self.first_question + index))
+
+
+class QuizPack:
+    """A quiz pack opened read-only through ``mmap``."""
+
+    def __init__(self, path, verify=True):
+        self.path = path
+        with open(path, "rb") as file:
+            # Checked before mapping: mmap refuses empty files, and the tables must fit in the file
+            size = os.fstat(file.fileno()).st_size
+            if size < HEADER.size:
+                raise PackError(f"{path} is too short to be a quiz pack")
+            magic, version, _, self.quiz_count, self.question_count, self.checksum = HEADER.unpack(
+                file.read(HEADER.size))
+            if magic != MAGIC:
+                raise PackError(f"{path} is not a quiz pack")
+            if version != VERSION:
+                raise PackError(f"{path} has pack version {version}; this app reads version {VERSION}")
+            self._offsets_start = HEADER.size + QUIZ_ENTRY.size * self.quiz_count
+            if size < self._offsets_start + OFFSET.size * self.question_count:
+                raise PackError(f"{path} is truncated")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if verify:
+                self.verify()
+        except BaseException:
+            self._map.close()
+            raise
+        self._titles = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.quiz_count
+
+    def __contains__(self, title):
+        return title in self._title_index()
+
+    def verify(self):
+        """Check the CRC32 of the pack body; raises PackError if the file is damaged."""
+        checksum = 0
+        view = memoryview(self._map)
+        try:
+            for start in range(HEADER.size, len(view), 1 << 20):
+                checksum = zlib.crc32(view[start:start + (1 << 20)], checksum)
+        finally:
+            view.release()
+        if checksum != self.checksum:
+            raise PackError(f"{self.path} is damaged (checksum mismatch)")
+
+    def _read_record(self, offset):
+        start = offset + LENGTH.size
+        if start > len(self._map):
+            raise PackError(f"{self.path} is truncated")
+        (length,) = LENGTH.unpack_from(self._map, offset)
+        if start + length > len(self._map):
+            raise PackError(f"{self.path} is truncated")
+        return self._map[start:start + length]
+
+    def read_question(self, question_number):
+        """Return the raw JSON bytes of a question by its position in the whole pack."""
+        (offset,) = OFFSET.unpack_from(self._map, self._offsets_start + OFFSET.size * question_number)
+        return self._read_record(offset)
+
+    def _title_index(self):
+        """Map each title to its quiz table entry, reading the titles on first use."""
+        if self._titles is None:
+            self._titles = {}
+            for number in range(self.quiz_count):
+                title_offset, first, count = QUIZ_ENTRY.unpack_from(self._map, HEADER.size + QUIZ_ENTRY.size * number)
+                self._titles[self._read_record(title_offset).decode("utf-8")] = (first, count)
+        return self._titles
+
+    def titles(self):
+        return list(self._title_index())
+
+    def quiz(self, title):
+        """Return a quiz's questions as a lazily decoded sequence."""
+        first, count = self._title_index()[title]
+        return PackQuiz(self, title, first, count)
+
+    def load(self, title):
+        """Decode every question of one quiz into a list."""
+        return list(self.quiz(title))
+
+    def close(self):
+        self._map.close()
+
+
+def export_pack(store, path):
+    """Write every quiz in a store to a pack; returns the bytes written."""
+    return write_pack(path, {title: store.load(title) for title in store.titles()})
+
+
+def import_pack(path, store):
+    """Save every quiz in a pack into a store; returns how many were imported."""
+    with QuizPack(path) as pack:
+        titles = pack.titles()
+        for title in titles:
+            store.save(title, pack.load(title))
+    return len(titles)
+
+
+def main():
+    from QuizStorage import open_store
+
+    parser = argparse.ArgumentParser(description="Export or import binary quiz packs.")
+    parser.add_argument("action", choices=["export", "import"])
+    parser.add_argument("pack", help="quiz pack file")
+    parser.add_argument("--backend", default="json", choices=["json", "sqlite"])
+    parser.add_argument("--path", help="quiz store directory or database file")
+    args = parser.parse_args()
+
+    store = open_store(args.backend, args.path)
+    try:
+        if args.action == "export":
+            size = export_pack(store, args.pack)
+            print(f"Wrote {len(store)} quizzes to {args.pack} ({size} bytes)")
+        else:
+            print(f"Imported {import_pack(args.pack, store)} quizzes from {args.pack}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
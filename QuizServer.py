@@ -0,0 +1,269 @@
+"""A small asyncio HTTP/JSON service so many students can take quizzes from one machine.
+
+Endpoints (all bodies are JSON):
+
+    GET  /quizzes                      catalog of available quizzes
+    GET  /quizzes/<title>              questions, without their answers
+    POST /attempts                     {"quiz", "student_name", "section"} -> {"attempt_id", "time_limit", ...}
+    POST /attempts/<id>/answers        {"question_index", "answer"}
+    POST /attempts/<id>/finish         -> {"score", "question_count"}
+
+Each attempt has a server-side deadline of ``time_limit`` seconds, like the
+Tk app's timer: when it passes the attempt is finished and recorded, and
+later answers are refused. A client may ask for a shorter ``time_limit``
+when starting an attempt, never a longer one. Grading uses QuizGrader, and all storage access
+runs on one background thread so the event loop never blocks on disk.
+Compiled quizzes are cached until the store reports a newer save, and
+request bodies over MAX_BODY_BYTES are refused with 400.
+
+    python QuizServer.py --backend sqlite --path quizify.db --port 8080
+"""
+import argparse
+import asyncio
+import json
+import math
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote
+
+import QuizMetrics
+from QuizCache import LRUCache
+from QuizGrader import compile_answer_key
+from QuizStorage import open_store
+
+# Question fields that would give the answer away
+HIDDEN_FIELDS = ("correct_answer", "accepted_answers")
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ServerAttempt:
+    """Server-side state of one attempt in progress."""
+
+    __slots__ = ("attempt_id", "attempt", "answer_key", "deadline", "timer", "finished")
+
+    def __init__(self, attempt_id, attempt, answer_key, deadline):
+        self.attempt_id = attempt_id
+        self.attempt = attempt
+        self.answer_key = answer_key
+        self.deadline = deadline
+        self.timer = None
+        self.finished = False
+
+
+class QuizServer:
+    REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 409: "Conflict", 500: "Internal Server Error"}
+    MAX_BODY_BYTES = 64 * 1024  # Far more than any request needs; larger bodies are refused unread
+
+    def __init__(self, store_factory, time_limit=300, cache_entries=256):
+        self.store_factory = store_factory
+        self.time_limit = time_limit
+        self.store = None
+        self.quizzes = LRUCache(max_entries=cache_entries)  # title -> (version, public questions, answer key)
+        self.attempts = {}
+        # Stores are not thread-safe (SQLite connections belong to one thread), so every call goes here
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="quiz-store")
+        self._server = None
+
+    async def start(self, host="127.0.0.1", port=8080):
+        self.store = await self._run_io(self.store_factory)
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        # Record anything still in progress before shutting down
+        for state in list(self.attempts.values()):
+            await self._finish(state)
+        if self.store is not None:
+            await self._run_io(self.store.close)
+        self._io.shutdown(wait=True)
+
+    async def _run_io(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._io, func, *args)
+
+    # -- HTTP plumbing -------------------------------------------------------
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, target, version = request_line.split(" ", 2)
+                headers = {}
+                for line in header_lines:
+                    if line:
+                        name, _, value = line.partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                length = headers.get("content-length", "0")
+                if not (length.isascii() and length.isdigit()) or int(length) > self.MAX_BODY_BYTES:
+                    # The body is left unread, so the connection cannot be reused
+                    status, payload = 400, {"error": f"Content-Length must be at most {self.MAX_BODY_BYTES} bytes"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(int(length)) if int(length) else b""
+                    status, payload = await self._dispatch(method, target, body)
+                data = json.dumps(payload).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {self.REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, target, body):
+        parts = [unquote(part) for part in target.split("?", 1)[0].strip("/").split("/")]
+        try:
+            data = json.loads(body) if body else {}
+            if parts == ["quizzes"] and method == "GET":
+                return 200, await self.list_quizzes()
+            if len(parts) == 2 and parts[0] == "quizzes" and method == "GET":
+                return 200, await self.get_quiz(parts[1])
+            if parts == ["attempts"] and method == "POST":
+                return 201, await self.start_attempt(data)
+            if len(parts) == 3 and parts[0] == "attempts" and method == "POST":
+                if parts[2] == "answers":
+                    return 200, self.submit_answer(parts[1], data)
+                if parts[2] == "finish":
+                    return 200, await self.finish_attempt(parts[1])
+            raise HTTPError(404, "Not found")
+        except HTTPError as e:
+            return e.status, {"error": e.message}
+        except (ValueError, KeyError, TypeError) as e:
+            return 400, {"error": f"Bad request: {e}"}
+        except Exception as e:
+            return 500, {"error": str(e)}
+
+    # -- Quiz endpoints ------------------------------------------------------
+
+    async def list_quizzes(self):
+        catalog = await self._run_io(self.store.catalog)
+        return [{"title": entry["title"], "question_count": entry["question_count"]} for entry in catalog]
+
+    async def _load_quiz(self, title):
+        """Return (public questions, answer key) for a quiz, loading and compiling it once per saved version."""
+        try:
+            version = await self._run_io(self.store.version, title)
+            cached = self.quizzes.get(title)
+            if cached is not None and cached[0] == version:
+                return cached[1:]
+            questions = await self._run_io(self.store.load, title)
+        except KeyError:
+            raise HTTPError(404, f"No quiz titled {title!r}") from None
+        public = [
+            {key: value for key, value in question.items() if key not in HIDDEN_FIELDS}
+            for question in questions
+        ]
+        answer_key = compile_answer_key(questions)
+        self.quizzes.put(title, (version, public, answer_key))
+        return public, answer_key
+
+    async def get_quiz(self, title):
+        public, _ = await self._load_quiz(title)
+        return {"title": title, "questions": public}
+
+    # -- Attempt endpoints ---------------------------------------------------
+
+    async def start_attempt(self, data):
+        title = data["quiz"]
+        public, answer_key = await self._load_quiz(title)
+        time_limit = self.time_limit
+        if data.get("time_limit") is not None:
+            # Clients may shorten the deadline, never extend it
+            requested = float(data["time_limit"])
+            if not math.isfinite(requested) or requested <= 0:
+                raise HTTPError(400, "time_limit must be a positive number of seconds")
+            time_limit = min(requested, self.time_limit)
+        attempt = self.store.start_attempt(title, len(public), data.get("student_name"), data.get("section"))
+
+        attempt_id = secrets.token_hex(8)
+        state = ServerAttempt(attempt_id, attempt, answer_key, time.monotonic() + time_limit)
+        state.timer = asyncio.get_running_loop().call_later(
+            time_limit, lambda: asyncio.ensure_future(self._finish(state))
+        )
+        self.attempts[attempt_id] = state
+        return {"attempt_id": attempt_id, "question_count": len(public), "time_limit": time_limit}
+
+    def _get_attempt(self, attempt_id):
+        state = self.attempts.get(attempt_id)
+        if state is None:
+            raise HTTPError(404, "No such attempt")
+        return state
+
+    def submit_answer(self, attempt_id, data):
+        state = self._get_attempt(attempt_id)
+        remaining = state.deadline - time.monotonic()
+        if state.finished or remaining <= 0:
+            raise HTTPError(409, "Time is up")
+        index = int(data["question_index"])
+        if not 0 <= index < len(state.answer_key):
+            raise HTTPError(400, "question_index out of range")
+        answer = str(data.get("answer", "")).strip()
+        state.attempt.add_response(index, answer, state.answer_key.is_correct(index, answer))
+        return {"accepted": True, "remaining": remaining}
+
+    async def finish_attempt(self, attempt_id):
+        state = self._get_attempt(attempt_id)
+        await self._finish(state)
+        return {"score": state.attempt.score, "question_count": len(state.attempt.correctness)}
+
+    async def _finish(self, state):
+        """Finish and record an attempt once, whether the student or the deadline ends it."""
+        if state.finished:
+            return
+        state.finished = True
+        if state.timer is not None:
+            state.timer.cancel()
+        await self._run_io(self.store.finish_attempt, state.attempt)
+        # Keep finished attempts around briefly so a late "finish" still gets the score
+        asyncio.get_running_loop().call_later(60, self.attempts.pop, state.attempt_id, None)
+
+
+async def serve(backend, path, host, port, time_limit):
+    server = QuizServer(lambda: open_store(backend, path), time_limit=time_limit)
+    listener = await server.start(host, port)
+    print(f"Serving quizzes on http://{host}:{port}")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve quizzes over HTTP.")
+    parser.add_argument("--backend", default="json", choices=["json", "sqlite"])
+    parser.add_argument("--path", help="quiz store directory or database file")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--time-limit", type=float, default=300, help="seconds allowed per attempt")
+    args = parser.parse_args()
+    QuizMetrics.configure_from_env()
+    try:
+        asyncio.run(serve(args.backend, args.path, args.host, args.port, args.time_limit))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
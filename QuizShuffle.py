@@ -0,0 +1,117 @@
+"""Seeded, reproducible shuffling of quiz questions and options for each attempt.
+
+A QuestionPool is built once per quiz. ``pool.deliver(seed)`` then draws and
+orders questions for one attempt in time proportional to the questions
+delivered, not the size of the pool, so many attempts can start at once
+against a large pool. The same seed and settings always rebuild the same
+delivery, so an attempt can be regraded or reviewed from its recorded seed,
+question count and shuffle flags (see ``QuestionPool.rebuild``).
+"""
+import random
+
+_system_random = random.SystemRandom()  # Same source as secrets.randbits, without importing secrets
+
+
+def new_seed():
+    """Return a fresh random seed for an attempt."""
+    return _system_random.getrandbits(32)
+
+
+class Delivery:
+    """The questions one attempt sees, in order, with a mapping back to the canonical quiz."""
+
+    __slots__ = ("seed", "count", "shuffle_questions", "shuffle_options", "question_order", "option_orders",
+                 "questions")
+
+    def __init__(self, seed, question_order, option_orders, questions, count=None, shuffle_questions=True,
+                 shuffle_options=True):
+        self.seed = seed
+        self.count = count  # Questions asked for, or None for the whole pool
+        self.shuffle_questions = shuffle_questions
+        self.shuffle_options = shuffle_options
+        self.question_order = question_order  # Delivered position -> canonical question index
+        self.option_orders = option_orders  # Delivered position -> canonical option indices, or None
+        self.questions = questions  # Question dicts as shown, options already permuted
+
+    def __len__(self):
+        return len(self.question_order)
+
+    def canonical_index(self, position):
+        """Canonical question index for a delivered position."""
+        return self.question_order[position]
+
+
+class QuestionPool:
+    """A quiz's questions grouped by type, ready for drawing attempts from."""
+
+    def __init__(self, questions):
+        self.questions = questions
+        self.strata = {}  # question type -> canonical indices
+        for index, question in enumerate(questions):
+            self.strata.setdefault(question.get("type"), []).append(index)
+
+    def __len__(self):
+        return len(self.questions)
+
+    def allocate(self, count):
+        """Split ``count`` draws across question types in proportion to the pool (largest remainder)."""
+        count = min(count, len(self.questions))
+        shares = {
+            question_type: count * len(indices) / len(self.questions)
+            for question_type, indices in self.strata.items()
+        }
+        allocation = {question_type: int(share) for question_type, share in shares.items()}
+        leftover = count - sum(allocation.values())
+        by_remainder = sorted(shares, key=lambda question_type: shares[question_type] - allocation[question_type],
+                              reverse=True)
+        for question_type in by_remainder[:leftover]:
+            allocation[question_type] += 1
+        return allocation
+
+    def deliver(self, seed, count=None, shuffle_questions=True, shuffle_options=True):
+        """Build the delivery for one attempt.
+
+        ``count`` draws that many questions, stratified by type; None delivers
+        the whole pool.
+        """
+        rng = random.Random(seed)
+        if count is None or count >= len(self.questions):
+            order = list(range(len(self.questions)))
+        else:
+            order = []
+            for question_type, take in self.allocate(count).items():
+                order.extend(rng.sample(self.strata[question_type], take))
+            if not shuffle_questions:
+                order.sort()
+        if shuffle_questions:
+            rng.shuffle(order)
+
+        option_orders = []
+        delivered = []
+        for index in order:
+            question = self.questions[index]
+            options = question.get("options")
+            if shuffle_options and options:
+                permutation = list(range(len(options)))
+                rng.shuffle(permutation)
+                question = dict(question, options=[options[i] for i in permutation])
+                option_orders.append(tuple(permutation))
+            else:
+                option_orders.append(None)
+            delivered.append(question)
+        return Delivery(seed, tuple(order), tuple(option_orders), delivered, count, shuffle_questions, shuffle_options)
+
+    def rebuild(self, attempt):
+        """Rebuild what a recorded attempt was shown, from a ``QuizStore.load_attempts`` dict.
+
+        Attempts recorded before the shuffle flags were stored are assumed to
+        have used the app's defaults (both on).
+        """
+        if attempt.get("seed") is None:
+            raise ValueError("attempt was recorded without a shuffle seed")
+        return self.deliver(
+            attempt["seed"],
+            attempt.get("delivered_count"),
+            shuffle_questions=attempt.get("shuffle_questions") is not False,
+            shuffle_options=attempt.get("shuffle_options") is not False,
+        )
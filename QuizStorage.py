@@ -0,0 +1,868 @@
+import abc
+import itertools
+import json
+import os
+import stat
+import struct
+import tempfile
+import threading
+import time
+
+import QuizMetrics
+from DatabaseAPP import QuizifyDatabase
+from QuizDedup import QuestionInterner, exact_hash
+
+MULTIPLE_CHOICE = "Multiple Choice"
+
+# The umask can only be read by setting it, so it is read once, on import, before any writer thread starts
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+
+
+def app_question_to_db(question):
+    """Convert a Tk app question (``type``/``correct_answer``) to the QuizifyDatabase format.
+
+    ``correct_option`` is the 1-based position of the correct answer among the
+    options, or None when the question has no options to point at. The
+    original ``type`` and ``correct_answer`` are kept so the conversion can be
+    reversed exactly.
+    """
+    options = question.get("options", [])
+    correct_answer = question.get("correct_answer")
+    correct_option = options.index(correct_answer) + 1 if correct_answer in options else None
+    converted = {
+        "question": question["question"],
+        "options": list(options),
+        "correct_option": correct_option,
+        "type": question.get("type"),
+        "correct_answer": correct_answer,
+    }
+    if question.get("accepted_answers"):
+        converted["accepted_answers"] = list(question["accepted_answers"])
+    return converted
+
+
+def db_question_to_app(question):
+    """Convert a QuizifyDatabase question back to the Tk app format.
+
+    Questions saved by older code have no type or answer text; they are
+    treated as multiple choice with the answer taken from ``correct_option``.
+    """
+    options = question.get("options", [])
+    question_type = question.get("type") or MULTIPLE_CHOICE
+    correct_answer = question.get("correct_answer")
+    correct_option = question.get("correct_option")
+    if correct_answer is None and question.get("type") is None:
+        try:
+            position = int(correct_option)
+        except (TypeError, ValueError):
+            position = 0
+        if 1 <= position <= len(options):
+            correct_answer = options[position - 1]
+
+    converted = {"type": question_type, "question": question["question"]}
+    if options or question_type == MULTIPLE_CHOICE:
+        converted["options"] = list(options)
+    converted["correct_answer"] = correct_answer
+    if question.get("accepted_answers"):
+        converted["accepted_answers"] = list(question["accepted_answers"])
+    return converted
+
+
+def atomic_write_json(path, data):
+    """Write JSON to ``path`` so readers see either the old file or the new one, never a partial write.
+
+    Returns the number of bytes written.
+    """
+    started = time.perf_counter() if QuizMetrics.enabled else None
+    if isinstance(data, list):
+        # In slices, so a writer thread lets the Tk thread run between slices instead of
+        # holding the interpreter lock for the whole encode; the output is the same
+        chunks = (json.dumps(data[start:start + 256])[1:-1] for start in range(0, len(data), 256))
+        payload = ("[" + ", ".join(chunks) + "]").encode("utf-8")
+    else:
+        payload = json.dumps(data).encode("utf-8")
+    atomic_write_bytes(path, payload)
+    if started is not None:
+        QuizMetrics.observe("quizify_json_save_seconds", time.perf_counter() - started)
+        QuizMetrics.observe("quizify_json_save_bytes", len(payload))
+    return len(payload)
+
+
+def atomic_write_bytes(path, payload):
+    """Replace ``path`` with ``payload`` (bytes, or an iterable of bytes) through a temporary file.
+
+    The temporary file is removed again if the write fails.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.splitext(path)[1])
+    try:
+        # mkstemp makes the file private to its owner; give it the permissions a plain open() would
+        os.chmod(tmp_path, replacement_mode(path))
+        with os.fdopen(fd, "wb") as file:
+            file.writelines([payload] if isinstance(payload, bytes) else payload)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def replacement_mode(path):
+    """Permission bits for a file replacing ``path``: those of ``path``, or the umask's default for a new file."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+class Attempt:
+    """An attempt in progress: responses are buffered in memory and written once, when it finishes."""
+
+    def __init__(self, title, question_count, student_name=None, section=None):
+        self.title = title
+        self.student_name = student_name
+        self.section = section
+        self.started_at = time.time()
+        self.finished_at = None
+        self.question_count = question_count
+        self.correctness = [False] * question_count  # Canonical order; unanswered questions count as wrong
+        self.responses = []  # (question_index, answer, correct, answered_at)
+        self.seed = None  # QuizShuffle seed the questions were delivered with, if shuffled
+        self.delivered_count = None  # Number of questions delivered, if fewer than the whole quiz
+        self.question_indices = None  # Canonical indices of the delivered questions, if fewer than the whole quiz
+        self.shuffle_questions = None  # QuizShuffle settings the delivery was built with
+        self.shuffle_options = None
+
+    @property
+    def score(self):
+        return sum(self.correctness)
+
+    def record_delivery(self, delivery):
+        """Remember how a QuizShuffle delivery was built, so it can be rebuilt and only its questions are scored."""
+        self.seed = delivery.seed
+        self.shuffle_questions = delivery.shuffle_questions
+        self.shuffle_options = delivery.shuffle_options
+        if len(delivery) < self.question_count:
+            self.delivered_count = len(delivery)
+            self.question_indices = sorted(delivery.question_order)
+
+    def recorded_correctness(self):
+        """Correctness of the delivered questions only, in canonical order; questions never shown are left out."""
+        if self.question_indices is None:
+            return self.correctness
+        return [self.correctness[index] for index in self.question_indices]
+
+    def add_response(self, question_index, answer, correct):
+        """Buffer one answer; nothing is written until the attempt is finished."""
+        self.correctness[question_index] = bool(correct)
+        self.responses.append((question_index, answer, bool(correct), time.time()))
+
+
+# Columns of the rows yielded by QuizStore.iter_results
+RESULT_COLUMNS = QuizifyDatabase.RESULT_COLUMNS
+
+
+class QuizStore(abc.ABC):
+    """Interface for quiz storage backends.
+
+    Quizzes are addressed by title and hold a list of questions in the Tk app
+    format: ``{"type", "question", "options" (multiple choice), "correct_answer"}``.
+    Backends must implement every abstract method; the rest have defaults
+    built on them.
+    """
+
+    @abc.abstractmethod
+    def __contains__(self, title):
+        """Return whether a quiz with this title is stored."""
+
+    def __len__(self):
+        return len(self.titles())
+
+    @abc.abstractmethod
+    def titles(self):
+        """Return every quiz title."""
+
+    @abc.abstractmethod
+    def catalog(self):
+        """Return title, id, question count, size and mtime for every quiz without loading questions."""
+
+    def catalog_page(self, cursor=None, limit=50):
+        """Return ``(entries, next_cursor)`` for one page of the catalog.
+
+        Pass the returned cursor back to get the following page; it is None
+        after the last page.
+        """
+        start = cursor or 0
+        entries = self.catalog()[start:start + limit]
+        next_cursor = start + limit if start + limit < len(self) else None
+        return entries, next_cursor
+
+    def version(self, title):
+        """Return a value that changes whenever the quiz is saved again; raises KeyError for a missing title."""
+        for entry in self.catalog():
+            if entry["title"] == title:
+                return entry["id"], entry["mtime"]
+        raise KeyError(title)
+
+    @abc.abstractmethod
+    def load(self, title):
+        """Load the questions of one quiz."""
+
+    def load_all(self):
+        """Load every quiz as a dict mapping title to its questions.
+
+        A question that appears in several quizzes is loaded once and shared
+        between them, so treat the questions as read-only.
+        """
+        interner = QuestionInterner()
+        return {title: interner.intern_quiz(self.load(title)) for title in self.titles()}
+
+    @abc.abstractmethod
+    def save(self, title, questions):
+        """Save one quiz, replacing any existing quiz with the same title."""
+
+    @abc.abstractmethod
+    def delete(self, title):
+        """Delete one quiz."""
+
+    def search(self, text, limit=50):
+        """Return titles of quizzes matching ``text``, best match first."""
+        words = text.casefold().split()
+        matches = [
+            title for title in self.titles()
+            if all(word in title.casefold() for word in words)
+        ]
+        return matches[:limit]
+
+    def start_attempt(self, title, question_count, student_name=None, section=None):
+        """Begin an attempt; add answers with Attempt.add_response, then call finish_attempt."""
+        return Attempt(title, question_count, student_name, section)
+
+    @abc.abstractmethod
+    def finish_attempt(self, attempt):
+        """Write a finished attempt and its buffered responses in one go."""
+
+    def record_attempt(self, title, correctness, student_name=None, section=None):
+        """Record a finished attempt as a per-question sequence of correct/incorrect flags."""
+        attempt = Attempt(title, len(correctness), student_name, section)
+        attempt.correctness = [bool(correct) for correct in correctness]
+        self.finish_attempt(attempt)
+
+    @abc.abstractmethod
+    def load_attempts(self, title):
+        """Return recorded attempts at a quiz as dicts.
+
+        Each has student_name, section, finished_at, correctness (bytes, one
+        0/1 byte per delivered question), question_indices (the canonical
+        indices those bytes belong to, or None when every question was
+        delivered), question_count, and the seed, delivered_count,
+        shuffle_questions and shuffle_options a delivery can be rebuilt from.
+        """
+
+    @abc.abstractmethod
+    def iter_results(self, title=None):
+        """Yield one tuple per recorded response (see RESULT_COLUMNS), streaming in constant memory."""
+
+    def close(self):
+        """Release any resources held by the store."""
+
+
+# Maps the '0'/'1' characters of a stored attempt to 0/1 bytes
+_CORRECTNESS_DIGITS = bytes.maketrans(b"01", b"\x00\x01")
+
+# One questions.idx record: the 20-byte exact hash of a question and its byte offset in questions.jsonl
+_QUESTION_OFFSET = struct.Struct("<20sQ")
+
+
+class JsonQuizStore(QuizStore):
+    """Stores each quiz in its own JSON file, plus a small catalog index.
+
+    Saving a quiz rewrites only that quiz's file and the index, instead of the
+    whole bank. The index records each quiz's id, file, question count, size
+    and modification time, so listing quizzes never opens the quiz files.
+    A legacy ``quizzes.json`` is imported the first time the store is opened.
+    One thread may write while others read the catalog and quizzes.
+
+    Each distinct question is stored once, as a line of ``questions.jsonl``
+    keyed by its QuizDedup.exact_hash, and quiz files list the hash and byte
+    offset of each of their questions, so loading a quiz reads only its own
+    lines. ``questions.idx`` maps every stored hash to its offset; it is
+    read only when saving, to find questions that are already stored. New
+    questions are appended, and the file is compacted once enough questions
+    have been replaced or deleted. Quiz files written by older versions hold
+    their questions inline, or hashes without offsets, until next saved.
+    """
+
+    INDEX_FILE = "index.json"
+    ATTEMPTS_FILE = "attempts.jsonl"
+    QUESTIONS_FILE = "questions.jsonl"
+    QUESTION_INDEX_FILE = "questions.idx"
+
+    # Compact questions.jsonl once replaced or deleted questions exceed this, or half the stored questions
+    COMPACT_MIN_STALE = 256
+
+    def __init__(self, directory="quizzes", legacy_file="quizzes.json"):
+        self.directory = directory
+        self.index_path = os.path.join(directory, self.INDEX_FILE)
+        self.questions_path = os.path.join(directory, self.QUESTIONS_FILE)
+        self.question_index_path = os.path.join(directory, self.QUESTION_INDEX_FILE)
+        self._offsets = None  # 20-byte exact hash -> offset in questions.jsonl, read on first save
+        self._offsets_lock = threading.Lock()
+        self._index_stamp = None  # (inode, mtime_ns, size) of index.json as last read or written here
+        os.makedirs(directory, exist_ok=True)
+
+        if os.path.exists(self.index_path):
+            self._read_index()
+            self._backfill_catalog()
+        else:
+            self.index = {"next_id": 1, "quizzes": {}}
+            if legacy_file and os.path.exists(legacy_file):
+                self._import_legacy(legacy_file)
+            else:
+                self._write_index()
+
+    def __contains__(self, title):
+        return title in self.index["quizzes"]
+
+    def __len__(self):
+        return len(self.index["quizzes"])
+
+    def titles(self):
+        """Return quiz titles in the order they were first saved."""
+        return list(self.index["quizzes"])
+
+    def catalog(self):
+        """Return title, id, question count, size and mtime for every quiz without loading any of them."""
+        return [self._catalog_entry(title, entry) for title, entry in self.index["quizzes"].items()]
+
+    @staticmethod
+    def _catalog_entry(title, entry):
+        return {
+            "title": title,
+            "id": entry["id"],
+            "question_count": entry["question_count"],
+            "size": entry["size"],
+            "mtime": entry["mtime"],
+        }
+
+    def catalog_page(self, cursor=None, limit=50):
+        start = cursor or 0
+        items = itertools.islice(self.index["quizzes"].items(), start, start + limit)
+        entries = [self._catalog_entry(title, entry) for title, entry in items]
+        next_cursor = start + limit if start + limit < len(self) else None
+        return entries, next_cursor
+
+    def version(self, title):
+        """Return the quiz's id and save count, first picking up saves made by other processes."""
+        if self._index_stamp != self._stat_index():
+            self._read_index()
+        entry = self.index["quizzes"][title]
+        return entry["id"], entry.get("revision", 0)
+
+    def load(self, title):
+        """Load the questions of one quiz."""
+        entry = self.index["quizzes"][title]
+        with open(os.path.join(self.directory, entry["file"]), "r", encoding="utf-8") as file:
+            if not QuizMetrics.enabled:
+                return self._resolve(json.load(file))
+            started = time.perf_counter()
+            questions = self._resolve(json.load(file))
+            QuizMetrics.observe("quizify_json_load_seconds", time.perf_counter() - started)
+            QuizMetrics.observe("quizify_json_load_bytes", os.fstat(file.fileno()).st_size)
+            return questions
+
+    def save(self, title, questions):
+        """Save one quiz, replacing any existing quiz with the same title."""
+        entry = self.index["quizzes"].get(title)
+        if entry is None:
+            entry = self._new_entry()
+        else:
+            entry = dict(entry)
+            self.index["stale_questions"] = self.index.get("stale_questions", 0) + entry["question_count"]
+        # File mtimes can tie for two quick saves, so version() counts saves instead
+        entry["revision"] = entry.get("revision", 0) + 1
+
+        # Write the quiz before the index so the index never points at a missing file
+        self._write_quiz(entry, questions)
+        quizzes = dict(self.index["quizzes"])
+        quizzes[title] = entry
+        self._replace_quizzes(quizzes)
+        self._write_index()
+        self._compact_if_stale()
+
+    def delete(self, title):
+        """Delete one quiz."""
+        quizzes = dict(self.index["quizzes"])
+        entry = quizzes.pop(title)
+        self.index["stale_questions"] = self.index.get("stale_questions", 0) + entry["question_count"]
+        self._replace_quizzes(quizzes)
+        self._write_index()
+        try:
+            os.remove(os.path.join(self.directory, entry["file"]))
+        except FileNotFoundError:
+            pass
+        self._compact_if_stale()
+
+    def compact(self):
+        """Rewrite questions.jsonl without the questions no quiz uses any more."""
+        used = set()
+        for entry in self.index["quizzes"].values():
+            with open(os.path.join(self.directory, entry["file"]), "r", encoding="utf-8") as file:
+                used.update(self._item_hash(item) for item in json.load(file) if not isinstance(item, dict))
+        offsets = {}
+        if os.path.exists(self.questions_path):
+            with open(self.questions_path, "rb") as source:
+                def kept_lines():
+                    position = 0
+                    for line in source:
+                        digest = self._line_digest(line)
+                        if digest is not None and digest.hex() in used and digest not in offsets:
+                            offsets[digest] = position
+                            position += len(line)
+                            yield line
+
+                # Without questions.idx the offsets are rebuilt from questions.jsonl, so a crash
+                # between replacing the two files cannot leave offsets into the wrong file
+                try:
+                    os.remove(self.question_index_path)
+                except FileNotFoundError:
+                    pass
+                atomic_write_bytes(self.questions_path, kept_lines())
+            atomic_write_bytes(self.question_index_path, self._offset_records(offsets.items()))
+        # Swapped whole, so readers holding the old dict never see it half updated
+        self._offsets = offsets
+
+        # Point quiz files at the questions' new offsets
+        quizzes = dict(self.index["quizzes"])
+        for title, entry in quizzes.items():
+            path = os.path.join(self.directory, entry["file"])
+            with open(path, "r", encoding="utf-8") as file:
+                items = json.load(file)
+            moved = []
+            for item in items:
+                if not isinstance(item, dict):
+                    question_hash = self._item_hash(item)
+                    item = [question_hash, offsets[bytes.fromhex(question_hash)]]
+                moved.append(item)
+            if moved != items:
+                entry = quizzes[title] = dict(entry)
+                entry["size"] = atomic_write_json(path, moved)
+                entry["mtime"] = os.stat(path).st_mtime
+        self._replace_quizzes(quizzes)
+        self.index["stale_questions"] = 0
+        self._write_index()
+
+    def finish_attempt(self, attempt):
+        # Attempts are appended one JSON line each; nothing already written is rewritten
+        attempt.finished_at = time.time()
+        record = {
+            "quiz": attempt.title,
+            "student_name": attempt.student_name,
+            "section": attempt.section,
+            "started_at": attempt.started_at,
+            "finished_at": attempt.finished_at,
+            "correct": "".join("1" if correct else "0" for correct in attempt.recorded_correctness()),
+            "questions": attempt.question_indices,
+            "question_count": attempt.question_count,
+            "responses": attempt.responses,
+            "seed": attempt.seed,
+            "delivered_count": attempt.delivered_count,
+            "shuffle_questions": attempt.shuffle_questions,
+            "shuffle_options": attempt.shuffle_options,
+        }
+        with open(os.path.join(self.directory, self.ATTEMPTS_FILE), "a", encoding="utf-8") as file:
+            file.write(json.dumps(record) + "\n")
+
+    def load_attempts(self, title):
+        return [
+            {
+                "student_name": record["student_name"],
+                "section": record["section"],
+                "finished_at": record["finished_at"],
+                "correctness": record["correct"].encode("ascii").translate(_CORRECTNESS_DIGITS),
+                "question_indices": record.get("questions"),
+                "question_count": record.get("question_count") or len(record["correct"]),
+                "seed": record.get("seed"),
+                "delivered_count": record.get("delivered_count"),
+                "shuffle_questions": record.get("shuffle_questions"),
+                "shuffle_options": record.get("shuffle_options"),
+            }
+            for _, record in self._iter_attempt_records(title)
+        ]
+
+    def iter_results(self, title=None):
+        for attempt_id, record in self._iter_attempt_records(title):
+            correct = record["correct"]
+            summary = (
+                attempt_id, record["quiz"], record["student_name"], record["section"],
+                record.get("started_at"), record["finished_at"], correct.count("1"), len(correct),
+            )
+            responses = record.get("responses") or [(None, None, None, None)]
+            for question_index, answer, is_correct, answered_at in responses:
+                yield summary + (question_index, answer, None if is_correct is None else int(is_correct), answered_at)
+
+    def _iter_attempt_records(self, title=None):
+        """Yield (line number, record) for recorded attempts, optionally for one quiz title."""
+        try:
+            file = open(os.path.join(self.directory, self.ATTEMPTS_FILE), "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with file:
+            for line_number, line in enumerate(file, start=1):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # A line cut short by a crash mid-append
+                if title is None or record["quiz"] == title:
+                    yield line_number, record
+
+    def _replace_quizzes(self, quizzes):
+        # The catalog is swapped whole rather than edited in place, so a background
+        # writer never changes a dict that another thread is iterating
+        self.index["quizzes"] = quizzes
+
+    def _new_entry(self):
+        entry = {"id": self.index["next_id"], "file": f"quiz-{self.index['next_id']}.json"}
+        self.index["next_id"] += 1
+        return entry
+
+    def _write_quiz(self, entry, questions):
+        """Write one quiz file and refresh its catalog fields."""
+        path = os.path.join(self.directory, entry["file"])
+        entry["size"] = atomic_write_json(path, self._share_questions(questions))
+        entry["question_count"] = len(questions)
+        entry["mtime"] = os.stat(path).st_mtime
+
+    def _question_offsets(self):
+        """Return the offset in questions.jsonl of every stored question, by 20-byte exact hash."""
+        offsets = self._offsets
+        if offsets is None:
+            with self._offsets_lock:
+                if self._offsets is None:
+                    self._offsets = self._read_question_offsets()
+                offsets = self._offsets
+        return offsets
+
+    def _read_question_offsets(self):
+        """Read questions.idx, then index any lines of questions.jsonl appended after it was last written."""
+        try:
+            with open(self.question_index_path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            data = b""
+        whole = len(data) - len(data) % _QUESTION_OFFSET.size
+        if whole < len(data):
+            # Drop a record cut short by a crash mid-append, so later records stay aligned
+            with open(self.question_index_path, "r+b") as file:
+                file.truncate(whole)
+        offsets = dict(_QUESTION_OFFSET.iter_unpack(data[:whole]))
+
+        try:
+            file = open(self.questions_path, "r+b")
+        except FileNotFoundError:
+            return offsets
+        with file:
+            # Start from the last indexed line; everything after it was appended since
+            position = max(offsets.values(), default=0)
+            file.seek(position)
+            missing = []
+            cut = None
+            for line in file:
+                digest = self._line_digest(line)
+                if digest is None:
+                    cut = position  # A line cut short by a crash mid-append
+                    break
+                if digest not in offsets:
+                    offsets[digest] = position
+                    missing.append((digest, position))
+                position += len(line)
+            if cut is not None:
+                # Dropped, so the next append starts a fresh line
+                file.truncate(cut)
+        if missing:
+            self._append_offsets(missing)
+        return offsets
+
+    def _append_offsets(self, pairs):
+        with open(self.question_index_path, "ab") as file:
+            file.write(self._offset_records(pairs))
+            file.flush()
+            os.fsync(file.fileno())
+
+    @staticmethod
+    def _offset_records(pairs):
+        return b"".join(_QUESTION_OFFSET.pack(digest, offset) for digest, offset in pairs)
+
+    @staticmethod
+    def _line_digest(line):
+        """The exact hash of a questions.jsonl line as 20 bytes, or None for a line cut short."""
+        if not line.endswith(b"\n"):
+            return None
+        return bytes.fromhex(line[2:42].decode("ascii"))
+
+    @staticmethod
+    def _item_hash(item):
+        """The exact hash in a quiz file item: a [hash, offset] pair, or a bare hash in older files."""
+        return item if isinstance(item, str) else item[0]
+
+    def _share_questions(self, questions):
+        """Append any questions not stored yet to questions.jsonl and return the quiz's [hash, offset] pairs."""
+        offsets = self._question_offsets()
+        hashes = [exact_hash(question) for question in questions]
+        new = {}
+        for question_hash, question in zip(hashes, questions):
+            if question_hash not in new and bytes.fromhex(question_hash) not in offsets:
+                new[question_hash] = (json.dumps([question_hash, question]) + "\n").encode("utf-8")
+        if new:
+            # Written before the quiz file that refers to them, and indexed once they are on disk
+            with open(self.questions_path, "ab") as file:
+                position = file.seek(0, os.SEEK_END)
+                added = []
+                for question_hash, line in new.items():
+                    added.append((bytes.fromhex(question_hash), position))
+                    position += len(line)
+                file.write(b"".join(new.values()))
+                file.flush()
+                os.fsync(file.fileno())
+            self._append_offsets(added)
+            offsets.update(added)
+        return [[question_hash, offsets[bytes.fromhex(question_hash)]] for question_hash in hashes]
+
+    def _resolve(self, items):
+        """Turn a quiz file's question references (or inline questions, in older files) into question dicts."""
+        if all(isinstance(item, dict) for item in items):
+            return items
+        with open(self.questions_path, "rb") as file:
+            return [item if isinstance(item, dict) else self._read_question(file, item) for item in items]
+
+    def _read_question(self, file, item):
+        question_hash = self._item_hash(item)
+        prefix = b'["' + question_hash.encode("ascii") + b'"'
+        if not isinstance(item, str):
+            file.seek(item[1])
+            line = file.readline()
+            if line.startswith(prefix):
+                return json.loads(line)[1]
+        # No offset (an older quiz file), or a stale one: look the hash up in questions.idx
+        offset = self._question_offsets().get(bytes.fromhex(question_hash))
+        if offset is not None:
+            file.seek(offset)
+            line = file.readline()
+            if line.startswith(prefix):
+                return json.loads(line)[1]
+        raise KeyError(f"question {question_hash} is missing from {self.questions_path}")
+
+    def _compact_if_stale(self):
+        stale = self.index.get("stale_questions", 0)
+        if stale > max(self.COMPACT_MIN_STALE, len(self._question_offsets()) // 2):
+            self.compact()
+
+    def _write_index(self):
+        atomic_write_json(self.index_path, self.index)
+        self._index_stamp = self._stat_index()
+
+    def _read_index(self):
+        with open(self.index_path, "r", encoding="utf-8") as file:
+            stat_result = os.fstat(file.fileno())
+            self.index = json.load(file)
+        self._index_stamp = (stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size)
+        # Another process may have appended or compacted questions.jsonl too
+        with self._offsets_lock:
+            self._offsets = None
+
+    def _stat_index(self):
+        try:
+            stat_result = os.stat(self.index_path)
+        except FileNotFoundError:
+            return None
+        return stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size
+
+    def _backfill_catalog(self):
+        """Fill in catalog fields missing from indexes written by older versions."""
+        changed = False
+        for entry in self.index["quizzes"].values():
+            if "question_count" in entry:
+                continue
+            path = os.path.join(self.directory, entry["file"])
+            with open(path, "r", encoding="utf-8") as file:
+                entry["question_count"] = len(json.load(file))
+            stat = os.stat(path)
+            entry["size"] = stat.st_size
+            entry["mtime"] = stat.st_mtime
+            entry.setdefault("id", int(entry["file"].split("-")[1].split(".")[0]))
+            changed = True
+        if changed:
+            self._write_index()
+
+    def _import_legacy(self, legacy_file):
+        """Split a whole-bank quizzes.json into per-quiz files."""
+        with open(legacy_file, "r", encoding="utf-8") as file:
+            quizzes = json.load(file)
+        for title, questions in quizzes.items():
+            entry = self._new_entry()
+            self._write_quiz(entry, questions)
+            self.index["quizzes"][title] = entry
+        self._write_index()
+
+
+class SqliteQuizStore(QuizStore):
+    """Stores quizzes in quizify.db through QuizifyDatabase.
+
+    Questions are converted to and from the database format on the way in and
+    out. Saving over an existing title writes the new copy before deleting the
+    old one, so a crash can leave a duplicate but never loses the quiz. Pass
+    ``pooled=True`` to use the store from more than one thread.
+    """
+
+    def __init__(self, db_name="quizify.db", **db_options):
+        self.db = QuizifyDatabase(db_name, **db_options)
+
+    def __contains__(self, title):
+        return bool(self._ids_for(title))
+
+    def titles(self):
+        return list(dict.fromkeys(title for _, title in self.db.get_all_quizzes()))
+
+    def catalog(self):
+        # Later rows win so a title maps to its most recent copy
+        entries = {}
+        for quiz_id, title, question_count in self.db.get_quiz_summaries():
+            entries[title] = {
+                "title": title,
+                "id": quiz_id,
+                "question_count": question_count,
+                "size": None,
+                "mtime": None,
+            }
+        return list(entries.values())
+
+    def catalog_page(self, cursor=None, limit=50):
+        # Like catalog(), each title maps to its most recent copy
+        rows = self.db.get_quiz_page(cursor or 0, limit, latest_only=True)
+        entries = [
+            {"title": title, "id": quiz_id, "question_count": question_count, "size": None, "mtime": None}
+            for quiz_id, title, question_count in rows
+        ]
+        return entries, rows[-1][0] if len(rows) == limit else None
+
+    def version(self, title):
+        # Saving writes a new copy, so the latest id changes with every save
+        quiz_ids = self._ids_for(title)
+        if not quiz_ids:
+            raise KeyError(title)
+        return quiz_ids[-1]
+
+    def load(self, title):
+        quiz_ids = self._ids_for(title)
+        if not quiz_ids:
+            raise KeyError(title)
+        # The bank is converted straight to the app format, skipping the intermediate dicts
+        quiz_data = self.db.get_quiz_bank(quiz_ids[-1])
+        return [db_question_to_app(question) for question in quiz_data["questions"]]
+
+    def save(self, title, questions):
+        old_ids = self._ids_for(title)
+        self.db.save_quiz(title, [app_question_to_db(question) for question in questions])
+        for quiz_id in old_ids:
+            self.db.delete_quiz(quiz_id)
+
+    def delete(self, title):
+        quiz_ids = self._ids_for(title)
+        if not quiz_ids:
+            raise KeyError(title)
+        for quiz_id in quiz_ids:
+            self.db.delete_quiz(quiz_id)
+
+    def finish_attempt(self, attempt):
+        attempt.finished_at = time.time()
+        quiz_ids = self._ids_for(attempt.title)
+        self.db.save_attempt(
+            quiz_ids[-1] if quiz_ids else None,
+            attempt.title,
+            attempt.recorded_correctness(),
+            attempt.student_name,
+            attempt.section,
+            finished_at=attempt.finished_at,
+            started_at=attempt.started_at,
+            responses=attempt.responses,
+            seed=attempt.seed,
+            delivered_count=attempt.delivered_count,
+            question_indices=attempt.question_indices,
+            question_count=attempt.question_count,
+            shuffle_questions=attempt.shuffle_questions,
+            shuffle_options=attempt.shuffle_options,
+        )
+
+    def load_attempts(self, title):
+        return [
+            {
+                "student_name": student_name,
+                "section": section,
+                "finished_at": finished_at,
+                "correctness": correctness,
+                "question_indices": None if question_indices is None else json.loads(question_indices),
+                "question_count": question_count if question_count is not None else len(correctness),
+                "seed": seed,
+                "delivered_count": delivered_count,
+                "shuffle_questions": None if shuffle_questions is None else bool(shuffle_questions),
+                "shuffle_options": None if shuffle_options is None else bool(shuffle_options),
+            }
+            for (student_name, section, finished_at, correctness, question_indices, question_count, seed,
+                 delivered_count, shuffle_questions, shuffle_options) in self.db.get_attempts(title)
+        ]
+
+    def search(self, text, limit=50):
+        # Full-text search over titles, questions and options via the FTS5 index
+        return list(dict.fromkeys(title for _, title in self.db.search_quizzes(text, limit)))
+
+    def iter_results(self, title=None):
+        return self.db.iter_results(title)
+
+    def close(self):
+        self.db.close()
+
+    def _ids_for(self, title):
+        return self.db.get_quiz_ids_by_title(title)
+
+
+def convert_store(source, target):
+    """Copy every quiz from one store to another and return how many were copied."""
+    count = 0
+    for title in source.titles():
+        target.save(title, source.load(title))
+        count += 1
+    return count
+
+
+def open_store(backend="json", path=None, threaded=False):
+    """Open a quiz store by backend name ("json" or "sqlite").
+
+    With ``threaded=True`` the store may be written from one background
+    thread while other threads read it.
+    """
+    if backend == "json":
+        return JsonQuizStore(path or "quizzes")
+    if backend == "sqlite":
+        return SqliteQuizStore(path or "quizify.db", pooled=threaded)
+    raise ValueError(f"Unknown storage backend: {backend!r}")
+
+
+# Convert a quiz bank between backends, e.g.:
+#   python QuizStorage.py json quizzes sqlite quizify.db
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 5:
+        sys.exit("usage: python QuizStorage.py SOURCE_BACKEND SOURCE_PATH TARGET_BACKEND TARGET_PATH")
+    source = open_store(sys.argv[1], sys.argv[2])
+    target = open_store(sys.argv[3], sys.argv[4])
+    try:
+        print(f"Copied {convert_store(source, target)} quizzes")
+    finally:
+        source.close()
+        target.close()
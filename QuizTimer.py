@@ -0,0 +1,116 @@
+import math
+import time
+
+import QuizMetrics
+
+
+class QuizTimer:
+    """Countdown for a whole quiz and, optionally, for each question, driven by ``root.after``.
+
+    Everything runs on the Tk main loop, so callbacks may touch widgets
+    directly. Deadlines are kept against ``time.monotonic()`` and each tick is
+    scheduled for the next whole-second boundary, so the countdown does not
+    drift however late individual ticks fire.
+    """
+
+    def __init__(self, root, quiz_seconds, question_seconds=None,
+                 on_tick=None, on_quiz_expired=None, on_question_expired=None):
+        self.root = root
+        self.quiz_seconds = quiz_seconds
+        self.question_seconds = question_seconds
+        self.on_tick = on_tick
+        self.on_quiz_expired = on_quiz_expired
+        self.on_question_expired = on_question_expired
+        self.quiz_deadline = None
+        self.question_deadline = None
+        self._after_id = None
+        self._due = None  # When the scheduled tick should fire, for measuring jitter
+        self._last_shown = None
+
+    @property
+    def running(self):
+        return self.quiz_deadline is not None
+
+    def start(self):
+        """Start the quiz countdown (and the first question's countdown)."""
+        self.cancel()
+        self.quiz_deadline = time.monotonic() + self.quiz_seconds
+        self.start_question()
+
+    def start_question(self):
+        """Restart the per-question countdown, e.g. when the next question is shown."""
+        if not self.running:
+            return
+        if self.question_seconds:
+            self.question_deadline = time.monotonic() + self.question_seconds
+        self._last_shown = None
+        self._schedule(0)
+
+    def cancel(self):
+        """Stop the countdown; no further callbacks are made."""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self.quiz_deadline = None
+        self.question_deadline = None
+
+    def quiz_remaining(self):
+        """Seconds left for the whole quiz."""
+        if self.quiz_deadline is None:
+            return 0.0
+        return max(0.0, self.quiz_deadline - time.monotonic())
+
+    def question_remaining(self):
+        """Seconds left for the current question, or None without a per-question limit."""
+        if self.question_deadline is None:
+            return None
+        return max(0.0, self.question_deadline - time.monotonic())
+
+    def _schedule(self, delay_ms):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        self._due = time.monotonic() + delay_ms / 1000
+        self._after_id = self.root.after(delay_ms, self._tick)
+
+    def _tick(self):
+        self._after_id = None
+        if QuizMetrics.enabled:
+            QuizMetrics.observe("quizify_timer_jitter_seconds", max(0.0, time.monotonic() - self._due))
+        if not self.running:
+            return
+
+        quiz_left = self.quiz_remaining()
+        question_left = self.question_remaining()
+
+        if quiz_left <= 0:
+            self.cancel()
+            if self.on_quiz_expired:
+                self.on_quiz_expired()
+            return
+        if question_left is not None and question_left <= 0:
+            # The callback normally moves on and calls start_question()
+            self.question_deadline = None
+            if self.on_question_expired:
+                self.on_question_expired()
+            if self.running and self._after_id is None:
+                self._schedule(0)
+            return
+
+        # Only redraw when the whole seconds shown to the user change
+        shown = (math.ceil(quiz_left), None if question_left is None else math.ceil(question_left))
+        if shown != self._last_shown:
+            self._last_shown = shown
+            if self.on_tick:
+                self.on_tick(*shown)
+
+        # Wake up just after the next whole-second boundary of either countdown
+        delay = min(
+            self._until_next_second(left) for left in (quiz_left, question_left) if left is not None
+        )
+        self._schedule(delay)
+
+    @staticmethod
+    def _until_next_second(left):
+        """Milliseconds until ``left`` seconds next crosses a whole second."""
+        fraction = left - math.floor(left)
+        return int(fraction * 1000) + 1 if fraction > 0 else 1000
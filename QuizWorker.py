@@ -0,0 +1,150 @@
+"""Run quiz storage work on a background thread so the Tk main loop never waits on disk.
+
+StoreWorker owns a single writer thread fed by a queue. Saving a quiz that
+already has a save waiting replaces the waiting copy instead of writing
+twice. Results and errors are handed back on the Tk thread by polling a
+completion queue with ``root.after``, since Tk must only be touched from
+the thread running the main loop.
+
+StallProbe measures how late the main loop runs scheduled callbacks, which
+is how long the window was frozen; while QuizMetrics is enabled each tick is
+also recorded in quizify_mainloop_lateness_seconds.
+"""
+import collections
+import queue
+import threading
+import time
+
+import QuizMetrics
+
+
+class StoreWorker:
+    """A single background thread that runs store calls in order."""
+
+    POLL_MS = 20  # How often completions are checked for while work is outstanding
+
+    def __init__(self, root, store, on_error=None):
+        self.root = root
+        self.store = store
+        self.on_error = on_error  # Called on the Tk thread for failures without their own handler
+        self._jobs = queue.Queue()
+        self._completions = queue.Queue()
+        self._pending_saves = {}  # title -> [questions, [(on_done, on_error), ...]] not yet written
+        self._lock = threading.Lock()
+        self._outstanding = 0  # Jobs whose completion has not been delivered; Tk thread only
+        self._polling = False
+        self._thread = threading.Thread(target=self._run, name="quiz-store-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, func, *args, on_done=None, on_error=None):
+        """Run ``func(*args)`` on the worker; ``on_done(result)`` or ``on_error(exc)`` runs on the Tk thread."""
+        self._jobs.put((func, args, [(on_done, on_error)]))
+        self._started()
+
+    def save(self, title, questions, on_done=None, on_error=None):
+        """Queue a quiz save, replacing any save of the same title that has not started yet."""
+        with self._lock:
+            pending = self._pending_saves.get(title)
+            if pending is not None:
+                pending[0] = questions
+                pending[1].append((on_done, on_error))
+                return
+            self._pending_saves[title] = [questions, [(on_done, on_error)]]
+        self._jobs.put((None, (title,), None))
+        self._started()
+
+    def finish_attempt(self, attempt, on_done=None, on_error=None):
+        self.submit(self.store.finish_attempt, attempt, on_done=on_done, on_error=on_error)
+
+    def close(self, timeout=5.0):
+        """Let queued work finish, waiting at most ``timeout`` seconds (None: no limit); returns whether it all finished."""
+        self._jobs.put(None)
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            func, args, callbacks = job
+            if callbacks is None:
+                # A queued save: write whichever copy of the quiz is newest by now
+                title = args[0]
+                with self._lock:
+                    questions, callbacks = self._pending_saves.pop(title)
+                func, args = self.store.save, (title, questions)
+            try:
+                result = func(*args)
+            except Exception as e:
+                self._completions.put((callbacks, None, e))
+            else:
+                self._completions.put((callbacks, result, None))
+
+    def _started(self):
+        self._outstanding += 1
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.POLL_MS, self._poll)
+
+    def _poll(self):
+        """Deliver finished work on the Tk thread; keeps polling while anything is outstanding."""
+        while True:
+            try:
+                callbacks, result, error = self._completions.get_nowait()
+            except queue.Empty:
+                break
+            self._outstanding -= 1
+            for on_done, on_error in callbacks:
+                if error is None:
+                    if on_done is not None:
+                        on_done(result)
+                elif on_error is not None:
+                    on_error(error)
+                elif self.on_error is not None:
+                    self.on_error(error)
+        if self._outstanding > 0:
+            self.root.after(self.POLL_MS, self._poll)
+        else:
+            self._polling = False
+
+
+class StallProbe:
+    """Schedules a callback every ``interval_ms`` and records how late each one runs."""
+
+    def __init__(self, root, interval_ms=10, samples=10000):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.lateness = collections.deque(maxlen=samples)  # Seconds each tick ran late
+        self._expected = None
+        self._after_id = None
+
+    def start(self):
+        self._expected = time.monotonic() + self.interval_ms / 1000
+        self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _tick(self):
+        now = time.monotonic()
+        lateness = max(0.0, now - self._expected)
+        self.lateness.append(lateness)
+        if QuizMetrics.enabled:
+            QuizMetrics.observe("quizify_mainloop_lateness_seconds", lateness)
+        self._expected = now + self.interval_ms / 1000
+        self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def stats(self):
+        """Return tick count and p50/p99/max lateness in milliseconds."""
+        samples = sorted(self.lateness)
+        if not samples:
+            return {"ticks": 0, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        return {
+            "ticks": len(samples),
+            "p50_ms": samples[len(samples) // 2] * 1000,
+            "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000,
+            "max_ms": samples[-1] * 1000,
+        }
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
-import json
+
+from QuizStorage import JsonQuizStore
 
 class QuizifyApp:
     def __init__(self, root):
@@ -9,7 +10,9 @@ class QuizifyApp:
         self.root.geometry("800x600")
         self.root.config(bg="#F4F4F4")
 
-        self.quizzes = {}
+        self.quizzes = {}  # Quizzes created this session, by title
+        self.store = None  # Per-quiz JSON storage, opened by load_data
+        self.store_error = None  # Why the store last failed to open
         self.current_quiz = None
         self.correct_answers = 0
         self.wrong_answers = 0
@@ -18,7 +21,8 @@ class QuizifyApp:
         self.user_type = None  # Track whether the user is a "Student" or "Teacher"
 
         self.create_initial_screen()
-        self.load_data()
+        if not self.load_data():
+            messagebox.showerror("Error", f"An error occurred while loading data: {self.store_error}")
 
         # Handle app closing
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -161,6 +165,19 @@ class QuizifyApp:
             })
 
         self.quizzes[quiz_title] = questions
+        if not self.load_data():
+            messagebox.showerror(
+                "Save Failed",
+                f"Quiz '{quiz_title}' could not be saved because the quiz storage could not be opened "
+                f"({self.store_error}). It is kept for this session; use Save & Exit to try again.",
+            )
+            self.create_homepage()
+            return
+        try:
+            self.store.save(quiz_title, questions)
+        except Exception as e:
+            messagebox.showerror("Save Failed", f"Error saving quiz: {e}")
+            return
         messagebox.showinfo("Quiz Created", f"Quiz '{quiz_title}' created successfully!")
         self.create_homepage()
 
@@ -169,22 +186,38 @@ class QuizifyApp:
         messagebox.showinfo("Feature Coming Soon", "Take Quiz functionality is not implemented yet!")
 
     def save_data(self):
-        """Save quizzes to a file."""
-        try:
-            with open("quizzes.json", "w") as file:
-                json.dump(self.quizzes, file)
+        """Save any quizzes that are not stored yet, then quit; asks first if they could not be saved."""
+        error = None
+        if not self.load_data():
+            error = self.store_error
+        else:
+            try:
+                for title, questions in self.quizzes.items():
+                    if title not in self.store:
+                        self.store.save(title, questions)
+            except Exception as e:
+                error = e
+        if error is None:
             messagebox.showinfo("Save Successful", "Data has been saved successfully!")
-        except Exception as e:
-            messagebox.showerror("Save Failed", f"Error saving data: {e}")
+        elif not messagebox.askyesno(
+            "Save Failed", f"Error saving data: {error}\nQuizzes that were not saved will be lost. Quit anyway?"
+        ):
+            return
         self.root.quit()
 
     def load_data(self):
-        """Load quizzes from a file."""
-        try:
-            with open("quizzes.json", "r") as file:
-                self.quizzes = json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            pass
+        """Open the quiz store unless it is open already; returns False if it cannot be opened.
+
+        Questions are loaded only when a quiz is needed. Opening is retried
+        on the next call after a failure, whose reason is kept in store_error.
+        """
+        if self.store is None:
+            try:
+                self.store = JsonQuizStore()
+            except (OSError, ValueError) as e:
+                self.store_error = e
+                return False
+        return True
 
     def on_closing(self):
         """Handle app closing."""
@@ -0,0 +1,84 @@
+"""Stream recorded quiz results to CSV or Parquet.
+
+Rows come from ``QuizStore.iter_results`` one at a time, so exports run in
+constant memory however many attempts are stored. Parquet export needs the
+optional ``pyarrow`` package.
+
+    python ResultsExport.py --backend sqlite --path quizify.db --quiz "Science Quiz" results.csv
+"""
+import argparse
+import csv
+import itertools
+
+from QuizStorage import RESULT_COLUMNS, open_store
+
+
+def export_csv(rows, path):
+    """Write result rows to a CSV file with a header row; returns the number of rows written."""
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(RESULT_COLUMNS)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def export_parquet(rows, path, batch_size=50000):
+    """Write result rows to a Parquet file in row groups of ``batch_size``; returns the number of rows written."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export needs the pyarrow package (pip install pyarrow)") from None
+
+    schema = pa.schema([
+        ("attempt_id", pa.int64()),
+        ("quiz_title", pa.string()),
+        ("student_name", pa.string()),
+        ("section", pa.string()),
+        ("started_at", pa.float64()),
+        ("finished_at", pa.float64()),
+        ("score", pa.int64()),
+        ("question_count", pa.int64()),
+        ("question_index", pa.int64()),
+        ("answer", pa.string()),
+        ("correct", pa.int8()),
+        ("answered_at", pa.float64()),
+    ])
+    count = 0
+    rows = iter(rows)
+    with pq.ParquetWriter(path, schema) as writer:
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            columns = [list(column) for column in zip(*batch)]
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+            count += len(batch)
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export recorded quiz results.")
+    parser.add_argument("output", help="output file; .parquet writes Parquet, anything else CSV")
+    parser.add_argument("--backend", default="json", choices=["json", "sqlite"])
+    parser.add_argument("--path", help="quiz store directory or database file")
+    parser.add_argument("--quiz", help="only export attempts at this quiz title")
+    args = parser.parse_args()
+
+    store = open_store(args.backend, args.path)
+    try:
+        rows = store.iter_results(args.quiz)
+        if args.output.endswith(".parquet"):
+            count = export_parquet(rows, args.output)
+        else:
+            count = export_csv(rows, args.output)
+    finally:
+        store.close()
+    print(f"Exported {count} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
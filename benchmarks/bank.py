@@ -0,0 +1,55 @@
+"""Synthetic question banks in the Tk app format, for benchmarks.
+
+    bank = generate_bank(quizzes=200, questions_per_quiz=25, option_words=3,
+                         type_mix={"Multiple Choice": 0.7, "True/False": 0.2, "Short Answer": 0.1})
+"""
+import random
+
+DEFAULT_TYPE_MIX = {"Multiple Choice": 0.7, "True/False": 0.2, "Short Answer": 0.1}
+
+WORDS = (
+    "atom cell energy force gravity mass orbit planet river ocean desert forest volcano "
+    "empire treaty kingdom revolution parliament fraction equation triangle vector matrix "
+    "poem novel verb noun clause theorem protein enzyme climate current circuit magnet"
+).split()
+
+
+def _words(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def generate_question(rng, question_type, number, question_words=10, option_words=3, option_count=4):
+    """Build one question of the given type."""
+    text = f"{number}. {_words(rng, question_words)}?"
+    if question_type == "Multiple Choice":
+        options = [f"{chr(65 + index)}) {_words(rng, option_words)}" for index in range(option_count)]
+        return {"type": question_type, "question": text, "options": options,
+                "correct_answer": rng.choice(options)}
+    if question_type == "True/False":
+        return {"type": question_type, "question": text, "correct_answer": rng.choice(["True", "False"])}
+    return {"type": question_type, "question": text, "correct_answer": _words(rng, option_words)}
+
+
+def generate_bank(quizzes=100, questions_per_quiz=20, question_words=10, option_words=3, option_count=4,
+                  type_mix=None, seed=1):
+    """Return ``{title: questions}`` with question types drawn from ``type_mix`` (type -> weight)."""
+    rng = random.Random(seed)
+    type_mix = type_mix or DEFAULT_TYPE_MIX
+    types, weights = list(type_mix), list(type_mix.values())
+    bank = {}
+    for quiz in range(quizzes):
+        bank[f"Quiz {quiz}: {_words(rng, 2)}"] = [
+            generate_question(rng, rng.choices(types, weights)[0], number + 1, question_words, option_words,
+                              option_count)
+            for number in range(questions_per_quiz)
+        ]
+    return bank
+
+
+def parse_type_mix(text):
+    """Parse ``"Multiple Choice=0.7,True/False=0.3"`` into a type -> weight dict."""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight)
+    return mix
@@ -0,0 +1,57 @@
+"""Measure how BulkGrading scales with worker processes.
+
+Writes ``--students`` answer files for one synthetic quiz, then grades the
+directory with 1, 2, 4, ... workers up to the number of cores. Run from the
+repository root:
+
+    python -m benchmarks.bulk_grading --students 20000 --questions 50
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from BulkGrading import grade_directory
+
+from benchmarks.bank import generate_bank
+
+
+def write_submissions(directory, questions, students, seed=4):
+    rng = random.Random(seed)
+    for student in range(students):
+        answers = [rng.choice(question.get("options") or ["True", "False", question["correct_answer"]])
+                   for question in questions]
+        with open(os.path.join(directory, f"student-{student:06d}.json"), "w", encoding="utf-8") as file:
+            json.dump({"student_name": f"Student {student}", "section": "A", "answers": answers}, file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    questions = next(iter(generate_bank(1, args.questions).values()))
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= args.max_workers:
+        worker_counts.append(worker_counts[-1] * 2)
+    if worker_counts[-1] != args.max_workers:
+        worker_counts.append(args.max_workers)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_submissions(tmp, questions, args.students)
+        baseline = None
+        for workers in worker_counts:
+            started = time.perf_counter()
+            graded = sum(1 for _ in grade_directory(questions, tmp, workers))
+            elapsed = time.perf_counter() - started
+            baseline = baseline or elapsed
+            print(f"{workers:3d} workers  {graded} files  {elapsed:7.2f} s  "
+                  f"{graded / elapsed:9.0f} files/s  speedup {baseline / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Stress test QuizifyDatabase with concurrent readers and writers.
+
+Run from the repository root:
+
+    python -m benchmarks.db_concurrency --readers 30 --writers 2 --seconds 10
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from DatabaseAPP import QuizifyDatabase
+
+
+def make_quiz(index, question_count):
+    """Build a synthetic quiz in the QuizifyDatabase question format."""
+    return {
+        'title': f'Stress Quiz {index}',
+        'questions': [
+            {
+                'question': f'Question {index}.{q}?',
+                'options': [f'Option {o}' for o in range(4)],
+                'correct_option': q % 4 + 1,
+            }
+            for q in range(question_count)
+        ],
+    }
+
+
+def run(readers, writers, seconds, quizzes, questions):
+    """Hammer a fresh pooled database and return per-role throughput."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = QuizifyDatabase(os.path.join(tmp, 'stress.db'), pooled=True)
+        db.import_quizzes(make_quiz(i, questions) for i in range(quizzes))
+        quiz_ids = [quiz_id for quiz_id, _ in db.get_all_quizzes()]
+
+        counts = {'reads': 0, 'writes': 0, 'errors': 0}
+        latencies = {'reads': [], 'writes': []}
+        lock = threading.Lock()
+        stop = threading.Event()
+
+        def worker(role):
+            rng = random.Random()
+            local_latencies = []
+            errors = 0
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    if role == 'reads':
+                        db.get_quiz_by_id(rng.choice(quiz_ids))
+                    else:
+                        db.save_quiz(**make_quiz(rng.randrange(10 ** 6), questions))
+                except Exception:
+                    errors += 1
+                    continue
+                local_latencies.append(time.perf_counter() - started)
+            with lock:
+                counts[role] += len(local_latencies)
+                counts['errors'] += errors
+                latencies[role].extend(local_latencies)
+
+        threads = [threading.Thread(target=worker, args=('reads',)) for _ in range(readers)]
+        threads += [threading.Thread(target=worker, args=('writes',)) for _ in range(writers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        db.close()
+
+    results = {'errors': counts['errors']}
+    for role in ('reads', 'writes'):
+        samples = sorted(latencies[role])
+        results[role] = {
+            'ops': counts[role],
+            'ops_per_sec': counts[role] / seconds,
+            'p50_ms': samples[len(samples) // 2] * 1000 if samples else None,
+            'p99_ms': samples[int(len(samples) * 0.99)] * 1000 if samples else None,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--readers', type=int, default=30)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--quizzes', type=int, default=200)
+    parser.add_argument('--questions', type=int, default=50)
+    args = parser.parse_args()
+
+    results = run(args.readers, args.writers, args.seconds, args.quizzes, args.questions)
+    for role in ('reads', 'writes'):
+        r = results[role]
+        p50 = f"{r['p50_ms']:.2f}" if r['p50_ms'] is not None else '-'
+        p99 = f"{r['p99_ms']:.2f}" if r['p99_ms'] is not None else '-'
+        print(f"{role:>6}: {r['ops']:>8} ops  {r['ops_per_sec']:>10.1f} ops/s  p50 {p50} ms  p99 {p99} ms")
+    print(f"errors: {results['errors']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""Load-test QuizServer with many simulated students over keep-alive connections.
+
+Without --url a server is started in-process on a temporary quiz bank.
+Run from the repository root:
+
+    python -m benchmarks.http_load --students 40 --rounds 5
+    python -m benchmarks.http_load --url http://127.0.0.1:8080 --quiz "Science Quiz"
+"""
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from urllib.parse import quote, urlsplit
+
+from QuizServer import QuizServer
+from QuizStorage import JsonQuizStore
+
+
+class Client:
+    """A minimal HTTP/1.1 keep-alive JSON client."""
+
+    def __init__(self, host, port, latencies):
+        self.host = host
+        self.port = port
+        self.latencies = latencies
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, payload=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode() if payload is not None else b""
+        started = time.perf_counter()
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        await self.writer.drain()
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        status = int(head.split(b" ", 2)[1])
+        length = 0
+        for line in head.split(b"\r\n"):
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":", 1)[1])
+        data = json.loads(await self.reader.readexactly(length))
+        self.latencies.append(time.perf_counter() - started)
+        return status, data
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+
+
+async def student(host, port, title, rounds, latencies, errors):
+    client = Client(host, port, latencies)
+    try:
+        for _ in range(rounds):
+            await client.request("GET", "/quizzes")
+            status, quiz = await client.request("GET", f"/quizzes/{quote(title, safe='')}")
+            status, started = await client.request("POST", "/attempts", {"quiz": title, "student_name": "Load Test"})
+            if status != 201:
+                errors.append(started)
+                continue
+            attempt = started["attempt_id"]
+            for index, question in enumerate(quiz["questions"]):
+                answer = (question.get("options") or ["True"])[0]
+                status, _ = await client.request(
+                    "POST", f"/attempts/{attempt}/answers", {"question_index": index, "answer": answer}
+                )
+                if status != 200:
+                    errors.append(status)
+            await client.request("POST", f"/attempts/{attempt}/finish")
+    finally:
+        await client.close()
+
+
+def make_bank(directory, questions):
+    store = JsonQuizStore(directory, legacy_file=None)
+    store.save("Load Test Quiz", [
+        {
+            "type": "Multiple Choice",
+            "question": f"Question {index}?",
+            "options": ["A", "B", "C", "D"],
+            "correct_answer": "B",
+        }
+        for index in range(questions)
+    ])
+    return "Load Test Quiz"
+
+
+async def run(args):
+    server = None
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.url:
+            parts = urlsplit(args.url)
+            host, port, title = parts.hostname, parts.port or 80, args.quiz
+        else:
+            title = make_bank(tmp, args.questions)
+            server = QuizServer(lambda: JsonQuizStore(tmp, legacy_file=None))
+            listener = await server.start("127.0.0.1", 0)
+            host, port = listener.sockets[0].getsockname()[:2]
+
+        latencies, errors = [], []
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            student(host, port, title, args.rounds, latencies, errors) for _ in range(args.students)
+        ))
+        elapsed = time.perf_counter() - started
+        if server is not None:
+            await server.close()
+
+    latencies.sort()
+    print(f"students {args.students}  requests {len(latencies)}  errors {len(errors)}  in {elapsed:.2f}s")
+    print(f"throughput {len(latencies) / elapsed:.0f} req/s")
+    if latencies:
+        print(f"latency p50 {latencies[len(latencies) // 2] * 1000:.2f} ms  "
+              f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="an already running server; default starts one in-process")
+    parser.add_argument("--quiz", help="quiz title to take (with --url)")
+    parser.add_argument("--students", type=int, default=40)
+    parser.add_argument("--rounds", type=int, default=5, help="attempts per student")
+    parser.add_argument("--questions", type=int, default=20, help="questions in the generated quiz")
+    args = parser.parse_args()
+    if args.url and not args.quiz:
+        parser.error("--quiz is required with --url")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
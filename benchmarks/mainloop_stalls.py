@@ -0,0 +1,78 @@
+"""Measure how long the Tk main loop freezes while quizzes are saved.
+
+A StallProbe ticks every few milliseconds while a large quiz is saved
+repeatedly, first directly on the Tk thread (as the app used to) and then
+through StoreWorker. Needs a display; run from the repository root:
+
+    python -m benchmarks.mainloop_stalls --questions 20000 --saves 10
+"""
+import argparse
+import tempfile
+import tkinter as tk
+
+from QuizStorage import open_store
+from QuizWorker import StallProbe, StoreWorker
+
+
+def make_quiz(question_count):
+    return [
+        {
+            "type": "Multiple Choice",
+            "question": f"Question {index}?",
+            "options": [f"Option {index}.{option}" for option in range(4)],
+            "correct_answer": f"Option {index}.0",
+        }
+        for index in range(question_count)
+    ]
+
+
+def run(root, save, saves, interval_ms=100):
+    """Call ``save`` ``saves`` times from Tk callbacks and return the probe's stats."""
+    probe = StallProbe(root)
+    probe.start()
+    remaining = [saves]
+
+    def step():
+        if remaining[0] == 0:
+            # Let queued background work drain before stopping
+            root.after(1000, root.quit)
+            return
+        remaining[0] -= 1
+        save()
+        root.after(interval_ms, step)
+
+    root.after(interval_ms, step)
+    root.mainloop()
+    probe.stop()
+    return probe.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", default="json", choices=["json", "sqlite"])
+    parser.add_argument("--questions", type=int, default=20000)
+    parser.add_argument("--saves", type=int, default=10)
+    args = parser.parse_args()
+
+    root = tk.Tk()
+    root.withdraw()
+    questions = make_quiz(args.questions)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = f"{tmp}/quizify.db" if args.backend == "sqlite" else tmp
+        store = open_store(args.backend, path, threaded=True)
+        try:
+            before = run(root, lambda: store.save("Big Quiz", questions), args.saves)
+            worker = StoreWorker(root, store)
+            after = run(root, lambda: worker.save("Big Quiz", questions), args.saves)
+            worker.close(timeout=None)
+        finally:
+            store.close()
+    root.destroy()
+
+    for name, stats in [("save on Tk thread", before), ("StoreWorker", after)]:
+        print(f"{name:<18} ticks {stats['ticks']:5d}  p50 {stats['p50_ms']:7.1f} ms  "
+              f"p99 {stats['p99_ms']:7.1f} ms  max {stats['max_ms']:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
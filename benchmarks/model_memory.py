@@ -0,0 +1,76 @@
+"""Compare the memory held by a question bank as dicts, as Question objects and as a QuestionBank.
+
+Each representation is built from the same JSON text, the way quizzes are
+read from disk, and measured with tracemalloc once only it remains alive.
+Run from the repository root:
+
+    python -m benchmarks.model_memory --questions 50000
+"""
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+
+from QuizModel import Question, QuestionBank
+
+QUESTION_TYPES = ["Multiple Choice", "Multiple Choice", "True/False", "Short Answer"]
+
+
+def make_bank_json(count, seed=1):
+    """Serialize a synthetic bank of ``count`` questions in the Tk app format."""
+    rng = random.Random(seed)
+    questions = []
+    for index in range(count):
+        question_type = rng.choice(QUESTION_TYPES)
+        question = {"type": question_type, "question": f"Question {index}: what is {rng.random():.6f}?"}
+        if question_type == "Multiple Choice":
+            question["options"] = [f"Answer {index}.{option}" for option in range(4)]
+            question["correct_answer"] = question["options"][rng.randrange(4)]
+        elif question_type == "True/False":
+            question["correct_answer"] = rng.choice(["True", "False"])
+        else:
+            question["correct_answer"] = f"answer {index}"
+        questions.append(question)
+    return json.dumps(questions)
+
+
+def measure(build, text):
+    """Return (bytes retained, seconds) for building one representation from JSON text."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    value = build(text)
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del value
+    return retained, elapsed
+
+
+REPRESENTATIONS = {
+    "dicts": json.loads,
+    "Question objects": lambda text: [Question.from_dict(question) for question in json.loads(text)],
+    "QuestionBank": lambda text: QuestionBank.from_dicts(json.loads(text)),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=50000)
+    args = parser.parse_args()
+
+    text = make_bank_json(args.questions)
+    print(f"{args.questions} questions, {len(text) / 1e6:.1f} MB of JSON")
+    baseline = None
+    for name, build in REPRESENTATIONS.items():
+        retained, elapsed = measure(build, text)
+        baseline = baseline or retained
+        print(f"{name:<18} {retained / 1e6:8.2f} MB  {retained / args.questions:6.0f} B/question  "
+              f"{retained / baseline:5.0%} of dicts  built in {elapsed * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
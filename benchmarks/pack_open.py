@@ -0,0 +1,82 @@
+"""Compare opening a large bank as a quiz pack with parsing it from quizzes.json.
+
+Each side opens the bank and reads one question from a random quiz. Peak
+memory is the Python heap measured with tracemalloc; pages of a memory-mapped
+pack are page cache, not heap. Run from the repository root:
+
+    python -m benchmarks.pack_open --questions 200000
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from QuizPack import QuizPack, write_pack
+
+
+def make_bank(question_count, quiz_size=50, seed=1):
+    """Build a synthetic ``{title: questions}`` bank in the Tk app format."""
+    rng = random.Random(seed)
+    bank = {}
+    for index in range(question_count):
+        options = [f"Answer {index}.{option}" for option in range(4)]
+        bank.setdefault(f"Quiz {index // quiz_size}", []).append({
+            "type": "Multiple Choice",
+            "question": f"Question {index}: what is {rng.random():.6f}?",
+            "options": options,
+            "correct_answer": rng.choice(options),
+        })
+    return bank
+
+
+def measure(open_and_read):
+    """Return (seconds, peak heap bytes) for one call."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    open_and_read()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=200000)
+    args = parser.parse_args()
+
+    bank = make_bank(args.questions)
+    title = random.choice(list(bank))
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "quizzes.json")
+        pack_path = os.path.join(tmp, "bank.qpk")
+        with open(json_path, "w", encoding="utf-8") as file:
+            json.dump(bank, file)
+        write_pack(pack_path, bank)
+        del bank
+
+        def read_json():
+            with open(json_path, "r", encoding="utf-8") as file:
+                return json.load(file)[title][7]
+
+        def read_pack(verify):
+            with QuizPack(pack_path, verify=verify) as pack:
+                return pack.quiz(title)[7]
+
+        assert read_json() == read_pack(True)
+        print(f"{args.questions} questions: quizzes.json {os.path.getsize(json_path) / 1e6:.1f} MB, "
+              f"pack {os.path.getsize(pack_path) / 1e6:.1f} MB")
+        for name, run in [
+            ("json.load", read_json),
+            ("pack + checksum", lambda: read_pack(True)),
+            ("pack, no checksum", lambda: read_pack(False)),
+        ]:
+            elapsed, peak = measure(run)
+            print(f"{name:<18} open + read one question {elapsed * 1000:8.1f} ms  peak heap {peak / 1e6:7.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""Benchmark storage, grading and question rendering on a synthetic bank, with JSON output.
+
+Each case runs ``--repeat`` times and reports its best and median time.
+Results are written as JSON so two runs can be compared:
+
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --compare baseline.json --tolerance 0.2
+
+With ``--compare``, any case whose best time per operation grew by more than
+``--tolerance`` is listed and the exit status is 1. Tk rendering and
+startup need a display (a virtual one such as Xvfb works) and are skipped
+without one. ``import_app`` is the cumulative time ``python -X importtime``
+reports for importing App23 in a fresh interpreter.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from DatabaseAPP import QuizifyDatabase
+from QuizGrader import compile_answer_key, grade_batch
+from QuizStorage import JsonQuizStore, app_question_to_db
+
+from benchmarks.bank import DEFAULT_TYPE_MIX, generate_bank, parse_type_mix
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Skip(Exception):
+    """Raised by a case that cannot run in this environment."""
+
+
+def db_bank(bank):
+    return [(title, [app_question_to_db(question) for question in questions]) for title, questions in bank.items()]
+
+
+def case_db_import(bank, tmp):
+    db = QuizifyDatabase(os.path.join(tmp, "import.db"))
+    rows = db_bank(bank)
+    started = time.perf_counter()
+    db.import_quizzes(rows)
+    elapsed = time.perf_counter() - started
+    db.close()
+    return len(rows), elapsed
+
+
+def case_db_save_quiz(bank, tmp):
+    db = QuizifyDatabase(os.path.join(tmp, "save.db"))
+    rows = db_bank(bank)
+    started = time.perf_counter()
+    for title, questions in rows:
+        db.save_quiz(title, questions)
+    elapsed = time.perf_counter() - started
+    db.close()
+    return len(rows), elapsed
+
+
+def _lookup(bank, tmp, cache_entries):
+    db = QuizifyDatabase(os.path.join(tmp, f"lookup-{cache_entries}.db"), cache_entries=cache_entries)
+    db.import_quizzes(db_bank(bank))
+    quiz_ids = [quiz_id for quiz_id, _ in db.get_all_quizzes()]
+    rng = random.Random(2)
+    lookups = [rng.choice(quiz_ids) for _ in range(len(quiz_ids) * 5)]
+    started = time.perf_counter()
+    for quiz_id in lookups:
+        db.get_quiz_by_id(quiz_id)
+    elapsed = time.perf_counter() - started
+    db.close()
+    return len(lookups), elapsed
+
+
+def case_db_lookup_uncached(bank, tmp):
+    return _lookup(bank, tmp, cache_entries=0)
+
+
+def case_db_lookup_cached(bank, tmp):
+    return _lookup(bank, tmp, cache_entries=128)
+
+
+def case_db_delete(bank, tmp):
+    db = QuizifyDatabase(os.path.join(tmp, "delete.db"))
+    db.import_quizzes(db_bank(bank))
+    quiz_ids = [quiz_id for quiz_id, _ in db.get_all_quizzes()]
+    started = time.perf_counter()
+    for quiz_id in quiz_ids:
+        db.delete_quiz(quiz_id)
+    elapsed = time.perf_counter() - started
+    db.close()
+    return len(quiz_ids), elapsed
+
+
+def case_json_save(bank, tmp):
+    store = JsonQuizStore(os.path.join(tmp, "json-save"), legacy_file=None)
+    started = time.perf_counter()
+    for title, questions in bank.items():
+        store.save(title, questions)
+    return len(bank), time.perf_counter() - started
+
+
+def case_json_load(bank, tmp):
+    directory = os.path.join(tmp, "json-load")
+    store = JsonQuizStore(directory, legacy_file=None)
+    for title, questions in bank.items():
+        store.save(title, questions)
+    started = time.perf_counter()
+    # Open the store as the app does at startup, then load every quiz
+    store = JsonQuizStore(directory, legacy_file=None)
+    for title in store.titles():
+        store.load(title)
+    return len(bank), time.perf_counter() - started
+
+
+def case_grading(bank, tmp):
+    rng = random.Random(3)
+    submissions = 0
+    elapsed = 0.0
+    for questions in bank.values():
+        answers = [
+            [rng.choice(question.get("options") or ["True", "False", question["correct_answer"] or ""])
+             for question in questions]
+            for _ in range(20)
+        ]
+        started = time.perf_counter()
+        key = compile_answer_key(questions)
+        for _ in grade_batch(key, answers):
+            submissions += 1
+        elapsed += time.perf_counter() - started
+    return submissions, elapsed
+
+
+def case_tk_render(bank, tmp):
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:
+        raise Skip(f"no display for Tk ({e})") from None
+    try:
+        root.withdraw()
+        from App23 import QuizifyApp
+        from QuizModel import QuestionBank
+
+        app = QuizifyApp(root, storage_backend="json", storage_path=os.path.join(tmp, "tk"))
+        app.user_details = {"name": "Benchmark", "section": "A"}
+        transitions = 0
+        started = time.perf_counter()
+        for title, questions in list(bank.items())[:20]:
+            app.quizzes[title] = QuestionBank.from_dicts(questions)
+            app.start_quiz(title)
+            for index in range(len(app.current_quiz)):
+                app.current_question_index = index
+                app.show_question()
+                root.update_idletasks()
+                transitions += 1
+            app.timer.cancel()
+        elapsed = time.perf_counter() - started
+        app.worker.close()
+        app.store.close()
+        return transitions, elapsed
+    finally:
+        root.destroy()
+
+
+def case_import_app(bank, tmp):
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import App23"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    # Lines read "import time: self [us] | cumulative | module", innermost imports first
+    for line in completed.stderr.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == "App23":
+            return 1, int(fields[1]) / 1e6
+    raise RuntimeError("App23 missing from -X importtime output")
+
+
+def case_tk_startup(bank, tmp):
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:
+        raise Skip(f"no display for Tk ({e})") from None
+    try:
+        from App23 import QuizifyApp
+
+        # Until the first screen is drawn; the store opens after that
+        started = time.perf_counter()
+        app = QuizifyApp(root, storage_backend="json", storage_path=os.path.join(tmp, "tk"))
+        root.update_idletasks()
+        elapsed = time.perf_counter() - started
+        app.load_data()
+        app.worker.close()
+        app.store.close()
+        return 1, elapsed
+    finally:
+        root.destroy()
+
+
+CASES = {
+    "db_import": case_db_import,
+    "db_save_quiz": case_db_save_quiz,
+    "db_lookup_uncached": case_db_lookup_uncached,
+    "db_lookup_cached": case_db_lookup_cached,
+    "db_delete": case_db_delete,
+    "json_save": case_json_save,
+    "json_load": case_json_load,
+    "grading": case_grading,
+    "tk_render": case_tk_render,
+    "import_app": case_import_app,
+    "tk_startup": case_tk_startup,
+}
+
+
+def run_case(func, bank, repeat):
+    """Run one case ``repeat`` times, each in a fresh directory; returns its result dict."""
+    times = []
+    ops = 0
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            ops, elapsed = func(bank, tmp)
+        times.append(elapsed)
+    best = min(times)
+    return {
+        "ops": ops,
+        "best_seconds": best,
+        "median_seconds": statistics.median(times),
+        "per_op_us": best / ops * 1e6 if ops else None,
+        "ops_per_sec": ops / best if best > 0 else None,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Return (name, baseline us per op, current us per op) for cases slower than the baseline allows."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get("results", {}).get(name, {}).get("per_op_us")
+        after = result.get("per_op_us")
+        if before and after and after > before * (1 + tolerance):
+            regressions.append((name, before, after))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quizzes", type=int, default=200)
+    parser.add_argument("--questions", type=int, default=25, help="questions per quiz")
+    parser.add_argument("--question-words", type=int, default=10)
+    parser.add_argument("--option-words", type=int, default=3, help="words per option")
+    parser.add_argument("--type-mix", type=parse_type_mix,
+                        default=DEFAULT_TYPE_MIX, help='e.g. "Multiple Choice=0.7,True/False=0.2,Short Answer=0.1"')
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", action="append", choices=sorted(CASES), help="run only these cases")
+    parser.add_argument("--output", help="write results JSON here instead of stdout")
+    parser.add_argument("--compare", help="baseline results JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown per operation")
+    args = parser.parse_args()
+
+    bank = generate_bank(args.quizzes, args.questions, args.question_words, args.option_words,
+                         type_mix=args.type_mix)
+    results = {}
+    for name in args.only or CASES:
+        try:
+            results[name] = run_case(CASES[name], bank, args.repeat)
+        except Skip as e:
+            results[name] = {"skipped": str(e)}
+        result = results[name]
+        if "skipped" in result:
+            print(f"{name:<20} skipped: {result['skipped']}", file=sys.stderr)
+        else:
+            print(f"{name:<20} {result['ops']:7d} ops  {result['per_op_us']:10.1f} us/op  "
+                  f"{result['ops_per_sec']:12.0f} ops/s", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sqlite": sqlite3.sqlite_version,
+            "params": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before:.1f} -> {after:.1f} us/op", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
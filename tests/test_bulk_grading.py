@@ -0,0 +1,101 @@
+import csv
+import json
+import os
+import sys
+
+import pytest
+
+import BulkGrading
+from BulkGrading import Summary, format_report, grade_directory
+
+QUESTIONS = [
+    {"type": "Multiple Choice", "question": "Water?", "options": ["H2O", "CO2"], "correct_answer": "H2O"},
+    {"type": "True/False", "question": "The sun is a star.", "correct_answer": "True"},
+    {"type": "Short Answer", "question": "Capital of France?", "correct_answer": "Paris"},
+]
+
+
+@pytest.fixture
+def submissions(tmp_path):
+    directory = tmp_path / "submissions"
+    directory.mkdir()
+    (directory / "ada.txt").write_text("H2O\n\nParis\n", encoding="utf-8")
+    (directory / "grace.json").write_text(json.dumps(["CO2", "True", "paris"]), encoding="utf-8")
+    (directory / "linus.json").write_text(
+        json.dumps({"answers": ["H2O", "True", "Paris"], "student_name": "Linus T", "section": "B"}),
+        encoding="utf-8",
+    )
+    (directory / "broken.json").write_text("{not json", encoding="utf-8")
+    (directory / "wrong.json").write_text(json.dumps({"student_name": "No answers"}), encoding="utf-8")
+    (directory / "notes.md").write_text("ignored", encoding="utf-8")
+    (directory / ".hidden.json").write_text("[]", encoding="utf-8")
+    return directory
+
+
+def rows_by_name(rows):
+    return {row["student_name"]: row for row in rows}
+
+
+def test_submissions_are_graded_in_process(submissions):
+    rows = rows_by_name(grade_directory(QUESTIONS, str(submissions), workers=1))
+    assert set(rows) == {"ada", "grace", "Linus T", "broken", "wrong"}
+    assert (rows["ada"]["score"], rows["ada"]["correct"]) == (2, "101")
+    assert (rows["grace"]["score"], rows["grace"]["correct"]) == (2, "011")
+    assert (rows["Linus T"]["score"], rows["Linus T"]["section"], rows["Linus T"]["percent"]) == (3, "B", 100.0)
+
+
+def test_malformed_files_become_error_rows(submissions):
+    rows = rows_by_name(grade_directory(QUESTIONS, str(submissions), workers=1))
+    for name in ("broken", "wrong"):
+        assert rows[name]["error"]
+        assert rows[name]["score"] is None
+
+
+def test_process_pool_gives_the_same_rows(submissions):
+    in_process = sorted(grade_directory(QUESTIONS, str(submissions), workers=1), key=lambda row: row["file"])
+    pooled = sorted(grade_directory(QUESTIONS, str(submissions), workers=2, chunk_size=1),
+                    key=lambda row: row["file"])
+    assert pooled == in_process
+
+
+def test_summary_report(submissions):
+    summary = Summary(len(QUESTIONS))
+    for row in grade_directory(QUESTIONS, str(submissions), workers=1):
+        summary.add(row)
+    report = summary.report()
+    assert (report["graded"], report["failed"]) == (3, 2)
+    assert (report["min"], report["max"], report["median"]) == (2, 3, 2)
+    assert report["score_counts"] == {0: 0, 1: 0, 2: 2, 3: 1}
+    assert report["question_percent_correct"] == [66.7, 66.7, 100.0]
+    assert sorted(os.path.basename(error["file"]) for error in report["errors"]) == ["broken.json", "wrong.json"]
+    assert "Graded 3 submissions (2 failed), 3 questions" in format_report(report)
+
+
+def test_empty_summary_has_no_statistics():
+    report = Summary(3).report()
+    assert report["graded"] == 0
+    assert "mean" not in report
+    assert format_report(report) == "Graded 0 submissions (0 failed), 3 questions"
+
+
+def test_missing_submissions_directory_exits_with_a_message(tmp_path, monkeypatch):
+    bank = tmp_path / "quizzes.json"
+    bank.write_text(json.dumps({"Science": QUESTIONS}), encoding="utf-8")
+    monkeypatch.setattr(sys, "argv", ["BulkGrading.py", "--path", str(bank), "--quiz", "Science",
+                                      str(tmp_path / "missing")])
+    with pytest.raises(SystemExit) as exited:
+        BulkGrading.main()
+    assert "No submissions directory" in str(exited.value.code)
+
+
+def test_main_writes_csv_rows_and_a_json_summary(tmp_path, submissions, monkeypatch):
+    bank = tmp_path / "quizzes.json"
+    bank.write_text(json.dumps({"Science": QUESTIONS}), encoding="utf-8")
+    output, summary = tmp_path / "results.csv", tmp_path / "summary.json"
+    monkeypatch.setattr(sys, "argv", ["BulkGrading.py", "--path", str(bank), "--quiz", "Science", "--workers", "1",
+                                      "--output", str(output), "--summary", str(summary), str(submissions)])
+    BulkGrading.main()
+    with open(output, newline="", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert len(rows) == 5
+    assert json.loads(summary.read_text(encoding="utf-8"))["graded"] == 3
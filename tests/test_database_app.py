@@ -0,0 +1,345 @@
+import json
+import sqlite3
+
+import pytest
+
+import DatabaseAPP
+from DatabaseAPP import QuizifyDatabase
+from QuizModel import QuestionBank
+
+# The schema as it was before versioned migrations were introduced
+BASELINE_SCHEMA = '''
+CREATE TABLE quizzes (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL);
+CREATE TABLE questions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, quiz_id INTEGER, question TEXT NOT NULL, correct_option INTEGER,
+    FOREIGN KEY (quiz_id) REFERENCES quizzes(id)
+);
+CREATE TABLE options (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, question_id INTEGER, option_text TEXT NOT NULL,
+    FOREIGN KEY (question_id) REFERENCES questions(id)
+);
+'''
+
+
+def make_baseline_db(path):
+    """Create an unversioned database holding one quiz with two questions."""
+    conn = sqlite3.connect(path)
+    conn.executescript(BASELINE_SCHEMA)
+    conn.execute("INSERT INTO quizzes (title) VALUES ('Science Quiz')")
+    conn.execute("INSERT INTO questions (quiz_id, question, correct_option) VALUES (1, 'Water?', 1)")
+    conn.execute("INSERT INTO questions (quiz_id, question, correct_option) VALUES (1, 'Red planet?', 2)")
+    # Interleave the two questions' options so positions must follow id order within each question
+    for question_id, text in [(1, 'H2O'), (2, 'Earth'), (1, 'CO2'), (2, 'Mars'), (1, 'O2'), (2, 'Venus')]:
+        conn.execute('INSERT INTO options (question_id, option_text) VALUES (?, ?)', (question_id, text))
+    conn.commit()
+    conn.close()
+
+
+def sample_questions():
+    return [
+        {'question': 'Water?', 'options': ['H2O', 'CO2', 'O2'], 'correct_option': 1},
+        {'question': 'Red planet?', 'options': ['Earth', 'Mars', 'Venus'], 'correct_option': 2},
+    ]
+
+
+def count_rows(db, table):
+    db.cursor.execute(f'SELECT COUNT(*) FROM {table}')
+    return db.cursor.fetchone()[0]
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = QuizifyDatabase(str(tmp_path / 'quizify.db'))
+    yield database
+    database.close()
+
+
+def test_new_database_is_at_latest_version(db):
+    assert db.get_schema_version() == len(QuizifyDatabase.MIGRATIONS)
+
+
+def test_migrating_baseline_database_keeps_data(tmp_path):
+    path = str(tmp_path / 'old.db')
+    make_baseline_db(path)
+    db = QuizifyDatabase(path)
+    try:
+        assert db.get_schema_version() == len(QuizifyDatabase.MIGRATIONS)
+        quiz = db.get_quiz_by_id(1)
+        assert quiz['title'] == 'Science Quiz'
+        assert [question['options'] for question in quiz['questions']] == [
+            ['H2O', 'CO2', 'O2'], ['Earth', 'Mars', 'Venus'],
+        ]
+        db.cursor.execute('SELECT question_id, option_text, position FROM options ORDER BY id')
+        assert [row[2] for row in db.cursor.fetchall()] == [0, 0, 1, 1, 2, 2]
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize('statements', [
+    DatabaseAPP._NUMBER_OPTIONS_UPDATE_FROM, DatabaseAPP._NUMBER_OPTIONS_TEMP_TABLE,
+], ids=['update-from', 'temp-table'])
+def test_migration_numbers_options_on_old_and_new_sqlite(tmp_path, monkeypatch, statements):
+    if statements is DatabaseAPP._NUMBER_OPTIONS_UPDATE_FROM and sqlite3.sqlite_version_info < (3, 33, 0):
+        pytest.skip('UPDATE ... FROM needs SQLite 3.33')
+    migrations = list(QuizifyDatabase.MIGRATIONS)
+    migrations[1] = [migrations[1][0], *statements, *migrations[1][-2:]]
+    monkeypatch.setattr(QuizifyDatabase, 'MIGRATIONS', migrations)
+    path = str(tmp_path / 'old.db')
+    make_baseline_db(path)
+    db = QuizifyDatabase(path)
+    try:
+        db.cursor.execute('SELECT position FROM options ORDER BY id')
+        assert [row[0] for row in db.cursor.fetchall()] == [0, 0, 1, 1, 2, 2]
+    finally:
+        db.close()
+
+
+def test_upgrading_on_too_old_sqlite_fails_clearly(tmp_path, monkeypatch):
+    path = str(tmp_path / 'old.db')
+    make_baseline_db(path)
+    monkeypatch.setattr(sqlite3, 'sqlite_version_info', (3, 24, 0))
+    with pytest.raises(RuntimeError, match='needs SQLite 3.25.0 or later'):
+        QuizifyDatabase(path)
+
+
+def test_migration_backfills_content_hash(tmp_path):
+    path = str(tmp_path / 'old.db')
+    make_baseline_db(path)
+    db = QuizifyDatabase(path)
+    try:
+        db.cursor.execute('SELECT content_hash FROM questions ORDER BY id')
+        hashes = [row[0] for row in db.cursor.fetchall()]
+        expected = [QuizifyDatabase.question_hash(question) for question in sample_questions()]
+        assert hashes == expected
+    finally:
+        db.close()
+
+
+def test_migrations_create_indexes(db):
+    db.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    indexes = {row[0] for row in db.cursor.fetchall()}
+    assert {'idx_options_question_position', 'idx_quizzes_title', 'idx_questions_content_hash',
+            'idx_questions_body_hash', 'idx_quiz_questions_question'} <= indexes
+    assert 'idx_options_question_id' not in indexes
+    assert 'idx_questions_quiz_id' not in indexes
+
+
+def test_migration_shares_repeated_questions(tmp_path):
+    path = str(tmp_path / 'old.db')
+    make_baseline_db(path)
+    conn = sqlite3.connect(path)
+    # A second quiz repeating the first question
+    conn.execute("INSERT INTO quizzes (title) VALUES ('Chemistry')")
+    conn.execute("INSERT INTO questions (quiz_id, question, correct_option) VALUES (2, 'Water?', 1)")
+    for text in ['H2O', 'CO2', 'O2']:
+        conn.execute('INSERT INTO options (question_id, option_text) VALUES (3, ?)', (text,))
+    conn.commit()
+    conn.close()
+
+    db = QuizifyDatabase(path)
+    try:
+        assert count_rows(db, 'questions') == 2
+        assert count_rows(db, 'options') == 6
+        assert [q['question'] for q in db.get_quiz_by_id(2)['questions']] == ['Water?']
+        assert [q['options'] for q in db.get_quiz_by_id(1)['questions']] == [
+            ['H2O', 'CO2', 'O2'], ['Earth', 'Mars', 'Venus'],
+        ]
+        assert sorted(title for _, title in db.search_quizzes('water')) == ['Chemistry', 'Science Quiz']
+    finally:
+        db.close()
+
+
+def test_reopening_does_not_rerun_migrations(tmp_path):
+    path = str(tmp_path / 'quizify.db')
+    QuizifyDatabase(path).close()
+    db = QuizifyDatabase(path)
+    try:
+        assert db.get_schema_version() == len(QuizifyDatabase.MIGRATIONS)
+    finally:
+        db.close()
+
+
+def test_newer_schema_is_refused(tmp_path):
+    path = str(tmp_path / 'future.db')
+    QuizifyDatabase(path).close()
+    conn = sqlite3.connect(path)
+    conn.execute(f'PRAGMA user_version = {len(QuizifyDatabase.MIGRATIONS) + 1}')
+    conn.close()
+    with pytest.raises(RuntimeError):
+        QuizifyDatabase(path)
+
+
+def test_failed_migration_leaves_previous_version(tmp_path, monkeypatch):
+    path = str(tmp_path / 'quizify.db')
+    QuizifyDatabase(path).close()
+    latest = len(QuizifyDatabase.MIGRATIONS)
+    monkeypatch.setattr(QuizifyDatabase, 'MIGRATIONS', QuizifyDatabase.MIGRATIONS + [
+        ['CREATE TABLE extra (id INTEGER)', 'THIS IS NOT SQL'],
+    ])
+    with pytest.raises(sqlite3.OperationalError):
+        QuizifyDatabase(path)
+    conn = sqlite3.connect(path)
+    try:
+        assert conn.execute('PRAGMA user_version').fetchone()[0] == latest
+        assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'extra'").fetchone()[0] == 0
+    finally:
+        conn.close()
+
+
+def test_save_and_get_quiz_round_trip(db):
+    quiz_id = db.save_quiz('Science Quiz', sample_questions())
+    quiz = db.get_quiz_by_id(quiz_id)
+    assert quiz['title'] == 'Science Quiz'
+    assert [(q['question'], q['options'], q['correct_option']) for q in quiz['questions']] == [
+        (q['question'], q['options'], q['correct_option']) for q in sample_questions()
+    ]
+
+
+def test_save_attempt_keeps_delivered_questions_and_shuffle_settings(db):
+    db.save_attempt(None, 'Science Quiz', [True, False], 'Ada', finished_at=1.0, seed=5, delivered_count=2,
+                    question_indices=[0, 3], question_count=5, shuffle_questions=True, shuffle_options=False)
+    db.save_attempt(None, 'Science Quiz', [True] * 5, 'Grace', finished_at=2.0)
+    assert db.get_attempts('Science Quiz') == [
+        ('Ada', None, 1.0, b'\x01\x00', '[0, 3]', 5, 5, 2, 1, 0),
+        ('Grace', None, 2.0, b'\x01' * 5, None, None, None, None, None, None),
+    ]
+
+
+def test_public_getters_return_plain_dicts(db):
+    quiz_id = db.save_quiz('Science Quiz', sample_questions())
+    quiz = db.get_quiz_by_id(quiz_id)
+    assert isinstance(quiz['questions'], list)
+    assert json.loads(json.dumps(quiz))['questions'][1]['options'] == ['Earth', 'Mars', 'Venus']
+    # Every call gets its own dicts, even when the quiz comes from the cache
+    quiz['questions'][0]['question'] = 'Changed'
+    quiz['questions'][1]['options'].append('Pluto')
+    again = db.get_quiz_by_id(quiz_id)['questions']
+    assert (again[0]['question'], again[1]['options']) == ('Water?', ['Earth', 'Mars', 'Venus'])
+
+
+def test_cached_quizzes_are_not_converted_to_dicts_again(db, monkeypatch):
+    quiz_id = db.save_quiz('Science Quiz', sample_questions())
+    conversions = []
+    to_dicts = QuestionBank.to_dicts
+    monkeypatch.setattr(QuestionBank, 'to_dicts', lambda bank: conversions.append(bank) or to_dicts(bank))
+    first = db.get_quiz_by_id(quiz_id)
+    assert db.get_quiz_by_id(quiz_id) == first
+    assert len(conversions) == 1
+    # Invalidating the quiz drops the cached dicts along with the bank
+    db.cursor.execute("UPDATE questions SET question = 'H2O?' WHERE question = 'Water?'")
+    db.conn.commit()
+    db.cache.invalidate(quiz_id)
+    assert db.get_quiz_by_id(quiz_id)['questions'][0]['question'] == 'H2O?'
+    assert len(conversions) == 2
+
+
+def test_get_quiz_bank_returns_the_column_model(db):
+    quiz_id = db.save_quiz('Science Quiz', sample_questions())
+    bank = db.get_quiz_bank(quiz_id)['questions']
+    assert isinstance(bank, QuestionBank)
+    assert bank.to_dicts() == db.get_quiz_by_id(quiz_id)['questions']
+    assert db.get_quiz_bank(quiz_id + 1) is None
+
+
+def test_saved_questions_are_stored_once_and_shared(db):
+    first = db.save_quiz('Science Quiz', sample_questions())
+    # The same question twice in one quiz, plus one that differs only in its answer
+    changed = dict(sample_questions()[0], correct_option=2)
+    second = db.save_quiz('Review', [sample_questions()[0], sample_questions()[0], changed])
+    assert count_rows(db, 'questions') == 3
+    assert count_rows(db, 'options') == 9
+    assert [q['correct_option'] for q in db.get_quiz_by_id(second)['questions']] == [1, 1, 2]
+    assert db.get_quiz_summaries() == [(first, 'Science Quiz', 2), (second, 'Review', 3)]
+
+
+def test_deleting_a_quiz_keeps_questions_other_quizzes_share(db):
+    first = db.save_quiz('Science Quiz', sample_questions())
+    second = db.save_quiz('Review', sample_questions()[:1])
+    db.delete_quiz(first)
+    assert count_rows(db, 'questions') == 1
+    assert count_rows(db, 'options') == 3
+    assert [q['options'] for q in db.get_quiz_by_id(second)['questions']] == [['H2O', 'CO2', 'O2']]
+    assert [title for _, title in db.search_quizzes('water')] == ['Review']
+    db.delete_quiz(second)
+    assert (count_rows(db, 'questions'), count_rows(db, 'options'), count_rows(db, 'quiz_questions')) == (0, 0, 0)
+
+
+def test_import_quizzes_counts_rows(db):
+    stats = db.import_quizzes([('Quiz A', sample_questions()), {'title': 'Quiz B', 'questions': sample_questions()}])
+    # Quiz B's questions are the same as Quiz A's, so they are shared rather than written again
+    assert (stats['quizzes'], stats['questions'], stats['options'], stats['shared']) == (2, 2, 6, 2)
+    assert [title for _, title in db.get_all_quizzes()] == ['Quiz A', 'Quiz B']
+    quiz = db.get_quiz_by_id(db.get_quiz_ids_by_title('Quiz B')[0])
+    assert [question['options'] for question in quiz['questions']] == [q['options'] for q in sample_questions()]
+
+
+def test_import_quizzes_with_writes_between_batches(tmp_path):
+    path = str(tmp_path / 'quizify.db')
+    db = QuizifyDatabase(path)
+    other = QuizifyDatabase(path)
+
+    def quizzes():
+        for number in range(4):
+            # Another connection takes IDs while the import is between batches
+            other.save_quiz(f'Other {number}', sample_questions())
+            yield f'Imported {number}', sample_questions()
+
+    try:
+        db.import_quizzes(quizzes(), batch_size=1)
+        titles = [title for _, title in db.get_all_quizzes()]
+        assert sorted(titles) == sorted([f'Other {n}' for n in range(4)] + [f'Imported {n}' for n in range(4)])
+        for quiz_id, title in db.get_all_quizzes():
+            questions = db.get_quiz_by_id(quiz_id)['questions']
+            assert [question['question'] for question in questions] == ['Water?', 'Red planet?']
+    finally:
+        other.close()
+        db.close()
+
+
+def test_import_quizzes_does_not_hold_the_lock_while_reading_input(tmp_path):
+    path = str(tmp_path / 'quizify.db')
+    db = QuizifyDatabase(path, busy_timeout=0.1)
+    other = QuizifyDatabase(path, busy_timeout=0.1)
+    other.BUSY_RETRIES = 0
+
+    def quizzes():
+        yield 'First', sample_questions()
+        other.save_quiz('Written mid-import', sample_questions())
+        yield 'Second', sample_questions()
+
+    try:
+        db.import_quizzes(quizzes(), batch_size=10)
+        assert len(db.get_all_quizzes()) == 3
+    finally:
+        other.close()
+        db.close()
+
+
+def test_saved_quiz_is_indexed_in_one_pass_and_triggers_resume(db):
+    db.save_quiz('Astronomy', sample_questions())
+    assert count_rows(db, 'fts_paused') == 0
+    assert [title for _, title in db.search_quizzes('planet')] == ['Astronomy']
+    assert [title for _, title in db.search_quizzes('venus')] == ['Astronomy']
+    # With the triggers back on, rows written outside save_quiz are indexed as they change
+    db.cursor.execute("UPDATE quizzes SET title = 'Space' WHERE title = 'Astronomy'")
+    db.conn.commit()
+    assert [title for _, title in db.search_quizzes('space')] == ['Space']
+
+
+def test_failed_save_is_rolled_back(db):
+    broken = [sample_questions()[0], {'options': ['A', 'B']}]  # The second question has no text
+    with pytest.raises(KeyError):
+        db.save_quiz('Bad', broken)
+    assert not db.conn.in_transaction
+    assert (count_rows(db, 'quizzes'), count_rows(db, 'questions'), count_rows(db, 'fts_paused')) == (0, 0, 0)
+    # A later commit on the same connection must not persist any of the failed quiz
+    db.save_attempt(None, 'Science Quiz', [True], 'Ada')
+    assert count_rows(db, 'quizzes') == 0
+    db.save_quiz('Good', sample_questions())
+    assert [title for _, title in db.search_quizzes('water')] == ['Good']
+
+
+def test_imported_quizzes_are_searchable(db):
+    db.import_quizzes([('Astronomy', sample_questions())])
+    assert [title for _, title in db.search_quizzes('planet')] == ['Astronomy']
+    assert [title for _, title in db.search_quizzes('astro')] == ['Astronomy']
@@ -0,0 +1,53 @@
+import math
+
+import numpy as np
+
+from QuizAnalytics import analyze, analyze_attempts, correctness_matrix
+
+FULL = [b"\x01\x01\x00", b"\x01\x00\x00", b"\x01\x01\x01", b"\x00\x00\x00"]
+
+
+def test_full_attempts_use_uint8_matrix():
+    matrix, kept = correctness_matrix(FULL)
+    assert matrix.dtype == np.uint8
+    assert kept == [0, 1, 2, 3]
+    assert matrix.tolist() == [list(row) for row in FULL]
+
+
+def test_attempts_at_another_quiz_version_are_skipped():
+    matrix, kept = correctness_matrix([b"\x01\x01", b"\x01\x00\x01"])
+    assert kept == [1]
+    assert matrix.shape == (1, 3)
+
+
+def test_difficulty_and_alpha_for_complete_matrix():
+    report = analyze(correctness_matrix(FULL)[0])
+    assert report["difficulty"].tolist() == [0.75, 0.5, 0.25]
+    assert report["score_distribution"].tolist() == [1, 1, 1, 1]
+    assert report["cronbach_alpha"] > 0
+
+
+def test_undelivered_questions_are_missing_not_wrong():
+    attempts = [
+        {"correctness": b"\x01\x01\x01", "question_indices": None, "question_count": 3, "section": "A"},
+        # Saw only questions 0 and 2, and got both right
+        {"correctness": b"\x01\x01", "question_indices": [0, 2], "question_count": 3, "section": "B"},
+    ]
+    matrix, kept = correctness_matrix(attempts)
+    assert kept == [0, 1]
+    assert math.isnan(matrix[1, 1])
+
+    report = analyze_attempts(attempts)
+    # Question 1 was only asked once, and answered correctly
+    assert report["difficulty"].tolist() == [1.0, 1.0, 1.0]
+    assert report["sections"]["B"]["difficulty"][0] == 1.0
+    assert math.isnan(report["sections"]["B"]["difficulty"][1])
+
+
+def test_partial_attempts_are_kept_by_quiz_length():
+    attempts = [
+        {"correctness": b"\x01", "question_indices": [1], "question_count": 3},
+        {"correctness": b"\x00\x01\x00", "question_indices": None, "question_count": 3},
+    ]
+    _, kept = correctness_matrix(attempts)
+    assert kept == [0, 1]
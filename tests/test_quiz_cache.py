@@ -0,0 +1,66 @@
+from DatabaseAPP import QuizifyDatabase
+from QuizCache import LRUCache
+
+
+def test_evicts_least_recently_used_entry():
+    cache = LRUCache(max_entries=2)
+    cache.put(1, 'one')
+    cache.put(2, 'two')
+    assert cache.get(1) == 'one'  # 2 is now least recently used
+    cache.put(3, 'three')
+    assert 2 not in cache
+    assert cache.get(1) == 'one' and cache.get(3) == 'three'
+    assert cache.stats()['evictions'] == 1
+
+
+def test_bounded_by_bytes():
+    cache = LRUCache(max_entries=None, max_bytes=10, size_of=len)
+    cache.put('a', 'xxxx')
+    cache.put('b', 'yyyy')
+    cache.put('c', 'zzzz')
+    assert 'a' not in cache and 'b' in cache and 'c' in cache
+    assert cache.current_bytes == 8
+    cache.put('huge', 'x' * 11)  # Larger than the whole cache: not stored
+    assert 'huge' not in cache and cache.current_bytes == 8
+
+
+def test_invalidate_drops_stale_put():
+    cache = LRUCache()
+    generation = cache.generation
+    cache.invalidate('quiz')  # A write lands while a reader is loading
+    cache.put('quiz', 'stale', generation)
+    assert 'quiz' not in cache
+    cache.put('quiz', 'fresh', cache.generation)
+    assert cache.get('quiz') == 'fresh'
+
+
+def test_hit_and_miss_counters():
+    cache = LRUCache()
+    cache.get('missing')
+    cache.put('key', 'value')
+    cache.get('key')
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+
+
+def test_database_invalidates_deleted_quiz(tmp_path):
+    db = QuizifyDatabase(str(tmp_path / 'quizify.db'))
+    try:
+        quiz_id = db.save_quiz('Quiz', [{'question': 'Q?', 'options': ['A', 'B'], 'correct_option': 1}])
+        assert db.get_quiz_by_id(quiz_id) is not None
+        assert quiz_id in db.cache
+        db.delete_quiz(quiz_id)
+        assert quiz_id not in db.cache
+        assert db.get_quiz_by_id(quiz_id) is None
+    finally:
+        db.close()
+
+
+def test_database_cache_can_be_disabled(tmp_path):
+    db = QuizifyDatabase(str(tmp_path / 'quizify.db'), cache_entries=0)
+    try:
+        assert db.cache is None
+        quiz_id = db.save_quiz('Quiz', [{'question': 'Q?', 'options': ['A', 'B'], 'correct_option': 2}])
+        assert db.get_quiz_by_id(quiz_id)['title'] == 'Quiz'
+    finally:
+        db.close()
@@ -0,0 +1,71 @@
+import pytest
+
+from QuizDedup import (
+    content_hash, exact_hash, find_exact_duplicates, find_near_duplicates, minhash_signatures, shingles,
+)
+
+pytest.importorskip("numpy")
+
+BASE = "Which planet in our solar system is known as the red planet because of the iron oxide on its surface"
+TEXTS = [
+    BASE,
+    "Which gas do plants take in from the air during photosynthesis to make their food in sunlight",
+    BASE,  # An exact copy
+    BASE.replace("known as", "called"),  # A near copy
+    "Name the largest ocean on Earth by surface area and by the volume of water it holds today",
+]
+
+
+def test_exact_and_near_copies_are_reported_and_distinct_texts_are_not():
+    found = find_near_duplicates(TEXTS, threshold=0.5)
+    pairs = {(i, j) for i, j, _ in found}
+    assert (0, 2) in pairs
+    assert (0, 3) in pairs and (2, 3) in pairs
+    assert not pairs & {(0, 1), (0, 4), (1, 4), (1, 3)}
+    similarity = {(i, j): score for i, j, score in found}
+    assert similarity[(0, 2)] == 1.0
+    assert 0.5 <= similarity[(0, 3)] < 1.0
+    # Most similar first
+    assert [score for _, _, score in found] == sorted((score for _, _, score in found), reverse=True)
+
+
+def test_threshold_filters_near_copies():
+    pairs = {(i, j) for i, j, _ in find_near_duplicates(TEXTS, threshold=1.0)}
+    assert pairs == {(0, 2)}
+
+
+def test_empty_input_finds_nothing():
+    assert find_near_duplicates([]) == []
+    assert minhash_signatures([], permutations=8).shape == (0, 8)
+
+
+def test_signatures_are_deterministic_and_need_shingles():
+    sets = [shingles(text) for text in TEXTS]
+    first = minhash_signatures(sets, permutations=16, seed=3)
+    assert first.shape == (len(TEXTS), 16)
+    assert (first == minhash_signatures(sets, permutations=16, seed=3)).all()
+    assert (first[0] == first[2]).all()
+    with pytest.raises(ValueError):
+        minhash_signatures([{1}, set()])
+
+
+def test_permutations_must_split_into_bands():
+    with pytest.raises(ValueError, match="multiple of bands"):
+        find_near_duplicates(TEXTS, permutations=60, bands=16)
+
+
+def test_short_text_is_one_shingle():
+    assert shingles("Two words") == shingles("two  WORDS")
+    assert len(shingles("two words")) == 1
+
+
+def test_exact_duplicates_ignore_case_and_whitespace_but_exact_hash_does_not():
+    questions = [
+        {"type": "Short Answer", "question": "Capital of France?", "correct_answer": "Paris"},
+        {"type": "Short Answer", "question": "capital  of france?", "correct_answer": "paris"},
+        {"type": "Short Answer", "question": "Capital of Spain?", "correct_answer": "Madrid"},
+    ]
+    assert find_exact_duplicates(questions) == [[0, 1]]
+    assert exact_hash(questions[0]) != exact_hash(questions[1])
+    assert exact_hash(questions[0]) == exact_hash(dict(reversed(list(questions[0].items()))))
+    assert content_hash("Short Answer", "A", None, None) == content_hash("short answer", " a ", (), None)
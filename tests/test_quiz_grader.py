@@ -0,0 +1,52 @@
+from QuizGrader import compile_answer_key, grade_batch, normalize_answer
+
+QUESTIONS = [
+    {"type": "Multiple Choice", "question": "Water?", "options": ["H2O", "CO2"], "correct_answer": "H2O"},
+    {"type": "True/False", "question": "The sun is a star.", "correct_answer": "True"},
+    {"type": "Short Answer", "question": "Capital of France?", "correct_answer": "Paris",
+     "accepted_answers": ["Paris, France"]},
+    {"type": "Multiple Choice", "question": "Unanswerable?", "options": ["A", "B"], "correct_answer": None},
+]
+
+
+def test_normalize_answer():
+    assert normalize_answer("  Paris \n France ") == "paris france"
+
+
+def test_multiple_choice_is_exact_after_trimming():
+    key = compile_answer_key(QUESTIONS)
+    assert key.is_correct(0, " H2O ")
+    assert not key.is_correct(0, "h2o")
+
+
+def test_other_types_ignore_case_and_whitespace():
+    key = compile_answer_key(QUESTIONS)
+    assert key.is_correct(1, "true")
+    assert key.is_correct(2, "  PARIS ")
+    assert key.is_correct(2, "paris,   france")
+    assert not key.is_correct(2, "Lyon")
+
+
+def test_missing_answers_are_wrong():
+    key = compile_answer_key(QUESTIONS)
+    assert key.grade(["H2O"]) == [True, False, False, False]
+    assert key.grade([None, "True", None, None]) == [False, True, False, False]
+    assert not key.is_correct(3, "A")
+
+
+def test_score_and_batch():
+    key = compile_answer_key(QUESTIONS)
+    submissions = [["H2O", "True", "paris", "A"], ["CO2", "False", "Lyon", None], []]
+    assert list(grade_batch(key, submissions)) == [
+        (3, [True, True, True, False]), (0, [False] * 4), (0, [False] * 4),
+    ]
+    assert key.score(submissions[0]) == 3
+    assert len(key) == 4
+
+
+def test_question_objects_compile_like_dicts():
+    from QuizModel import QuestionBank
+
+    bank = QuestionBank.from_dicts(QUESTIONS)
+    key = compile_answer_key(bank)
+    assert key.grade(["H2O", "TRUE", "Paris, France", "B"]) == [True, True, True, False]
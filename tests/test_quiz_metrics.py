@@ -0,0 +1,46 @@
+import json
+import os
+
+import pytest
+
+import QuizMetrics
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    QuizMetrics.reset()
+    yield
+    QuizMetrics.reset()
+
+
+def test_histogram_counts_and_quantiles():
+    for value in (0.001, 0.002, 0.004, 1.0):
+        QuizMetrics.observe("quizify_test_seconds", value)
+    [entry] = QuizMetrics.snapshot()["metrics"]["quizify_test_seconds"]
+    assert entry["count"] == 4
+    assert entry["max"] == 1.0
+    assert entry["p50"] <= entry["p99"]
+
+
+def test_write_snapshot_replaces_the_file(tmp_path):
+    QuizMetrics.observe("quizify_test_seconds", 0.5)
+    path = tmp_path / "metrics.json"
+    QuizMetrics.write_snapshot(str(path))
+    assert json.loads(path.read_text(encoding="utf-8"))["metrics"]["quizify_test_seconds"][0]["count"] == 1
+    assert os.listdir(tmp_path) == ["metrics.json"]
+
+
+def test_write_snapshot_leaves_no_temp_file_on_failure(tmp_path, monkeypatch):
+    path = tmp_path / "metrics.json"
+    path.write_text('{"kept": true}', encoding="utf-8")
+    monkeypatch.setattr(QuizMetrics, "snapshot", lambda: {"bad": object()})
+    with pytest.raises(TypeError):
+        QuizMetrics.write_snapshot(str(path))
+    assert os.listdir(tmp_path) == ["metrics.json"]
+    assert json.loads(path.read_text(encoding="utf-8")) == {"kept": True}
+
+
+def test_prometheus_text_lists_histograms():
+    QuizMetrics.observe("quizify_test_seconds", 0.5, (("backend", "json"),))
+    text = QuizMetrics.render_prometheus()
+    assert 'quizify_test_seconds_count{backend="json"} 1' in text
@@ -0,0 +1,43 @@
+import threading
+
+import QuizModel
+from QuizModel import TYPE_NAMES, QuestionBank, type_code
+
+
+def test_app_question_types_are_known_up_front():
+    for name in ("Multiple Choice", "True/False", "Short Answer", "Fill-in-the-Blank"):
+        assert TYPE_NAMES[type_code(name)] == name
+    assert type_code(None) == 0
+
+
+def test_concurrent_registration_gives_each_new_name_its_own_code():
+    names = [f"Test Type {number}" for number in range(8)]
+    barrier = threading.Barrier(len(names) * 2)
+    codes = {}
+
+    def register(name):
+        barrier.wait()
+        codes.setdefault(name, set()).add(type_code(name))
+
+    threads = [threading.Thread(target=register, args=(name,)) for name in names * 2]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    try:
+        assert all(len(found) == 1 for found in codes.values())
+        assert {TYPE_NAMES[found.pop()] for found in codes.values()} == set(names)
+    finally:
+        for name in names:
+            del QuizModel._TYPE_CODES[name]
+        TYPE_NAMES[len(TYPE_NAMES) - len(names):] = []
+
+
+def test_bank_round_trips_dicts():
+    questions = [
+        {"type": "Fill-in-the-Blank", "question": "H_O", "correct_answer": "2"},
+        {"type": "Multiple Choice", "question": "Water?", "options": ["H2O", "CO2"], "correct_answer": "H2O"},
+    ]
+    bank = QuestionBank.from_dicts(questions)
+    assert bank.to_dicts() == questions
+    assert bank[0]["type"] == "Fill-in-the-Blank"
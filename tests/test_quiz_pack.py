@@ -0,0 +1,102 @@
+import os
+import stat
+
+import pytest
+
+from QuizPack import HEADER, PackError, QuizPack, export_pack, import_pack, write_pack
+from QuizStorage import JsonQuizStore, SqliteQuizStore
+
+QUIZZES = {
+    "Science": [
+        {"type": "Multiple Choice", "question": "Water?", "options": ["H2O", "CO2"], "correct_answer": "H2O"},
+        {"type": "Short Answer", "question": "Capital of France?", "correct_answer": "Paris",
+         "accepted_answers": ["paris, france"]},
+    ],
+    "Empty": [],
+    "Unicode ✓": [{"type": "True/False", "question": "Ça va?", "correct_answer": "True"}],
+}
+
+
+@pytest.fixture
+def pack_path(tmp_path):
+    path = tmp_path / "bank.qpk"
+    write_pack(str(path), QUIZZES)
+    return path
+
+
+def test_round_trip(pack_path):
+    with QuizPack(str(pack_path)) as pack:
+        assert pack.titles() == list(QUIZZES)
+        assert {title: pack.load(title) for title in pack.titles()} == QUIZZES
+        assert "Science" in pack and "History" not in pack
+
+
+def test_questions_are_decoded_on_demand(pack_path):
+    with QuizPack(str(pack_path)) as pack:
+        quiz = pack.quiz("Science")
+        assert len(quiz) == 2
+        assert quiz[-1]["accepted_answers"] == ["paris, france"]
+        with pytest.raises(IndexError):
+            quiz[2]
+
+
+def test_export_and_import_through_stores(tmp_path):
+    source = JsonQuizStore(str(tmp_path / "quizzes"), legacy_file=None)
+    target = SqliteQuizStore(str(tmp_path / "quizify.db"))
+    try:
+        for title, questions in QUIZZES.items():
+            source.save(title, questions)
+        export_pack(source, str(tmp_path / "bank.qpk"))
+        assert import_pack(str(tmp_path / "bank.qpk"), target) == len(QUIZZES)
+        assert {title: target.load(title) for title in target.titles()} == QUIZZES
+    finally:
+        source.close()
+        target.close()
+
+
+@pytest.mark.parametrize("verify", [True, False])
+def test_empty_file_raises_pack_error(tmp_path, verify):
+    path = tmp_path / "empty.qpk"
+    path.write_bytes(b"")
+    with pytest.raises(PackError):
+        QuizPack(str(path), verify=verify)
+
+
+@pytest.mark.parametrize("verify", [True, False])
+@pytest.mark.parametrize("keep", [HEADER.size - 1, HEADER.size + 4])
+def test_truncated_tables_raise_pack_error(pack_path, verify, keep):
+    pack_path.write_bytes(pack_path.read_bytes()[:keep])
+    with pytest.raises(PackError):
+        QuizPack(str(pack_path), verify=verify)
+
+
+def test_truncated_records_raise_pack_error_without_verify(pack_path):
+    pack_path.write_bytes(pack_path.read_bytes()[:-10])
+    with pytest.raises(PackError):
+        QuizPack(str(pack_path))
+    with QuizPack(str(pack_path), verify=False) as pack:
+        with pytest.raises(PackError):
+            [pack.load(title) for title in pack.titles()]
+
+
+def test_other_files_and_damage_raise_pack_error(tmp_path, pack_path):
+    other = tmp_path / "notes.txt"
+    other.write_bytes(b"not a pack at all, just some text")
+    with pytest.raises(PackError, match="not a quiz pack"):
+        QuizPack(str(other))
+
+    data = bytearray(pack_path.read_bytes())
+    data[-2] ^= 0xFF
+    pack_path.write_bytes(bytes(data))
+    with pytest.raises(PackError, match="damaged"):
+        QuizPack(str(pack_path))
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permission bits")
+def test_pack_gets_the_permissions_a_plain_open_would(tmp_path, pack_path):
+    plain = tmp_path / "plain.txt"
+    plain.write_bytes(b"")
+    assert stat.S_IMODE(pack_path.stat().st_mode) == stat.S_IMODE(plain.stat().st_mode)
+    pack_path.chmod(0o640)
+    write_pack(str(pack_path), QUIZZES)
+    assert stat.S_IMODE(pack_path.stat().st_mode) == 0o640
@@ -0,0 +1,143 @@
+import asyncio
+import json
+
+import pytest
+
+from QuizServer import QuizServer
+from QuizStorage import JsonQuizStore
+
+QUESTIONS = [
+    {"type": "Multiple Choice", "question": "Water?", "options": ["H2O", "CO2"], "correct_answer": "H2O"},
+    {"type": "Short Answer", "question": "Capital of France?", "correct_answer": "Paris",
+     "accepted_answers": ["Paris, France"]},
+]
+
+
+def run_with_server(tmp_path, scenario, time_limit=60):
+    """Start a server on a free port over a JSON store holding one quiz, then run ``scenario(server, port)``."""
+    directory = str(tmp_path / "quizzes")
+    JsonQuizStore(directory, legacy_file=None).save("Science", QUESTIONS)
+
+    async def main():
+        server = QuizServer(lambda: JsonQuizStore(directory, legacy_file=None), time_limit=time_limit)
+        listener = await server.start("127.0.0.1", 0)
+        try:
+            return await scenario(server, listener.sockets[0].getsockname()[1])
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+
+async def request(port, method, path, payload=None, raw_body=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = raw_body if raw_body is not None else (json.dumps(payload).encode() if payload is not None else b"")
+    writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+                 + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, data = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(data)
+
+
+def test_catalog_and_questions_without_answers(tmp_path):
+    async def scenario(server, port):
+        assert await request(port, "GET", "/quizzes") == (200, [{"title": "Science", "question_count": 2}])
+        status, quiz = await request(port, "GET", "/quizzes/Science")
+        assert status == 200
+        assert all("correct_answer" not in q and "accepted_answers" not in q for q in quiz["questions"])
+        assert (await request(port, "GET", "/quizzes/Missing"))[0] == 404
+
+    run_with_server(tmp_path, scenario)
+
+
+def test_attempt_is_graded_and_recorded(tmp_path):
+    async def scenario(server, port):
+        status, started = await request(port, "POST", "/attempts", {"quiz": "Science", "student_name": "Ada"})
+        assert status == 201 and started["time_limit"] == 60
+        attempt = f"/attempts/{started['attempt_id']}"
+        for index, answer, expected in [(0, "H2O", 200), (1, "paris, france", 200), (5, "x", 400)]:
+            status, _ = await request(port, "POST", attempt + "/answers", {"question_index": index, "answer": answer})
+            assert status == expected
+        assert await request(port, "POST", attempt + "/finish") == (200, {"score": 2, "question_count": 2})
+        # Finishing again returns the same score rather than recording twice
+        assert await request(port, "POST", attempt + "/finish") == (200, {"score": 2, "question_count": 2})
+        return await server._run_io(server.store.load_attempts, "Science")
+
+    attempts = run_with_server(tmp_path, scenario)
+    assert [(a["student_name"], a["correctness"]) for a in attempts] == [("Ada", b"\x01\x01")]
+
+
+@pytest.mark.parametrize("requested", [1e9, 61])
+def test_client_cannot_extend_the_deadline(tmp_path, requested):
+    async def scenario(server, port):
+        status, started = await request(port, "POST", "/attempts", {"quiz": "Science", "time_limit": requested})
+        return status, started["time_limit"]
+
+    assert run_with_server(tmp_path, scenario) == (201, 60)
+
+
+def test_client_may_shorten_the_deadline(tmp_path):
+    async def scenario(server, port):
+        return await request(port, "POST", "/attempts", {"quiz": "Science", "time_limit": 30})
+
+    status, started = run_with_server(tmp_path, scenario)
+    assert status == 201 and started["time_limit"] == 30
+
+
+@pytest.mark.parametrize("raw", [b'{"quiz": "Science", "time_limit": Infinity}',
+                                 b'{"quiz": "Science", "time_limit": NaN}',
+                                 b'{"quiz": "Science", "time_limit": -5}',
+                                 b'{"quiz": "Science", "time_limit": 0}',
+                                 b'{"quiz": "Science", "time_limit": "soon"}'])
+def test_invalid_time_limit_is_rejected(tmp_path, raw):
+    async def scenario(server, port):
+        status, _ = await request(port, "POST", "/attempts", raw_body=raw)
+        return status, len(server.attempts)
+
+    assert run_with_server(tmp_path, scenario) == (400, 0)
+
+
+def test_answers_after_the_deadline_are_refused_and_attempt_recorded(tmp_path):
+    async def scenario(server, port):
+        _, started = await request(port, "POST", "/attempts", {"quiz": "Science", "student_name": "Ada"})
+        attempt = f"/attempts/{started['attempt_id']}"
+        await request(port, "POST", attempt + "/answers", {"question_index": 0, "answer": "H2O"})
+        await asyncio.sleep(0.3)
+        status, _ = await request(port, "POST", attempt + "/answers", {"question_index": 1, "answer": "Paris"})
+        assert status == 409
+        return await server._run_io(server.store.load_attempts, "Science")
+
+    attempts = run_with_server(tmp_path, scenario, time_limit=0.2)
+    assert [a["correctness"] for a in attempts] == [b"\x01\x00"]
+
+
+def test_quiz_edited_by_another_process_is_served_and_graded_afresh(tmp_path):
+    async def scenario(server, port):
+        await request(port, "GET", "/quizzes/Science")
+        edited = [dict(QUESTIONS[0], options=["H2O", "CO2", "O2"], correct_answer="O2")]
+        # A second store stands in for the teacher's app writing to the same directory
+        JsonQuizStore(str(tmp_path / "quizzes"), legacy_file=None).save("Science", edited)
+        status, quiz = await request(port, "GET", "/quizzes/Science")
+        assert status == 200 and quiz["questions"][0]["options"] == ["H2O", "CO2", "O2"]
+        _, started = await request(port, "POST", "/attempts", {"quiz": "Science"})
+        attempt = f"/attempts/{started['attempt_id']}"
+        assert started["question_count"] == 1
+        await request(port, "POST", attempt + "/answers", {"question_index": 0, "answer": "O2"})
+        return await request(port, "POST", attempt + "/finish")
+
+    assert run_with_server(tmp_path, scenario) == (200, {"score": 1, "question_count": 1})
+
+
+@pytest.mark.parametrize("length", [str(QuizServer.MAX_BODY_BYTES + 1), "-1", "lots"])
+def test_oversized_or_invalid_content_length_is_rejected_unread(tmp_path, length):
+    async def scenario(server, port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"POST /attempts HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode())
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return int(response.split()[1]), len(server.attempts)
+
+    assert run_with_server(tmp_path, scenario) == (400, 0)
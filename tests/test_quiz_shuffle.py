@@ -0,0 +1,60 @@
+from QuizShuffle import QuestionPool, new_seed
+
+QUESTIONS = (
+    [{"type": "Multiple Choice", "question": f"MC {n}?", "options": ["A", "B", "C", "D"], "correct_answer": "A"}
+     for n in range(6)]
+    + [{"type": "True/False", "question": f"TF {n}?", "correct_answer": "True"} for n in range(3)]
+    + [{"type": "Short Answer", "question": f"SA {n}?", "correct_answer": "x"} for n in range(3)]
+)
+
+
+def test_same_seed_gives_same_delivery():
+    pool = QuestionPool(QUESTIONS)
+    first, second = pool.deliver(42, 5), pool.deliver(42, 5)
+    assert first.question_order == second.question_order
+    assert first.option_orders == second.option_orders
+    assert first.questions == second.questions
+
+
+def test_new_seed_varies():
+    assert len({new_seed() for _ in range(20)}) > 1
+
+
+def test_whole_pool_is_a_permutation():
+    delivery = QuestionPool(QUESTIONS).deliver(1)
+    assert sorted(delivery.question_order) == list(range(len(QUESTIONS)))
+
+
+def test_option_orders_map_back_to_canonical_options():
+    delivery = QuestionPool(QUESTIONS).deliver(9)
+    for position, question in enumerate(delivery.questions):
+        canonical = QUESTIONS[delivery.canonical_index(position)]
+        permutation = delivery.option_orders[position]
+        if permutation is None:
+            assert question == canonical
+        else:
+            assert question["options"] == [canonical["options"][i] for i in permutation]
+
+
+def test_subset_is_stratified_by_type():
+    pool = QuestionPool(QUESTIONS)
+    assert pool.allocate(4) == {"Multiple Choice": 2, "True/False": 1, "Short Answer": 1}
+    assert sum(pool.allocate(7).values()) == 7
+    delivery = pool.deliver(5, 4)
+    types = sorted(QUESTIONS[index]["type"] for index in delivery.question_order)
+    assert types == ["Multiple Choice", "Multiple Choice", "Short Answer", "True/False"]
+
+
+def test_unshuffled_delivery_keeps_canonical_order():
+    delivery = QuestionPool(QUESTIONS).deliver(5, 4, shuffle_questions=False, shuffle_options=False)
+    assert list(delivery.question_order) == sorted(delivery.question_order)
+    assert delivery.option_orders == (None,) * 4
+
+
+def test_rebuild_uses_stored_settings():
+    pool = QuestionPool(QUESTIONS)
+    original = pool.deliver(11, 5, shuffle_questions=False, shuffle_options=True)
+    record = {"seed": 11, "delivered_count": 5, "shuffle_questions": False, "shuffle_options": True}
+    rebuilt = pool.rebuild(record)
+    assert rebuilt.question_order == original.question_order
+    assert rebuilt.option_orders == original.option_orders
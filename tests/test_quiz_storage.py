@@ -0,0 +1,360 @@
+import json
+import os
+import stat
+
+import pytest
+
+from QuizStorage import (
+    JsonQuizStore, QuizStore, SqliteQuizStore, app_question_to_db, atomic_write_json, convert_store,
+    db_question_to_app, open_store,
+)
+from QuizShuffle import QuestionPool
+
+QUESTIONS = [
+    {"type": "Multiple Choice", "question": "Water?", "options": ["H2O", "CO2", "O2"], "correct_answer": "H2O"},
+    {"type": "True/False", "question": "The sun is a star.", "correct_answer": "True"},
+    {"type": "Short Answer", "question": "Capital of France?", "correct_answer": "Paris",
+     "accepted_answers": ["paris, france"]},
+    {"type": "Multiple Choice", "question": "No answer yet?", "options": ["A", "B"], "correct_answer": None},
+]
+
+
+def make_store(backend, tmp_path):
+    if backend == "json":
+        return JsonQuizStore(str(tmp_path / "quizzes"), legacy_file=None)
+    return SqliteQuizStore(str(tmp_path / "quizify.db"))
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path):
+    quiz_store = make_store(request.param, tmp_path)
+    yield quiz_store
+    quiz_store.close()
+
+
+def test_incomplete_backend_cannot_be_instantiated():
+    class Incomplete(QuizStore):
+        def titles(self):
+            return []
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_save_and_load_round_trip(store):
+    store.save("Science", QUESTIONS)
+    assert store.load("Science") == QUESTIONS
+    assert "Science" in store and "History" not in store
+    assert store.titles() == ["Science"]
+    assert len(store) == 1
+
+
+def test_save_replaces_existing_title(store):
+    store.save("Science", QUESTIONS)
+    store.save("Science", QUESTIONS[:1])
+    assert store.titles() == ["Science"]
+    assert store.load("Science") == QUESTIONS[:1]
+    assert [entry["question_count"] for entry in store.catalog()] == [1]
+
+
+def test_delete(store):
+    store.save("Science", QUESTIONS)
+    store.save("History", QUESTIONS[:2])
+    store.delete("Science")
+    assert store.titles() == ["History"]
+    with pytest.raises(KeyError):
+        store.load("Science")
+
+
+def test_load_missing_title_raises_key_error(store):
+    with pytest.raises(KeyError):
+        store.load("Missing")
+
+
+def test_catalog_counts_questions_without_loading(store):
+    store.save("Science", QUESTIONS)
+    store.save("History", QUESTIONS[:2])
+    counts = {entry["title"]: entry["question_count"] for entry in store.catalog()}
+    assert counts == {"Science": 4, "History": 2}
+
+
+def test_search_finds_titles(store):
+    store.save("Solar System", QUESTIONS)
+    store.save("World History", QUESTIONS)
+    assert store.search("solar") == ["Solar System"]
+
+
+def test_attempts_round_trip(store):
+    store.save("Science", QUESTIONS)
+    attempt = store.start_attempt("Science", len(QUESTIONS), student_name="Ada", section="A")
+    attempt.add_response(0, "H2O", True)
+    attempt.add_response(2, "Lyon", False)
+    store.finish_attempt(attempt)
+    store.record_attempt("Science", [True, True, False, False], student_name="Grace")
+
+    attempts = store.load_attempts("Science")
+    assert [(a["student_name"], a["correctness"]) for a in attempts] == [
+        ("Ada", b"\x01\x00\x00\x00"), ("Grace", b"\x01\x01\x00\x00"),
+    ]
+    rows = [row for row in store.iter_results("Science") if row[2] == "Ada"]
+    assert [(row[8], row[9], row[10]) for row in rows] == [(0, "H2O", 1), (2, "Lyon", 0)]
+    assert [row[9] for row in store.iter_results("Science") if row[2] == "Grace"] == [None]
+
+
+def test_partial_attempt_records_only_delivered_questions(store):
+    store.save("Science", QUESTIONS)
+    delivery = QuestionPool(QUESTIONS).deliver(7, 2, shuffle_options=False)
+    attempt = store.start_attempt("Science", len(QUESTIONS), student_name="Ada")
+    attempt.record_delivery(delivery)
+    first = delivery.canonical_index(0)
+    attempt.add_response(first, "answer", True)
+    store.finish_attempt(attempt)
+
+    [recorded] = store.load_attempts("Science")
+    assert recorded["question_indices"] == sorted(delivery.question_order)
+    assert recorded["question_count"] == len(QUESTIONS)
+    assert len(recorded["correctness"]) == 2
+    assert recorded["correctness"][recorded["question_indices"].index(first)] == 1
+    assert (recorded["seed"], recorded["delivered_count"]) == (7, 2)
+    assert (recorded["shuffle_questions"], recorded["shuffle_options"]) == (True, False)
+    assert QuestionPool(QUESTIONS).rebuild(recorded).question_order == delivery.question_order
+
+
+def test_full_attempt_has_no_question_indices(store):
+    store.save("Science", QUESTIONS)
+    attempt = store.start_attempt("Science", len(QUESTIONS))
+    attempt.record_delivery(QuestionPool(QUESTIONS).deliver(3))
+    store.finish_attempt(attempt)
+    [recorded] = store.load_attempts("Science")
+    assert recorded["question_indices"] is None
+    assert recorded["delivered_count"] is None
+    assert len(recorded["correctness"]) == len(QUESTIONS)
+
+
+@pytest.mark.parametrize("source_backend, target_backend", [("json", "sqlite"), ("sqlite", "json")])
+def test_convert_store_is_lossless(tmp_path, source_backend, target_backend):
+    (tmp_path / "source").mkdir()
+    (tmp_path / "target").mkdir()
+    source = make_store(source_backend, tmp_path / "source")
+    target = make_store(target_backend, tmp_path / "target")
+    try:
+        quizzes = {"Science": QUESTIONS, "Empty": [], "Short": QUESTIONS[1:3]}
+        for title, questions in quizzes.items():
+            source.save(title, questions)
+        assert convert_store(source, target) == 3
+        assert target.titles() == source.titles()
+        assert {title: target.load(title) for title in target.titles()} == quizzes
+    finally:
+        source.close()
+        target.close()
+
+
+def test_question_format_conversion_round_trip():
+    for question in QUESTIONS:
+        assert db_question_to_app(app_question_to_db(question)) == question
+    assert app_question_to_db(QUESTIONS[0])["correct_option"] == 1
+
+
+def test_old_database_questions_default_to_multiple_choice():
+    question = {"question": "Water?", "options": ["CO2", "H2O"], "correct_option": 2}
+    assert db_question_to_app(question) == {
+        "type": "Multiple Choice", "question": "Water?", "options": ["CO2", "H2O"], "correct_answer": "H2O",
+    }
+
+
+def test_json_store_imports_legacy_bank(tmp_path):
+    legacy = tmp_path / "quizzes.json"
+    legacy.write_text(json.dumps({"Science": QUESTIONS, "History": QUESTIONS[:1]}), encoding="utf-8")
+    store = JsonQuizStore(str(tmp_path / "quizzes"), legacy_file=str(legacy))
+    assert store.titles() == ["Science", "History"]
+    assert store.load("Science") == QUESTIONS
+    # Reopening reads the index instead of importing again
+    reopened = JsonQuizStore(str(tmp_path / "quizzes"), legacy_file=str(legacy))
+    assert reopened.titles() == ["Science", "History"]
+
+
+def test_json_store_reopens_with_catalog(tmp_path):
+    store = JsonQuizStore(str(tmp_path / "quizzes"), legacy_file=None)
+    store.save("Science", QUESTIONS)
+    reopened = JsonQuizStore(str(tmp_path / "quizzes"), legacy_file=None)
+    assert reopened.catalog()[0]["question_count"] == 4
+    assert reopened.load("Science") == QUESTIONS
+
+
+def shared_question_lines(directory):
+    with open(directory / JsonQuizStore.QUESTIONS_FILE, "r", encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def test_json_store_stores_each_question_once(tmp_path):
+    store = JsonQuizStore(str(tmp_path / "quizzes"), legacy_file=None)
+    store.save("Science", QUESTIONS)
+    store.save("Review", [QUESTIONS[0], QUESTIONS[0], QUESTIONS[1]])
+    assert len(shared_question_lines(tmp_path / "quizzes")) == len(QUESTIONS)
+    assert store.load("Review") == [QUESTIONS[0], QUESTIONS[0], QUESTIONS[1]]
+
+    # Loaded questions are copies; changing one leaves the stored question alone
+    store.load("Review")[0]["question"] = "Changed"
+    reopened = JsonQuizStore(str(tmp_path / "quizzes"), legacy_file=None)
+    assert reopened.load("Science") == QUESTIONS
+    assert reopened.load("Review")[0] == QUESTIONS[0]
+
+
+def test_json_store_compacts_questions_no_quiz_uses(tmp_path):
+    store = JsonQuizStore(str(tmp_path / "quizzes"), legacy_file=None)
+    store.COMPACT_MIN_STALE = 0
+    store.save("Science", QUESTIONS)
+    store.save("Review", QUESTIONS[:1])
+    store.delete("Science")
+    assert [question for _, question in shared_question_lines(tmp_path / "quizzes")] == QUESTIONS[:1]
+    assert store.load("Review") == QUESTIONS[:1]
+
+
+def test_json_store_reads_inline_quiz_files_and_survives_a_cut_append(tmp_path):
+    store = JsonQuizStore(str(tmp_path / "quizzes"), legacy_file=None)
+    store.save("Science", QUESTIONS[:1])
+    # An older quiz file with inline questions, and a crash in the middle of an append
+    entry = store.index["quizzes"]["Science"]
+    (tmp_path / "quizzes" / entry["file"]).write_text(json.dumps(QUESTIONS), encoding="utf-8")
+    with open(tmp_path / "quizzes" / JsonQuizStore.QUESTIONS_FILE, "a", encoding="utf-8") as file:
+        file.write('["cut')
+
+    reopened = JsonQuizStore(str(tmp_path / "quizzes"), legacy_file=None)
+    assert reopened.load("Science") == QUESTIONS
+    reopened.save("History", QUESTIONS[1:2])
+    assert JsonQuizStore(str(tmp_path / "quizzes"), legacy_file=None).load("History") == QUESTIONS[1:2]
+
+
+def test_json_store_loads_a_quiz_without_reading_the_whole_bank(tmp_path):
+    store = JsonQuizStore(str(tmp_path / "quizzes"), legacy_file=None)
+    store.save("Science", QUESTIONS[:2])
+    store.save("Review", QUESTIONS[2:])
+    reopened = JsonQuizStore(str(tmp_path / "quizzes"), legacy_file=None)
+    assert reopened.load("Review") == QUESTIONS[2:]
+    # Quiz files carry each question's offset, so the hash index is only read when saving
+    assert reopened._offsets is None
+
+
+def test_json_store_rebuilds_a_lost_question_index(tmp_path):
+    store = JsonQuizStore(str(tmp_path / "quizzes"), legacy_file=None)
+    store.save("Science", QUESTIONS[:2])
+    # A quiz file listing bare hashes, as written before offsets were stored, and no questions.idx
+    entry = store.index["quizzes"]["Science"]
+    path = tmp_path / "quizzes" / entry["file"]
+    path.write_text(json.dumps([pair[0] for pair in json.loads(path.read_text(encoding="utf-8"))]), encoding="utf-8")
+    os.remove(tmp_path / "quizzes" / JsonQuizStore.QUESTION_INDEX_FILE)
+
+    reopened = JsonQuizStore(str(tmp_path / "quizzes"), legacy_file=None)
+    assert reopened.load("Science") == QUESTIONS[:2]
+    reopened.save("Review", QUESTIONS[:3])
+    assert len(shared_question_lines(tmp_path / "quizzes")) == 3
+    assert JsonQuizStore(str(tmp_path / "quizzes"), legacy_file=None).load("Review") == QUESTIONS[:3]
+
+
+def test_json_store_compaction_moves_quiz_files_to_new_offsets(tmp_path):
+    store = JsonQuizStore(str(tmp_path / "quizzes"), legacy_file=None)
+    store.save("Old", QUESTIONS[:2])
+    store.save("Kept", QUESTIONS[2:])
+    store.delete("Old")
+    store.compact()
+    assert [question for _, question in shared_question_lines(tmp_path / "quizzes")] == QUESTIONS[2:]
+    reopened = JsonQuizStore(str(tmp_path / "quizzes"), legacy_file=None)
+    assert reopened.load("Kept") == QUESTIONS[2:]
+    assert reopened._offsets is None
+
+
+def test_atomic_write_json_leaves_no_temp_file_on_failure(tmp_path):
+    path = tmp_path / "data.json"
+    atomic_write_json(str(path), {"kept": True})
+    with pytest.raises(TypeError):
+        atomic_write_json(str(path), {"bad": object()})
+    assert json.loads(path.read_text(encoding="utf-8")) == {"kept": True}
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_atomic_write_json_encodes_long_lists_in_slices(tmp_path):
+    path = tmp_path / "data.json"
+    data = [{"n": n} for n in range(1000)]
+    size = atomic_write_json(str(path), data)
+    assert json.loads(path.read_text(encoding="utf-8")) == data
+    assert size == path.stat().st_size
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permission bits")
+def test_json_store_files_get_the_permissions_a_plain_open_would(tmp_path):
+    store = JsonQuizStore(str(tmp_path / "quizzes"), legacy_file=None)
+    store.save("Science", QUESTIONS)
+    store.compact()
+    plain = tmp_path / "plain.txt"
+    plain.write_bytes(b"")
+    expected = stat.S_IMODE(plain.stat().st_mode)
+    for name in os.listdir(tmp_path / "quizzes"):
+        assert stat.S_IMODE((tmp_path / "quizzes" / name).stat().st_mode) == expected, name
+
+    # A file replaced in place keeps the permissions it was given
+    index = tmp_path / "quizzes" / JsonQuizStore.INDEX_FILE
+    index.chmod(0o640)
+    store.save("History", QUESTIONS[1:2])
+    assert stat.S_IMODE(index.stat().st_mode) == 0o640
+
+
+def test_open_store_rejects_unknown_backend(tmp_path):
+    with pytest.raises(ValueError):
+        open_store("csv", str(tmp_path))
+
+
+def collect_pages(store, limit):
+    entries, cursor = store.catalog_page(None, limit)
+    pages = [entries]
+    while cursor is not None:
+        entries, cursor = store.catalog_page(cursor, limit)
+        pages.append(entries)
+    return pages
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 50])
+def test_catalog_pages_cover_every_quiz_once(store, limit):
+    for number in range(7):
+        store.save(f"Quiz {number}", QUESTIONS[:number % 3 + 1])
+    pages = collect_pages(store, limit)
+    assert all(len(page) <= limit for page in pages)
+    titles = [entry["title"] for page in pages for entry in page]
+    assert sorted(titles) == sorted(store.titles())
+    assert len(titles) == len(set(titles)) == 7
+
+
+def test_sqlite_catalog_page_shows_latest_copy_of_duplicate_title(tmp_path):
+    from QuizStorage import app_question_to_db
+
+    store = SqliteQuizStore(str(tmp_path / "quizify.db"))
+    try:
+        # Two copies of one title, as left by a crash between writing the new copy and deleting the old
+        store.save("Science", QUESTIONS)
+        store.db.save_quiz("Science", [app_question_to_db(question) for question in QUESTIONS[:2]])
+        store.save("History", QUESTIONS[:1])
+        pages = collect_pages(store, 1)
+        entries = [entry for page in pages for entry in page]
+        assert [(entry["title"], entry["question_count"]) for entry in entries] == [("Science", 2), ("History", 1)]
+        assert {entry["title"]: entry["id"] for entry in entries} == {
+            entry["title"]: entry["id"] for entry in store.catalog()
+        }
+    finally:
+        store.close()
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_version_changes_when_a_quiz_is_saved_again(tmp_path, backend):
+    store = make_store(backend, tmp_path)
+    try:
+        store.save("Science", QUESTIONS)
+        before = store.version("Science")
+        assert store.version("Science") == before
+        other = make_store(backend, tmp_path)
+        other.save("Science", QUESTIONS[:2])
+        other.close()
+        assert store.version("Science") != before
+        assert store.load("Science") == QUESTIONS[:2]
+        with pytest.raises(KeyError):
+            store.version("Missing")
+    finally:
+        store.close()
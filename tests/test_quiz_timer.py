@@ -0,0 +1,103 @@
+import pytest
+
+import QuizTimer as quiz_timer
+from QuizTimer import QuizTimer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class FakeRoot:
+    """Keeps ``after`` callbacks until the test runs them, as the Tk main loop would."""
+
+    def __init__(self):
+        self.scheduled = {}  # after id -> (delay in ms, callback)
+        self._next_id = 0
+
+    def after(self, delay_ms, callback):
+        self._next_id += 1
+        self.scheduled[self._next_id] = (delay_ms, callback)
+        return self._next_id
+
+    def after_cancel(self, after_id):
+        self.scheduled.pop(after_id, None)
+
+    def run_next(self, clock):
+        """Advance the clock by the pending callback's delay and run it; returns the delay."""
+        (after_id, (delay_ms, callback)), = self.scheduled.items()
+        del self.scheduled[after_id]
+        clock.now += delay_ms / 1000
+        callback()
+        return delay_ms
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(quiz_timer, "time", fake)
+    return fake
+
+
+@pytest.mark.parametrize("left, expected", [
+    (5.0, 1000),  # On a boundary: a whole second to the next one
+    (4.25, 251),
+    (0.999, 1000),
+    (0.0005, 1),
+])
+def test_until_next_second(left, expected):
+    assert QuizTimer._until_next_second(left) == expected
+
+
+def test_ticks_show_whole_seconds_and_quiz_expiry_stops_the_timer(clock):
+    root = FakeRoot()
+    ticks, expired = [], []
+    timer = QuizTimer(root, 3, on_tick=lambda quiz, question: ticks.append((quiz, question)),
+                      on_quiz_expired=lambda: expired.append(True))
+    timer.start()
+    while root.scheduled:
+        root.run_next(clock)
+    assert ticks == [(3, None), (2, None), (1, None)]
+    assert expired == [True]
+    assert not timer.running
+
+
+def test_question_expiry_calls_back_and_reschedules(clock):
+    root = FakeRoot()
+    expired = []
+    timer = QuizTimer(root, 60, question_seconds=2, on_question_expired=lambda: expired.append(clock.now))
+    timer.start()
+    started = clock.now
+    while not expired:
+        root.run_next(clock)
+    assert expired == [started + 2]
+    # The callback did not start the next question, so the timer keeps ticking for the quiz alone
+    assert timer.question_remaining() is None
+    assert timer.running and len(root.scheduled) == 1
+
+    timer.start_question()
+    assert timer.question_remaining() == 2
+    while len(expired) < 2:
+        root.run_next(clock)
+    assert expired[1] - expired[0] == pytest.approx(2, abs=0.01)
+
+
+def test_cancel_stops_further_callbacks(clock):
+    root = FakeRoot()
+    calls = []
+    timer = QuizTimer(root, 10, question_seconds=5, on_tick=lambda *shown: calls.append("tick"),
+                      on_quiz_expired=lambda: calls.append("quiz"), on_question_expired=lambda: calls.append("q"))
+    timer.start()
+    root.run_next(clock)
+    timer.cancel()
+    assert root.scheduled == {}
+    assert not timer.running
+    assert (timer.quiz_remaining(), timer.question_remaining()) == (0.0, None)
+    clock.now += 60
+    timer.start_question()  # Ignored once cancelled
+    assert root.scheduled == {}
+    assert calls == ["tick"]
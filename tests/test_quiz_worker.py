@@ -0,0 +1,123 @@
+import threading
+import time
+
+import QuizMetrics
+from QuizWorker import StallProbe, StoreWorker
+
+
+class FakeRoot:
+    """Records ``after`` calls instead of running a Tk main loop."""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay_ms, callback):
+        self.scheduled.append(callback)
+        return len(self.scheduled)
+
+    def after_cancel(self, after_id):
+        pass
+
+
+class FakeStore:
+    """Records saves; while ``gate`` is clear, work on the writer thread waits for it."""
+
+    def __init__(self):
+        self.saved = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def wait(self):
+        self.gate.wait(5)
+
+    def save(self, title, questions):
+        self.gate.wait(5)
+        if questions is None:
+            raise ValueError("nothing to save")
+        self.saved.append((title, questions))
+
+
+def deliver_completions(worker, root, timeout=5.0):
+    """Run the worker's scheduled polls, as the Tk main loop would, until everything is delivered."""
+    deadline = time.monotonic() + timeout
+    while worker._outstanding and time.monotonic() < deadline:
+        if root.scheduled:
+            root.scheduled.pop(0)()
+        else:
+            time.sleep(0.001)
+    assert worker._outstanding == 0
+
+
+def test_queued_saves_of_one_title_write_once_and_call_back_each_caller():
+    root, store = FakeRoot(), FakeStore()
+    worker = StoreWorker(root, store)
+    store.gate.clear()
+    worker.submit(store.wait)  # Keeps the writer busy while the saves queue up
+    done = []
+    worker.save("Science", ["first"], on_done=lambda result: done.append("first"))
+    worker.save("Science", ["second"], on_done=lambda result: done.append("second"))
+    worker.save("History", ["other"])
+    store.gate.set()
+    deliver_completions(worker, root)
+    assert store.saved == [("Science", ["second"]), ("History", ["other"])]
+    assert done == ["first", "second"]
+    assert worker.close(1.0)
+
+
+def test_errors_reach_their_handler_or_the_default():
+    root, store = FakeRoot(), FakeStore()
+    fallback = []
+    worker = StoreWorker(root, store, on_error=fallback.append)
+    handled = []
+    worker.save("Science", None, on_done=handled.append, on_error=lambda error: handled.append(type(error)))
+    worker.save("History", None)
+    deliver_completions(worker, root)
+    assert handled == [ValueError]
+    assert [type(error) for error in fallback] == [ValueError]
+    assert worker.close(1.0)
+
+
+def test_close_reports_work_still_running_after_the_timeout():
+    root, store = FakeRoot(), FakeStore()
+    worker = StoreWorker(root, store)
+    store.gate.clear()
+    worker.save("Science", ["slow"])
+    assert not worker.close(0.05)
+    store.gate.set()
+    assert worker.close(1.0)
+    assert store.saved == [("Science", ["slow"])]
+
+
+def run_ticks(probe, root, count):
+    for _ in range(count):
+        probe._expected -= 0.05  # Pretend each tick ran 50 ms late
+        root.scheduled.pop()()
+
+
+def test_stall_probe_records_lateness_in_metrics_when_enabled():
+    QuizMetrics.reset()
+    QuizMetrics.enable()
+    try:
+        root = FakeRoot()
+        probe = StallProbe(root, interval_ms=0)
+        probe.start()
+        run_ticks(probe, root, 3)
+        probe.stop()
+    finally:
+        QuizMetrics.disable()
+    histogram = QuizMetrics.histogram("quizify_mainloop_lateness_seconds")
+    assert histogram.count == 3
+    assert histogram.max >= 0.05
+    assert probe.stats()["ticks"] == 3
+    assert "quizify_mainloop_lateness_seconds" in QuizMetrics.render_prometheus()
+    QuizMetrics.reset()
+
+
+def test_stall_probe_leaves_metrics_alone_when_disabled():
+    QuizMetrics.reset()
+    root = FakeRoot()
+    probe = StallProbe(root, interval_ms=0)
+    probe.start()
+    run_ticks(probe, root, 2)
+    assert probe.stats()["ticks"] == 2
+    assert QuizMetrics.snapshot()["metrics"] == {}
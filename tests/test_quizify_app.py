@@ -0,0 +1,61 @@
+import pytest
+
+import QuizifyApp as quizify_app
+from QuizStorage import JsonQuizStore
+
+QUESTIONS = [{"question": "Water?", "options": ["H2O", "CO2", "O2", "N2"], "correct_option": "H2O"}]
+
+
+class FakeRoot:
+    def __init__(self):
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def dialogs(monkeypatch):
+    """Record message boxes instead of showing them; askyesno answers with ``dialogs.answer``."""
+    class Dialogs(list):
+        answer = False
+
+    shown = Dialogs()
+    for kind in ("showinfo", "showerror"):
+        monkeypatch.setattr(quizify_app.messagebox, kind, lambda title, message, kind=kind: shown.append(kind))
+    monkeypatch.setattr(quizify_app.messagebox, "askyesno",
+                        lambda title, message: shown.append("askyesno") or shown.answer)
+    return shown
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """An app with no widgets, using a quiz store under tmp_path whose index is corrupt."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "quizzes").mkdir()
+    (tmp_path / "quizzes" / JsonQuizStore.INDEX_FILE).write_text("{", encoding="utf-8")
+    instance = quizify_app.QuizifyApp.__new__(quizify_app.QuizifyApp)
+    instance.root = FakeRoot()
+    instance.quizzes = {"Science": QUESTIONS}
+    instance.store = None
+    instance.store_error = None
+    return instance
+
+
+def test_save_data_does_not_claim_success_when_the_store_cannot_open(app, dialogs):
+    assert not app.load_data()
+    assert isinstance(app.store_error, ValueError)
+    app.save_data()
+    assert dialogs == ["askyesno"]
+    assert not app.root.quit_called
+    dialogs.answer = True
+    app.save_data()
+    assert app.root.quit_called
+
+
+def test_save_data_retries_opening_the_store(app, dialogs, tmp_path):
+    assert not app.load_data()
+    (tmp_path / "quizzes" / JsonQuizStore.INDEX_FILE).unlink()
+    app.save_data()
+    assert dialogs == ["showinfo"]
+    assert JsonQuizStore().load("Science") == QUESTIONS